@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Vectorized Spilled Mushrooms engine that plays many games at once
+
+BatchGameEngine keeps N games in structure-of-arrays NumPy buffers and applies
+GameEngine.process_turn's rules to all of them in one step:
+
+    critter_types, mushrooms_per_day, lifespans   [game, location, slot]
+    counts, mushrooms, location_types             [game, location]
+    queue_types, queue_mushrooms_per_day,
+    queue_lifespans                               [game, ring buffer position]
+    queue_head, queue_length, day                 [game]
+
+Critters at a location always fill slots 0..count-1 in arrival order, and the queue
+runs from queue_head for queue_length positions around its ring buffer, so
+to_state(i) gives exactly the bytes GameEngine.to_state() would for game i.
+"""
+
+import random
+import time
+from typing import Optional, Tuple
+import numpy as np
+from config import GameConfig
+from game_engine import GameEngine, _pack_state
+from models import CritterType, LocationType
+from simulate import SimulationStats, _load_configs
+from seeding import Seed, derive_seed
+
+EMPTY = -1  # critter_types / queue_types value for an unused slot
+
+CRITTER_TYPES = list(CritterType)
+GRIZZLY, GOOSE, RHINO, SHEEP, PENGUIN, CROCODILE, GOPHER = (
+    ct.code for ct in (CritterType.GRIZZLY, CritterType.GOOSE, CritterType.RHINO, CritterType.SHEEP,
+                       CritterType.PENGUIN, CritterType.CROCODILE, CritterType.GOPHER))
+NUM_LOCATIONS = 3  # Gophers move by location id modulo 3, as in GameEngine
+QUEUE_LIMIT = 8  # A Gopher with nowhere to go only rejoins a queue shorter than this
+
+
+class BatchGameEngine:
+    """N independent games stepped together"""
+
+    def __init__(self, configs, n: int, first_game: int = 0):
+        """
+        Args:
+            configs: GameConfig or config file path (str), or a list of them; game i
+                     plays configs[(first_game + i) % len(configs)]
+            n: number of games
+            first_game: index of game 0 in a longer run, so batches cycle configs as
+                        simulate() does
+        """
+        configs = _load_configs(configs)
+        templates = [self._template(config) for config in configs]
+        self.n = n
+        self.configs = configs
+        self.queue_capacity = max(QUEUE_LIMIT, max(len(t[3]) for t in templates))
+        self.slots = max(max(t[2]) for t in templates)
+        self._config_of = (first_game + np.arange(n)) % len(configs)
+
+        # One row per config, copied into games by reset()
+        q = self.queue_capacity
+        self._location_types = np.array([t[0] for t in templates], dtype=np.int8)
+        self._mushrooms = np.array([t[1] for t in templates], dtype=np.int32)
+        self._capacity = np.array([t[2] for t in templates], dtype=np.intp)
+        self._queue_types = np.full((len(configs), q), EMPTY, dtype=np.int8)
+        self._queue_stats = np.zeros((len(configs), 2, q), dtype=np.int16)
+        self._queue_length = np.array([len(t[3]) for t in templates], dtype=np.intp)
+        self._type_counts = np.zeros((len(configs), len(CRITTER_TYPES)), dtype=np.int64)
+        for row, (_, _, _, critters) in enumerate(templates):
+            for position, critter in enumerate(critters):
+                self._queue_types[row, position] = critter.type.code
+                self._queue_stats[row, :, position] = (critter.current_mushrooms_per_day, critter.current_lifespan)
+                self._type_counts[row, critter.type.code] += 1
+
+        shape = (n, NUM_LOCATIONS)
+        self.location_types = np.empty(shape, dtype=np.int8)
+        self.capacity = np.empty(shape, dtype=np.intp)
+        self.mushrooms = np.empty(shape, dtype=np.int32)
+        self.counts = np.empty(shape, dtype=np.intp)
+        self.critter_types = np.empty(shape + (self.slots,), dtype=np.int8)
+        self.mushrooms_per_day = np.empty(shape + (self.slots,), dtype=np.int16)
+        self.lifespans = np.empty(shape + (self.slots,), dtype=np.int16)
+        self.queue_types = np.empty((n, q), dtype=np.int8)
+        self.queue_mushrooms_per_day = np.empty((n, q), dtype=np.int16)
+        self.queue_lifespans = np.empty((n, q), dtype=np.int16)
+        self.queue_head = np.empty(n, dtype=np.intp)
+        self.queue_length = np.empty(n, dtype=np.intp)
+        self.day = np.empty(n, dtype=np.intp)
+        self.game_over = np.empty(n, dtype=bool)
+        self.game_won = np.empty(n, dtype=bool)
+        self.type_counts = np.empty((n, len(CRITTER_TYPES)), dtype=np.int64)  # Critters that took part
+        self.type_collected = np.empty((n, len(CRITTER_TYPES)), dtype=np.int64)  # Mushrooms collected by type
+        self.reset()
+
+    @staticmethod
+    def _template(config: GameConfig) -> tuple:
+        locations = config.to_locations()
+        if len(locations) != NUM_LOCATIONS:
+            raise ValueError(f"BatchGameEngine plays boards of {NUM_LOCATIONS} locations, got {len(locations)}")
+        return ([loc.type.code for loc in locations], [loc.mushrooms for loc in locations],
+                [loc.max_critters for loc in locations], config.to_critters())
+
+    def reset(self, games=None, config_indices=None):
+        """
+        Restart games from their configs
+
+        Args:
+            games: indices or a boolean mask (all games by default)
+            config_indices: index into configs for each restarted game, replacing the
+                            one it was playing (unchanged by default)
+        """
+        games = np.arange(self.n) if games is None else np.asarray(games)
+        if games.dtype == bool:
+            games = np.flatnonzero(games)
+        if config_indices is not None:
+            self._config_of[games] = config_indices
+        rows = self._config_of[games]
+        self.location_types[games] = self._location_types[rows]
+        self.capacity[games] = self._capacity[rows]
+        self.mushrooms[games] = self._mushrooms[rows]
+        self.counts[games] = 0
+        self.critter_types[games] = EMPTY
+        self.mushrooms_per_day[games] = 0
+        self.lifespans[games] = 0
+        self.queue_types[games] = self._queue_types[rows]
+        self.queue_mushrooms_per_day[games] = self._queue_stats[rows, 0]
+        self.queue_lifespans[games] = self._queue_stats[rows, 1]
+        self.queue_head[games] = 0
+        self.queue_length[games] = self._queue_length[rows]
+        self.day[games] = 1
+        self.game_over[games] = False
+        self.game_won[games] = False
+        self.type_counts[games] = self._type_counts[rows]
+        self.type_collected[games] = 0
+        self._canyon = self.location_types == LocationType.CANYON.code
+        self._jungle = self.location_types == LocationType.JUNGLE.code
+        self._beach = self.location_types == LocationType.BEACH.code
+
+    # Moves are numbered critter * NUM_LOCATIONS + location, the order of get_valid_moves()
+
+    def valid_moves(self) -> np.ndarray:
+        """[game, critter choice, location] mask of the moves get_valid_moves() would list"""
+        open_locations = self.counts < self.capacity
+        visible = np.arange(2) < np.minimum(2, self.queue_length)[:, None]
+        return visible[:, :, None] & open_locations[:, None, :]
+
+    @property
+    def finished(self) -> np.ndarray:
+        """Games that are over or have no valid move left"""
+        return self.game_over | ~self.valid_moves().any(axis=(1, 2))
+
+    @property
+    def remaining(self) -> np.ndarray:
+        return self.mushrooms.sum(axis=1)
+
+    def first_moves(self) -> Tuple[np.ndarray, np.ndarray]:
+        """(critters, locations) of each game's first valid move"""
+        moves = self.valid_moves().reshape(self.n, -1).argmax(axis=1)
+        return moves // NUM_LOCATIONS, moves % NUM_LOCATIONS
+
+    def random_moves(self, rng: np.random.Generator) -> Tuple[np.ndarray, np.ndarray]:
+        """(critters, locations) of a uniformly chosen valid move per game"""
+        scores = rng.random((self.n, 2 * NUM_LOCATIONS))
+        scores[~self.valid_moves().reshape(self.n, -1)] = -1.0
+        moves = scores.argmax(axis=1)
+        return moves // NUM_LOCATIONS, moves % NUM_LOCATIONS
+
+    def step(self, critters, locations, active: Optional[np.ndarray] = None):
+        """
+        Play one turn in every active game, as GameEngine.process_turn would
+
+        Args:
+            critters, locations: per-game choices (ignored for inactive games)
+            active: games to play (every game that is not over by default); games
+                    that are over never change
+        """
+        act = ~self.game_over if active is None else np.asarray(active) & ~self.game_over
+        games = np.flatnonzero(act)
+        critter = np.asarray(critters)[games].astype(np.intp)
+        location = np.asarray(locations)[games].astype(np.intp)
+
+        queue_length = self.queue_length[games]
+        valid = (critter >= 0) & (critter < np.minimum(2, queue_length)) & \
+                (location >= 0) & (location < NUM_LOCATIONS)
+        checked = np.where(valid, location, 0)
+        valid &= self.counts[games, checked] < self.capacity[games, checked]
+        if not valid.all():
+            raise ValueError(f"Invalid move in game {games[~valid][0]}")
+
+        self._place_chosen(games, critter, location, queue_length)
+        self._collect(act)
+        done = act[:, None] & (self.mushrooms <= 0) & (self.counts > 0)
+        self.counts[done] = 0
+        self.critter_types[done] = EMPTY
+        self._move_gophers(act)
+        self._advance_day(act)
+
+        won = act & (self.mushrooms <= 0).all(axis=1)
+        self.game_won |= won
+        self.game_over |= won | (act & (self.day > 7))
+
+    def _place_chosen(self, games, critter, location, queue_length):
+        """Place the chosen critter, rotate the queue, and apply placement and location effects"""
+        q = self.queue_capacity
+        head = self.queue_head[games]
+        position = (head + critter) % q
+        entering = self.queue_types[games, position]
+        slot = self.counts[games, location]
+        self.critter_types[games, location, slot] = entering
+        self.mushrooms_per_day[games, location, slot] = self.queue_mushrooms_per_day[games, position]
+        self.lifespans[games, location, slot] = self.queue_lifespans[games, position]
+
+        # The unchosen critter of a pair goes to the back of the queue
+        pair = queue_length >= 2
+        unchosen = (head + 1 - critter)[pair] % q
+        tail = (head + queue_length)[pair] % q
+        for queue in (self.queue_types, self.queue_mushrooms_per_day, self.queue_lifespans):
+            queue[games[pair], tail] = queue[games[pair], unchosen]
+        self.queue_head[games] = (head + np.where(pair, 2, 1)) % q
+        self.queue_length[games] = queue_length - 1
+
+        # Grizzly: -1 mushrooms per day (not below 0) to the critters already there
+        grizzly = entering == GRIZZLY
+        for existing in range(self.slots):
+            hit = grizzly & (existing < slot)
+            g, l = games[hit], location[hit]
+            self.mushrooms_per_day[g, l, existing] = np.maximum(0, self.mushrooms_per_day[g, l, existing] - 1)
+
+        # Goose: 1/2 copies fill the location, each getting the Canyon bonus
+        goose = entering == GOOSE
+        capacity = self.capacity[games, location]
+        copies = np.where(goose, capacity - slot - 1, 0)
+        canyon = self._canyon[games, location]
+        for copy in range(1, self.slots):
+            hit = goose & (copy > slot) & (copy < capacity)
+            g, l = games[hit], location[hit]
+            self.critter_types[g, l, copy] = GOOSE
+            self.mushrooms_per_day[g, l, copy] = 1 + canyon[hit]
+            self.lifespans[g, l, copy] = 2 + canyon[hit]
+        self.counts[games, location] = slot + 1 + copies
+        self.type_counts[games, GOOSE] += copies
+
+        # Rhino/Sheep already there buff once for the entering critter and once per Goose copy
+        self._buff_rhino_sheep(games, location, slot, 1 + copies, entering == PENGUIN)
+
+        # Canyon: +1 mushrooms per day and +1 lifespan to the chosen critter
+        self.mushrooms_per_day[games, location, slot] += canyon
+        self.lifespans[games, location, slot] += canyon
+
+    def _buff_rhino_sheep(self, games, location, slot, times, penguin):
+        """Rhinos (+1 mushrooms per day) and Sheep (+1 lifespan) before `slot` react to an entry"""
+        for existing in range(self.slots):
+            kind = self.critter_types[games, location, existing]
+            before = existing < slot
+            rhino = before & (kind == RHINO)
+            sheep = before & (kind == SHEEP)
+            # A Penguin entering swaps which stat each of them buffs
+            self.mushrooms_per_day[games, location, existing] += times * ((rhino & ~penguin) | (sheep & penguin))
+            self.lifespans[games, location, existing] += times * ((rhino & penguin) | (sheep & ~penguin))
+
+    def _collect(self, act):
+        """Each location's critters collect in slot order until its mushrooms run out"""
+        daily = np.zeros_like(self.mushrooms)
+        amounts = np.zeros(self.critter_types.shape, dtype=np.int32)
+        crowded = self.counts > 1
+        for slot in range(self.slots):
+            kind = self.critter_types[:, :, slot]
+            per_day = self.mushrooms_per_day[:, :, slot]
+            can_collect = act[:, None] & (slot < self.counts)
+            can_collect &= ~((kind == CROCODILE) & crowded)  # Crocodile: only when alone
+            can_collect &= ~(self._jungle & (per_day < 2))  # Jungle: 2+ mushrooms per day only
+            amount = np.where(can_collect, np.minimum(per_day, self.mushrooms - daily), 0)
+            amounts[:, :, slot] = amount
+            daily += amount
+        self.mushrooms -= daily
+
+        types = len(CRITTER_TYPES)
+        index = np.arange(self.n)[:, None, None] * types + np.maximum(self.critter_types, 0)
+        self.type_collected += np.bincount(index.ravel(), weights=amounts.ravel(),
+                                           minlength=self.n * types).reshape(self.n, types).astype(np.int64)
+
+    def _move_gophers(self, act):
+        """Move each Gopher on the board, in location then slot order, as GameEngine does"""
+        slots = np.arange(self.slots)
+        pending = act[:, None, None] & (self.critter_types == GOPHER) & (slots < self.counts[:, :, None])
+        flat = pending.reshape(self.n, -1)
+        while True:
+            games = np.flatnonzero(flat.any(axis=1))
+            if not len(games):
+                return
+            first = flat[games].argmax(axis=1)
+            source, slot = first // self.slots, first % self.slots
+            pending[games, source, slot] = False
+
+            next_location = (source + 1) % NUM_LOCATIONS
+            skip_location = (source + 2) % NUM_LOCATIONS
+            next_open = self.counts[games, next_location] < self.capacity[games, next_location]
+            skip_open = self.counts[games, skip_location] < self.capacity[games, skip_location]
+            target = np.where(next_open, next_location, skip_location)
+            moves = next_open | skip_open
+            to_queue = ~moves & (self.queue_length[games] < QUEUE_LIMIT)
+            leaves = moves | to_queue
+
+            g, s, j = games[leaves], source[leaves], slot[leaves]
+            per_day = self.mushrooms_per_day[g, s, j]
+            lifespan = self.lifespans[g, s, j]
+            self._remove_slot(g, s, j, pending)
+
+            # Into the next open location, where Rhino/Sheep react and Canyon applies
+            g, t = games[moves], target[moves]
+            new_slot = self.counts[g, t]
+            self.critter_types[g, t, new_slot] = GOPHER
+            self.mushrooms_per_day[g, t, new_slot] = per_day[moves[leaves]]
+            self.lifespans[g, t, new_slot] = lifespan[moves[leaves]]
+            self.counts[g, t] = new_slot + 1
+            self._buff_rhino_sheep(g, t, new_slot, 1, np.zeros(len(g), dtype=bool))
+            canyon = self._canyon[g, t]
+            self.mushrooms_per_day[g, t, new_slot] += canyon
+            self.lifespans[g, t, new_slot] += canyon
+
+            # Or back to the end of the queue with its current stats
+            g = games[to_queue]
+            tail = (self.queue_head[g] + self.queue_length[g]) % self.queue_capacity
+            self.queue_types[g, tail] = GOPHER
+            self.queue_mushrooms_per_day[g, tail] = per_day[to_queue[leaves]]
+            self.queue_lifespans[g, tail] = lifespan[to_queue[leaves]]
+            self.queue_length[g] += 1
+
+    def _remove_slot(self, games, location, slot, pending):
+        """Remove one critter per game, shifting the ones behind it forward"""
+        arrays = (self.critter_types, self.mushrooms_per_day, self.lifespans, pending)
+        for position in range(self.slots - 1):
+            shift = position >= slot
+            g, l = games[shift], location[shift]
+            for array in arrays:
+                array[g, l, position] = array[g, l, position + 1]
+        last = self.slots - 1
+        self.critter_types[games, location, last] = EMPTY
+        pending[games, location, last] = False
+        self.counts[games, location] -= 1
+
+    def _advance_day(self, act):
+        """Lifespans drop everywhere but the Beach, critters at 0 leave, and the day advances"""
+        present = np.arange(self.slots) < self.counts[:, :, None]
+        self.lifespans -= (present & (act[:, None] & ~self._beach)[:, :, None]).astype(np.int16)
+        keep = present & (self.lifespans > 0)
+        if (keep != present).any():
+            order = np.argsort(~keep, axis=2, kind='stable')
+            for array in (self.critter_types, self.mushrooms_per_day, self.lifespans):
+                array[...] = np.take_along_axis(array, order, axis=2)
+            self.counts = keep.sum(axis=2)
+            self.critter_types[~(np.arange(self.slots) < self.counts[:, :, None])] = EMPTY
+        self.day += act
+
+    def to_state(self, game: int) -> bytes:
+        """Game `game`'s position in GameEngine.to_state() format"""
+        packed = [int(self.day[game]), NUM_LOCATIONS]
+        for location in range(NUM_LOCATIONS):
+            mushrooms = int(self.mushrooms[game, location])
+            count = int(self.counts[game, location])
+            packed += (int(self.location_types[game, location]), int(self.capacity[game, location]),
+                       mushrooms >> 8, mushrooms & 0xFF, count)
+            for slot in range(count):
+                packed += (int(self.critter_types[game, location, slot]),
+                           int(self.mushrooms_per_day[game, location, slot]),
+                           int(self.lifespans[game, location, slot]))
+        length = int(self.queue_length[game])
+        packed.append(length)
+        for offset in range(length):
+            position = (int(self.queue_head[game]) + offset) % self.queue_capacity
+            packed += (int(self.queue_types[game, position]), int(self.queue_mushrooms_per_day[game, position]),
+                       int(self.queue_lifespans[game, position]))
+        return _pack_state(packed)
+
+    def engine(self, game: int) -> GameEngine:
+        """A GameEngine at game `game`'s position (collection history is not carried over)"""
+        return GameEngine.from_state(self.to_state(game))
+
+    def play(self, policy: str = "random", rng: Optional[np.random.Generator] = None):
+        """Play every game to the end with the "first" or "random" policy"""
+        if policy not in ("first", "random"):
+            raise ValueError(f"BatchGameEngine plays the 'first' or 'random' policy, not '{policy}'")
+        rng = rng if rng is not None else np.random.default_rng()
+        while True:
+            active = ~self.finished
+            if not active.any():
+                return
+            critters, locations = self.first_moves() if policy == "first" else self.random_moves(rng)
+            self.step(critters, locations, active)
+
+    def stats(self) -> SimulationStats:
+        """Aggregate results of the games as they stand"""
+        stats = SimulationStats()
+        stats.games = self.n
+        stats.wins = int(self.game_won.sum())
+        stats.turns = int((self.day - 1).sum())
+        left, games = np.unique(self.remaining, return_counts=True)
+        stats.remaining_histogram = {int(k): int(v) for k, v in zip(left, games)}
+        for critter_type in CRITTER_TYPES:
+            count = int(self.type_counts[:, critter_type.code].sum())
+            if count:
+                stats.critter_counts[critter_type.value] = count
+                stats.critter_collected[critter_type.value] = int(self.type_collected[:, critter_type.code].sum())
+        return stats
+
+
+def simulate_batch(configs, games: int = 100000, policy: str = "random", seed: Seed = None,
+                   batch_size: int = 10000) -> SimulationStats:
+    """
+    simulate() on BatchGameEngine, for the "first" and "random" policies
+
+    Games cycle through configs as in simulate(). Random choices come from a NumPy
+    generator per batch, so results match simulate() in distribution, not game by game.
+    """
+    configs = _load_configs(configs)
+    if seed is None or isinstance(seed, random.Random):
+        seed = (seed or random).getrandbits(64)
+    stats = SimulationStats()
+    start = time.perf_counter()
+    for first_game in range(0, games, batch_size):
+        engine = BatchGameEngine(configs, min(batch_size, games - first_game), first_game)
+        engine.play(policy, np.random.default_rng(derive_seed(seed, first_game)))
+        stats.merge(engine.stats())
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+if __name__ == "__main__":
+    import sys
+
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    paths = sys.argv[2:] or ["configs/balanced.json", "configs/easy.json",
+                             "configs/high_damage.json", "configs/support.json"]
+    for name in ("first", "random"):
+        print(f"{name}: {simulate_batch(paths, games, name, seed=0)}")
@@ -1,15 +1,60 @@
+import hashlib
+import heapq
 import json
-from typing import List, Dict, Optional, Union
+import os
+import tempfile
+import time
+from typing import Iterable, Iterator, List, Dict, Optional, Union
 from dataclasses import dataclass
 from models import CritterType, LocationType, Critter, Location, CRITTER_STATS, LOCATION_STATS
 
+try:
+    from orjson import loads as _json_loads  # Optional: several times faster for bulk loading
+except ImportError:
+    _json_loads = json.loads
+
 
 @dataclass
 class GameConfig:
     """Configuration for a game setup"""
     critters: List[str]  # List of critter type names
     locations: Optional[List[Dict[str, Union[str, int]]]] = None  # Custom locations
+    solution: Optional[List[List[int]]] = None  # Known winning line of [critter, location] moves
     
+    def fingerprint(self) -> str:
+        """
+        Stable hash of the lineup order, location types and mushroom counts
+
+        Location orders the engine cannot tell apart hash the same. Without Gophers
+        the order never matters. A single Gopher walks to (current_loc_id + 1) % 3, so
+        only rotations of three locations are equivalent. With several Gophers their
+        moves are processed in location order, so the order is kept as given.
+        """
+        critters = [name.lower() for name in self.critters]
+        if self.locations is None:
+            locations = [(location_type.value, count) for location_type, count in LOCATION_STATS.items()]
+        else:
+            locations = [(loc["type"].lower(), loc["mushrooms"]) for loc in self.locations]
+
+        gophers = critters.count(CritterType.GOPHER.value)
+        if gophers == 0:
+            locations = sorted(locations)
+        elif gophers == 1 and len(locations) == 3:
+            locations = min(locations[shift:] + locations[:shift] for shift in range(3))
+
+        key = json.dumps([critters, locations])
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+    def to_dict(self) -> dict:
+        """JSON-ready form, as written by ConfigManager.save_config"""
+        config_dict = {
+            "critters": self.critters,
+            "locations": self.locations
+        }
+        if self.solution is not None:
+            config_dict["solution"] = self.solution
+        return config_dict
+
     def to_critters(self) -> List[Critter]:
         """Convert critter names to Critter objects"""
         critters = []
@@ -44,47 +89,280 @@ class GameConfig:
         return locations
 
 
+@dataclass
+class ConfigError:
+    """A config record that could not be loaded"""
+    source: str  # File the record came from
+    line: Optional[int]  # Line number in a JSONL file (None for a whole JSON file)
+    message: str
+
+    def __str__(self):
+        where = self.source if self.line is None else f"{self.source}:{self.line}"
+        return f"{where}: {self.message}"
+
+
+_CRITTER_NAMES = frozenset(ct.value for ct in CritterType)
+_LOCATION_NAMES = frozenset(lt.value for lt in LocationType)
+_CONFIG_FIELDS = frozenset(("critters", "locations", "solution"))
+
+
+def _is_count(value) -> bool:
+    return type(value) is int  # Excludes bool
+
+
+def parse_config(data) -> GameConfig:
+    """Validate a decoded JSON record and build its GameConfig, raising ValueError if invalid"""
+    if type(data) is not dict:
+        raise ValueError("Config must be a JSON object")
+    if not _CONFIG_FIELDS.issuperset(data):
+        unknown = sorted(data.keys() - _CONFIG_FIELDS)
+        raise ValueError(f"Unknown config fields: {', '.join(unknown)}")
+
+    critters = data.get("critters")
+    if type(critters) is not list or not critters:
+        raise ValueError("'critters' must be a non-empty list")
+    if not all(type(name) is str and (name in _CRITTER_NAMES or name.lower() in _CRITTER_NAMES)
+               for name in critters):
+        name = next(name for name in critters if type(name) is not str or name.lower() not in _CRITTER_NAMES)
+        raise ValueError(f"Unknown critter type {name!r}")
+
+    locations = data.get("locations")
+    if locations is not None:
+        if type(locations) is not list or not locations:
+            raise ValueError("'locations' must be a non-empty list")
+        for location in locations:
+            if type(location) is not dict or len(location) != 2 or "type" not in location or "mushrooms" not in location:
+                raise ValueError(f"Location {location!r} must have exactly 'type' and 'mushrooms'")
+            location_type = location["type"]
+            if type(location_type) is not str or location_type.lower() not in _LOCATION_NAMES:
+                raise ValueError(f"Unknown location type {location_type!r}")
+            if not _is_count(location["mushrooms"]) or location["mushrooms"] <= 0:
+                raise ValueError(f"Location mushrooms must be a positive integer, got {location['mushrooms']!r}")
+
+    solution = data.get("solution")
+    if solution is not None:
+        if type(solution) is not list or not all(
+                type(move) is list and len(move) == 2 and type(move[0]) is int and type(move[1]) is int
+                for move in solution):
+            raise ValueError("'solution' must be a list of [critter, location] moves")
+
+    return GameConfig(critters, locations, solution)
+
+
+def _parse_jsonl_chunk(source: str, first_line: int, lines: List[bytes]):
+    """Worker task: (configs, errors) for consecutive lines of a JSONL file"""
+    configs = []
+    errors = []
+    for number, line in enumerate(lines, first_line):
+        if not line.strip():
+            continue
+        try:
+            configs.append(parse_config(_json_loads(line)))
+        except ValueError as e:  # JSON decode errors are ValueErrors
+            errors.append(ConfigError(source, number, str(e)))
+    return configs, errors
+
+
+def _parse_json_files(paths: List[str]):
+    """Worker task: (configs, errors) for whole-file JSON configs"""
+    configs = []
+    errors = []
+    for path in paths:
+        try:
+            with open(path, 'rb') as f:
+                configs.append(parse_config(_json_loads(f.read())))
+        except (OSError, ValueError) as e:
+            errors.append(ConfigError(path, None, str(e)))
+    return configs, errors
+
+
+def _unreadable_file(source: str, message: str):
+    """Worker task: the error for a file that could not be read"""
+    return [], [ConfigError(source, None, message)]
+
+
+def _parse_tasks(path: str, chunk_lines: int):
+    """(worker function, args) batches covering every record under path, in file order"""
+    if os.path.isdir(path):
+        names = sorted(os.listdir(path))
+        sources = [os.path.join(path, name) for name in names if name.endswith((".json", ".jsonl"))]
+    else:
+        sources = [path]
+
+    json_files = []  # Consecutive JSON files, batched up to chunk_lines at a time
+    for source in sources:
+        if not source.endswith(".jsonl"):
+            json_files.append(source)
+            if len(json_files) == chunk_lines:
+                yield _parse_json_files, (json_files,)
+                json_files = []
+            continue
+        if json_files:
+            yield _parse_json_files, (json_files,)
+            json_files = []
+        try:
+            with open(source, 'rb') as f:
+                first_line = 1
+                while True:
+                    lines = f.readlines(chunk_lines * 256)  # About chunk_lines records per batch
+                    if not lines:
+                        break
+                    yield _parse_jsonl_chunk, (source, first_line, lines)
+                    first_line += len(lines)
+        except OSError as e:
+            yield _unreadable_file, (source, str(e))
+    if json_files:
+        yield _parse_json_files, (json_files,)
+
+
+def _run_task(task):
+    function, args = task
+    return function(*args)
+
+
+class ConfigRegistry:
+    """
+    Parsed config files cached by path and modification time
+
+    A cached file is re-checked with os.stat at most once every check_interval
+    seconds and parsed again only if its mtime or size changed, so warm lookups
+    normally touch neither the disk nor the JSON parser. The same GameConfig
+    object is handed to every caller and should be treated as read-only.
+    """
+
+    def __init__(self, check_interval: float = 1.0):
+        self.check_interval = check_interval
+        self.loads = 0  # Number of times a file was actually read and parsed
+        self._entries = {}  # path -> [(mtime_ns, size), GameConfig, next check time]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, filepath: str) -> GameConfig:
+        """Return the config in a file, parsing it only if new or changed"""
+        path = os.path.abspath(filepath)
+        now = time.monotonic()
+        entry = self._entries.get(path)
+        if entry is not None and now < entry[2]:
+            return entry[1]
+
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        if entry is not None and entry[0] == version:
+            entry[2] = now + self.check_interval
+            return entry[1]
+
+        with open(path, 'rb') as f:
+            config = GameConfig(**_json_loads(f.read()))
+        self.loads += 1
+        self._entries[path] = [version, config, now + self.check_interval]
+        return config
+
+    def invalidate(self, filepath: str):
+        """Forget a file's cached config, so the next get() reads it again"""
+        self._entries.pop(os.path.abspath(filepath), None)
+
+    def clear(self):
+        self._entries.clear()
+
+
 class ConfigManager:
     """Manages loading and saving game configurations"""
     
+    # Puzzle banks opened by load_puzzle(), kept mapped for later lookups
+    _banks = {}
+    # Parsed config files shared by every load_config() call
+    registry = ConfigRegistry()
+
     @staticmethod
-    def load_config(filepath: str) -> GameConfig:
-        """Load configuration from JSON file"""
+    def load_config(filepath: str, seed=None) -> GameConfig:
+        """
+        Load configuration from JSON file, or 'bank#number' for a puzzle bank entry
+
+        seed (int or random.Random) drives the default puzzle used if loading fails.
+        """
+        from puzzle_bank import split_puzzle_reference
+        reference = split_puzzle_reference(filepath)
+        if reference is not None:
+            return ConfigManager.load_puzzle(*reference, seed=seed)
         try:
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-            return GameConfig(**data)
+            return ConfigManager.registry.get(filepath)
         except FileNotFoundError:
             print(f"Config file {filepath} not found, using default setup")
-            return ConfigManager.get_default_config()
+            return ConfigManager.get_default_config(seed)
         except json.JSONDecodeError as e:
             print(f"Error parsing config file: {e}")
-            return ConfigManager.get_default_config()
+            return ConfigManager.get_default_config(seed)
         except Exception as e:
             print(f"Error loading config: {e}")
-            return ConfigManager.get_default_config()
+            return ConfigManager.get_default_config(seed)
     
+    @staticmethod
+    def iter_configs(path: str, errors: Optional[List[ConfigError]] = None, workers: int = 1,
+                     chunk_lines: int = 4096) -> Iterator[GameConfig]:
+        """
+        Stream configs from a JSONL file, a JSON file, or a directory of either
+
+        Every record is validated once by parse_config(). Invalid records are skipped
+        and, if an errors list is given, appended to it as ConfigError records. With
+        workers > 1, batches of records are parsed in a process pool. Batches are
+        yielded in file order, with only a few in flight at once.
+        """
+        tasks = _parse_tasks(path, chunk_lines)
+        if workers <= 1:
+            results = map(_run_task, tasks)
+        else:
+            results = ConfigManager._parse_in_pool(tasks, workers)
+        for configs, batch_errors in results:
+            if errors is not None:
+                errors.extend(batch_errors)
+            yield from configs
+
+    @staticmethod
+    def _parse_in_pool(tasks, workers: int):
+        from collections import deque
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(workers) as pool:
+            pending = deque()
+            for task in tasks:
+                pending.append(pool.submit(_run_task, task))
+                if len(pending) >= 2 * workers:
+                    yield pending.popleft().result()
+            while pending:
+                yield pending.popleft().result()
+
+    @staticmethod
+    def load_puzzle(bank_path: str, number: int, seed=None) -> GameConfig:
+        """Load puzzle #number from a puzzle bank file"""
+        from puzzle_bank import PuzzleBank
+        try:
+            bank = ConfigManager._banks.get(bank_path)
+            if bank is None:
+                bank = ConfigManager._banks[bank_path] = PuzzleBank(bank_path)
+            return bank[number]
+        except FileNotFoundError:
+            print(f"Puzzle bank {bank_path} not found, using default setup")
+            return ConfigManager.get_default_config(seed)
+        except (IndexError, ValueError) as e:
+            print(f"Error loading puzzle #{number}: {e}")
+            return ConfigManager.get_default_config(seed)
+
     @staticmethod
     def save_config(config: GameConfig, filepath: str):
         """Save configuration to JSON file"""
         try:
-            config_dict = {
-                "critters": config.critters,
-                "locations": config.locations
-            }
             with open(filepath, 'w') as f:
-                json.dump(config_dict, f, indent=2)
+                json.dump(config.to_dict(), f, indent=2)
+            ConfigManager.registry.invalidate(filepath)
             print(f"Config saved to {filepath}")
         except Exception as e:
             print(f"Error saving config: {e}")
     
     @staticmethod
-    def get_default_config() -> GameConfig:
-        """Get the default random configuration"""
-        import random
-        critter_types = [ct.value for ct in CritterType]
-        random_critters = random.choices(critter_types, k=8)
-        return GameConfig(critters=random_critters)
+    def get_default_config(seed=None) -> GameConfig:
+        """Get a random configuration that is verified to be solvable (seed: int or random.Random)"""
+        from generator import PuzzleGenerator
+        return PuzzleGenerator(seed=seed).generate()
     
     @staticmethod
     def create_example_configs():
@@ -135,6 +413,114 @@ class ConfigManager:
         ConfigManager.save_config(easy_config, "configs/easy.json")
 
 
+def dedupe_configs(configs: Iterable[GameConfig], max_in_memory: int = 1_000_000,
+                   partitions: int = 64, tmpdir: Optional[str] = None) -> Iterator[GameConfig]:
+    """
+    Yield the first config with each fingerprint, in input order
+
+    Fingerprints are held in a set until it reaches max_in_memory. The rest of the
+    stream is then spilled to `partitions` temporary files split by fingerprint, so each
+    file can be deduplicated on its own, and the survivors are merged back by position.
+    A file with more than max_in_memory fingerprints is split again on further digits
+    of the fingerprint (up to three more times), so no more than max_in_memory
+    fingerprints are held at once for streams of up to max_in_memory * partitions**4
+    distinct puzzles (about 1.7e13 with the defaults).
+    """
+    seen = set()
+    configs = iter(configs)
+    for config in configs:
+        key = config.fingerprint()
+        if key in seen:
+            continue
+        seen.add(key)
+        yield config
+        if len(seen) >= max_in_memory:
+            break
+    else:
+        return
+
+    with tempfile.TemporaryDirectory(dir=tmpdir) as spill_dir:
+        paths = [os.path.join(spill_dir, f"part{index}.jsonl") for index in range(partitions)]
+        files = [open(path, 'w') for path in paths]
+        try:
+            for position, config in enumerate(configs):
+                key = config.fingerprint()
+                if key not in seen:
+                    files[int(key[:8], 16) % partitions].write(
+                        json.dumps([position, key, config.to_dict()]) + "\n")
+        finally:
+            for f in files:
+                f.close()
+        seen.clear()
+
+        for path in paths:
+            _dedupe_spilled(path, max_in_memory, partitions)
+
+        files = [open(path) for path in paths]
+        try:
+            for _, _, config_dict in _merge_spilled(files):
+                yield GameConfig(**config_dict)
+        finally:
+            for f in files:
+                f.close()
+
+
+def _merge_spilled(files) -> Iterator[list]:
+    """Records of spill files, each in stream order, merged back into stream order"""
+    return heapq.merge(*[(json.loads(line) for line in f) for f in files], key=lambda record: record[0])
+
+
+def _dedupe_spilled(path: str, max_in_memory: int, partitions: int, depth: int = 1):
+    """
+    Keep only the first record per fingerprint in a spill file (lines are in stream order)
+
+    A file with more than max_in_memory distinct fingerprints is split again on the
+    next 8 digits of the fingerprint, each part is deduplicated the same way, and the
+    parts are merged back by position.
+    """
+    seen = set()
+    complete = True
+    with open(path) as f, open(path + ".kept", 'w') as kept:
+        for line in f:
+            key = json.loads(line)[1]
+            if key in seen:
+                continue
+            if len(seen) >= max_in_memory and 8 * (depth + 1) <= len(key):
+                complete = False
+                break
+            seen.add(key)
+            kept.write(line)
+    seen.clear()
+    if complete:
+        os.replace(path + ".kept", path)
+        return
+    os.remove(path + ".kept")
+
+    parts = [f"{path}.{index}" for index in range(partitions)]
+    files = [open(part, 'w') for part in parts]
+    try:
+        with open(path) as f:
+            for line in f:
+                key = json.loads(line)[1]
+                files[int(key[8 * depth:8 * (depth + 1)], 16) % partitions].write(line)
+    finally:
+        for part_file in files:
+            part_file.close()
+    for part in parts:
+        _dedupe_spilled(part, max_in_memory, partitions, depth + 1)
+
+    files = [open(part) for part in parts]
+    try:
+        with open(path, 'w') as out:
+            for record in _merge_spilled(files):
+                out.write(json.dumps(record) + "\n")
+    finally:
+        for part_file in files:
+            part_file.close()
+    for part in parts:
+        os.remove(part)
+
+
 def create_custom_config_interactive():
     """Interactive function to create a custom config"""
     print("Creating custom game configuration...")
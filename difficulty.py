@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Difficulty scoring for Spilled Mushrooms puzzles
+
+Combines measures the engine can compute exhaustively into a score from 0 (trivial)
+to 1 (hardest) and an easy/medium/hard band, so generated puzzles can be sorted
+without anyone playing them.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Dict, Optional
+from config import ConfigManager
+from game_engine import GameEngine
+from solver import collection_bound, solve
+
+# Upper score limit of each band, checked in order
+BANDS = (("easy", 0.4), ("medium", 0.6), ("hard", 1.0))
+
+
+@dataclass
+class Difficulty:
+    """Difficulty measures for one puzzle"""
+    solvable: bool
+    winning_lines: int  # Distinct winning move sequences
+    win_rate: float  # Chance that picking uniformly among valid moves every day wins
+    earliest_loss_day: Optional[int]  # First day a move can make the puzzle unwinnable (None if none can, 1 if unsolvable)
+    best_remaining: int  # Fewest mushrooms any line leaves (0 when solvable)
+    wasted_moves: int  # Most moves a winning line can spend on already-emptied locations
+    score: float
+    band: str
+
+    def __str__(self):
+        if not self.solvable:
+            return f"{self.band} (at least {self.best_remaining} mushrooms always remain)"
+        loss = f"day {self.earliest_loss_day}" if self.earliest_loss_day else "never"
+        return (f"{self.band} ({self.score:.2f}): {self.winning_lines} winning lines, "
+                f"{self.win_rate:.2%} random win rate, can be lost on {loss}, "
+                f"{self.wasted_moves} spare moves")
+
+
+# Scores by GameConfig.fingerprint(), shared by every difficulty() call in this process
+_cache: Dict[str, Difficulty] = {}
+
+
+def _measure(engine: GameEngine):
+    """
+    (winning lines, random win rate, earliest loss day, wasted moves) in one pass
+
+    Positions are memoized by hash. Subtrees the collection bound rules out are never
+    expanded: they hold no wins, which is all any of the measures needs from them.
+    """
+    memo = {}
+
+    def walk():
+        if engine.game_over:
+            return (1, 1.0, None, 0) if engine.game_won else (0, 0.0, None, 0)
+        key = engine.position_hash
+        if key in memo:
+            return memo[key]
+
+        moves = engine.get_valid_moves()
+        result = (0, 0.0, None, 0)
+        if moves and collection_bound(engine) >= sum(loc.mushrooms for loc in engine.locations):
+            lines = 0
+            rate = 0.0
+            loss_day = None
+            wasted = None
+            for critter_idx, location_idx in moves:
+                emptied = engine.locations[location_idx].mushrooms <= 0
+                engine.push_move(critter_idx, location_idx)
+                child_lines, child_rate, child_loss, child_wasted = walk()
+                engine.pop_move()
+                lines += child_lines
+                rate += child_rate
+                if child_lines == 0:
+                    child_loss = engine.day
+                else:
+                    wasted = max(wasted or 0, child_wasted + emptied)
+                if child_loss is not None and (loss_day is None or child_loss < loss_day):
+                    loss_day = child_loss
+            if lines:
+                result = (lines, rate / len(moves), loss_day, wasted)
+        memo[key] = result
+        return result
+
+    return walk()
+
+
+def _score(win_rate: float, earliest_loss_day: Optional[int], wasted_moves: int) -> float:
+    """Weighted hardness: random play rarely wins, the game can be lost early, no spare moves"""
+    rarity = min(1.0, -math.log10(max(win_rate, 1e-6)) / 6)
+    early_loss = (8 - earliest_loss_day) / 7 if earliest_loss_day else 0.0
+    no_slack = 1 - min(wasted_moves, 7) / 7
+    return 0.5 * rarity + 0.25 * early_loss + 0.25 * no_slack
+
+
+def difficulty(config, cache: Optional[Dict[str, Difficulty]] = None) -> Difficulty:
+    """
+    Score a puzzle, reusing the result for any puzzle with the same fingerprint
+
+    Args:
+        config: GameConfig object or config file path (str)
+        cache: fingerprint -> Difficulty mapping to read and fill (the module cache by default)
+    """
+    if isinstance(config, str):
+        config = ConfigManager.load_config(config)
+    cache = _cache if cache is None else cache
+    key = config.fingerprint()
+    if key in cache:
+        return cache[key]
+
+    lines, win_rate, earliest_loss_day, wasted = _measure(GameEngine(config))
+    if lines:
+        score = _score(win_rate, earliest_loss_day, wasted)
+        band = next(name for name, limit in BANDS if score <= limit)
+        result = Difficulty(True, lines, win_rate, earliest_loss_day, 0, wasted, score, band)
+    else:
+        best_remaining = solve(config, minimize=True).remaining
+        result = Difficulty(False, 0, 0.0, 1, best_remaining, 0, 1.0, "unsolvable")  # Lost from the first move
+    cache[key] = result
+    return result
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    paths = sys.argv[1:] or ["configs/easy.json", "configs/support.json", "configs/test_custom.json"]
+    for path in paths:
+        start = time.perf_counter()
+        result = difficulty(path)
+        print(f"{path}: {result} in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Gym-style environments for training move-selection models on Spilled Mushrooms
+
+MushroomEnv plays one GameEngine game. VectorMushroomEnv plays n games at once on
+BatchGameEngine and restarts each game as soon as it finishes. Both follow the
+Gymnasium API (reset(seed) -> (observation, info), step(action) -> (observation,
+reward, terminated, truncated, info)) without depending on it.
+
+Actions are critter choice * 3 + location, so the valid actions match
+get_valid_moves() in order. info["action_mask"] marks which of them are legal.
+
+Observations are OBSERVATION_SIZE int16 values:
+    [0:3]    mushrooms at each location
+    [3:6]    location type codes
+    [6:33]   placed critters, (type code + 1, mushrooms per day, lifespan) for
+             3 slots at each location, zeros for an empty slot
+    [33:39]  the two critters at the front of the queue, same encoding
+    [39]     day
+The reward for a step is the mushrooms collected during it.
+"""
+
+from typing import Optional
+import numpy as np
+from batch_engine import NUM_LOCATIONS, BatchGameEngine
+from game_engine import GameEngine
+from seeding import Seed, make_rng
+
+SLOTS = 3
+NUM_ACTIONS = 2 * NUM_LOCATIONS
+OBSERVATION_SIZE = 2 * NUM_LOCATIONS + 3 * NUM_LOCATIONS * SLOTS + 3 * 2 + 1
+_PLACED = slice(2 * NUM_LOCATIONS, 2 * NUM_LOCATIONS + 3 * NUM_LOCATIONS * SLOTS)
+_QUEUE = slice(_PLACED.stop, _PLACED.stop + 6)
+
+
+def observe(engine: GameEngine) -> np.ndarray:
+    """Observation vector for a GameEngine position"""
+    observation = np.zeros(OBSERVATION_SIZE, dtype=np.int16)
+    placed = []
+    for index, location in enumerate(engine.locations):
+        observation[index] = location.mushrooms
+        observation[NUM_LOCATIONS + index] = location.type.code
+        for critter in location.critters:
+            placed += (critter.type.code + 1, critter.current_mushrooms_per_day, critter.current_lifespan)
+        placed += [0] * (3 * (SLOTS - len(location.critters)))
+    observation[_PLACED] = placed
+    queue = []
+    for critter in list(engine.critter_queue)[:2]:
+        queue += (critter.type.code + 1, critter.current_mushrooms_per_day, critter.current_lifespan)
+    observation[_QUEUE.start:_QUEUE.start + len(queue)] = queue
+    observation[-1] = engine.day
+    return observation
+
+
+def action_mask(engine: GameEngine) -> np.ndarray:
+    mask = np.zeros(NUM_ACTIONS, dtype=bool)
+    for critter_idx, location_idx in engine.get_valid_moves():
+        mask[critter_idx * NUM_LOCATIONS + location_idx] = True
+    return mask
+
+
+class MushroomEnv:
+    """Single-game environment on GameEngine"""
+
+    def __init__(self, config=None):
+        """
+        Args:
+            config: GameConfig object, config file path (str), or None for a random
+                    lineup drawn from the reset seed
+        """
+        self.config = config
+        self.rng = make_rng(None)
+        self.engine = None
+
+    def reset(self, seed: Seed = None):
+        if seed is not None:
+            self.rng = make_rng(seed)
+        self.engine = GameEngine(self.config, seed=self.rng)
+        return observe(self.engine), {"action_mask": action_mask(self.engine)}
+
+    def step(self, action: int):
+        """Play an action; the episode ends when the game is over or no move is left"""
+        before = sum(loc.mushrooms for loc in self.engine.locations)
+        self.engine.process_turn(*divmod(int(action), NUM_LOCATIONS))
+        reward = before - sum(loc.mushrooms for loc in self.engine.locations)
+        mask = action_mask(self.engine)
+        terminated = self.engine.game_over or not mask.any()
+        info = {"action_mask": mask, "won": self.engine.game_won}
+        return observe(self.engine), float(reward), terminated, False, info
+
+
+class VectorMushroomEnv:
+    """
+    n games stepped together on BatchGameEngine, each restarted as soon as it finishes
+
+    A finished game's step returns the first observation of its next game; its final
+    observation and result are in info["final_observation"] and info["won"].
+    """
+
+    def __init__(self, configs, n: int):
+        """
+        Args:
+            configs: GameConfig or config file path (str), or a list of them; each new
+                     game plays one drawn uniformly from the list
+            n: number of games
+        """
+        self.n = n
+        self.engine = BatchGameEngine(configs, n)
+        self.rng = np.random.default_rng()
+
+    def _restart(self, games: np.ndarray):
+        count = len(self.engine.configs)
+        self.engine.reset(games, self.rng.integers(count, size=len(games)) if count > 1 else None)
+
+    def reset(self, seed: Optional[int] = None):
+        if seed is not None:
+            self.rng = np.random.default_rng(seed)
+        self._restart(np.arange(self.n))
+        return self.observe(), {"action_mask": self.action_mask()}
+
+    def step(self, actions):
+        """Play one action per game (every game must be given a legal one)"""
+        actions = np.asarray(actions)
+        engine = self.engine
+        before = engine.remaining
+        engine.step(actions // NUM_LOCATIONS, actions % NUM_LOCATIONS)
+        rewards = (before - engine.remaining).astype(np.float32)
+
+        mask = self.action_mask()
+        terminated = engine.game_over | ~mask.any(axis=1)
+        info = {"won": engine.game_won.copy()}
+        if terminated.any():
+            info["final_observation"] = self.observe()
+            games = np.flatnonzero(terminated)
+            self._restart(games)
+            mask[games] = self.action_mask()[games]
+        info["action_mask"] = mask
+        return self.observe(), rewards, terminated, np.zeros(self.n, dtype=bool), info
+
+    def action_mask(self) -> np.ndarray:
+        return self.engine.valid_moves().reshape(self.n, NUM_ACTIONS)
+
+    def observe(self) -> np.ndarray:
+        """[n, OBSERVATION_SIZE] observations"""
+        engine = self.engine
+        observations = np.zeros((self.n, OBSERVATION_SIZE), dtype=np.int16)
+        observations[:, :NUM_LOCATIONS] = engine.mushrooms
+        observations[:, NUM_LOCATIONS:2 * NUM_LOCATIONS] = engine.location_types
+
+        present = np.arange(SLOTS) < engine.counts[:, :, None]
+        placed = np.stack([(engine.critter_types[:, :, :SLOTS] + 1) * present,
+                           engine.mushrooms_per_day[:, :, :SLOTS] * present,
+                           engine.lifespans[:, :, :SLOTS] * present], axis=-1)
+        observations[:, _PLACED] = placed.reshape(self.n, -1)
+
+        rows = np.arange(self.n)[:, None]
+        positions = (engine.queue_head[:, None] + np.arange(2)) % engine.queue_capacity
+        visible = np.arange(2) < engine.queue_length[:, None]
+        queue = np.stack([(engine.queue_types[rows, positions] + 1) * visible,
+                          engine.queue_mushrooms_per_day[rows, positions] * visible,
+                          engine.queue_lifespans[rows, positions] * visible], axis=-1)
+        observations[:, _QUEUE] = queue.reshape(self.n, -1)
+        observations[:, -1] = engine.day
+        return observations
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 1024
+    env = VectorMushroomEnv(["configs/balanced.json", "configs/easy.json",
+                             "configs/high_damage.json", "configs/support.json"], n)
+    observations, info = env.reset(seed=0)
+    rng = np.random.default_rng(0)
+    steps = episodes = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < 3:
+        scores = rng.random((n, NUM_ACTIONS))
+        scores[~info["action_mask"]] = -1.0
+        observations, rewards, terminated, truncated, info = env.step(scores.argmax(axis=1))
+        steps += n
+        episodes += int(terminated.sum())
+    elapsed = time.perf_counter() - start
+    print(f"{steps / elapsed:.0f} env steps/s at n={n}, {episodes} episodes")
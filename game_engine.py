@@ -1,31 +1,141 @@
 from collections import deque
-from typing import List, Optional, Union
+import operator
+from typing import Iterator, List, Optional, Union
 import random
-from models import Critter, Location, CritterType, LocationType, CRITTER_STATS, LOCATION_STATS
+from models import Critter, CritterList, Location, CritterType, LocationType, CRITTER_STATS, LOCATION_STATS
+from seeding import Seed, make_rng
+from rules import dispatch_tables
+
+
+# Zobrist hashing: every feature of a position gets a fixed pseudo-random 64-bit key
+# and the position hash is the XOR of the keys of the features it contains.
+MASK64 = (1 << 64) - 1
+_DAY_KEY, _LOCATION_KEY, _MUSHROOM_KEY, _BOARD_KEY, _QUEUE_KEY = range(5)
+# The queue is hashed as a polynomial so that popping the front is O(1)
+_QUEUE_MULTIPLIER = 0x9E3779B97F4A7C15
+_QUEUE_MULTIPLIER_INVERSE = pow(_QUEUE_MULTIPLIER, -1, 1 << 64)
+_QUEUE_WEIGHTS = [pow(_QUEUE_MULTIPLIER, i, 1 << 64) for i in range(16)]
+_zobrist_keys = {}
+
+
+def _mix64(value: int) -> int:
+    """splitmix64 finalizer"""
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & MASK64
+    return value ^ (value >> 31)
+
+
+def _zobrist(*features: int) -> int:
+    """Key for a tuple of small ints, identical in every process"""
+    key = _zobrist_keys.get(features)
+    if key is None:
+        key = _zobrist_keys[features] = _mix64(hash(features) & MASK64)
+    return key
+
+
+# to_state() stores each field as one byte; WIDE_FIELD is followed by a larger value as a varint
+WIDE_FIELD = 0xFF
+
+
+def _pack_state(fields: List[int]) -> bytes:
+    """Fields of a to_state() position as bytes"""
+    if fields and max(fields) < WIDE_FIELD and min(fields) >= 0:
+        return bytes(fields)
+    packed = bytearray()
+    for value in fields:
+        if value < 0:
+            raise ValueError(f"Cannot pack negative value {value} into a position state")
+        if value < WIDE_FIELD:
+            packed.append(value)
+            continue
+        packed.append(WIDE_FIELD)
+        while value >= 0x80:  # Little-endian base-128, high bit set on all but the last byte
+            packed.append((value & 0x7F) | 0x80)
+            value >>= 7
+        packed.append(value)
+    return bytes(packed)
+
+
+def _unpack_state(state: bytes) -> Iterator[int]:
+    """Fields of a to_state() position, in order"""
+    position = iter(state)
+    for value in position:
+        if value == WIDE_FIELD:
+            value = shift = 0
+            for byte in position:
+                value |= (byte & 0x7F) << shift
+                shift += 7
+                if byte < 0x80:
+                    break
+        yield value
+
+
+def _board_key(location_id: int, slot: int, critter: Critter) -> int:
+    return _zobrist(_BOARD_KEY, location_id, slot, critter.type.code,
+                    critter.current_mushrooms_per_day, critter.current_lifespan)
+
+
+def _queue_key(critter: Critter) -> int:
+    return _zobrist(_QUEUE_KEY, critter.type.code,
+                    critter.current_mushrooms_per_day, critter.current_lifespan)
 
 
 class GameEngine:
-    def __init__(self, config=None):
+    # Debug mode: compare position_hash against a full recompute after every phase
+    verify_hash = False
+    
+    def __init__(self, config=None, seed: Seed = None):
         """
         Initialize game engine with optional configuration
         
         Args:
             config: GameConfig object, config file path (str), or None for default
+            seed: int or random.Random for this engine's random choices (the default
+                  lineup, or the fallback puzzle when a config file is missing)
         """
         self.day = 1
-        self.locations = self._init_locations(config)
-        self.critter_queue = deque(self._init_critters(config))
+        self.rng = make_rng(seed)
+        game_config = self._load_config(config) if config is not None else None
+        self.locations = self._init_locations(game_config)
+        self.critter_queue = deque(self._init_critters(game_config))
         self.all_critters_ever = []  # Track all critters for summary
         self.game_over = False
         self.game_won = False
         
         # Add initial critters to the full history
         self.all_critters_ever.extend(self.critter_queue)
+        self._init_derived_state()
+    
+    def _init_derived_state(self):
+        """Set up bookkeeping that is not part of the position itself"""
+        # Rule dispatch tables (type code -> hook, None for an empty phase), fixed for this engine.
+        # They cover every registered type, so critters put in by hand follow their rules too;
+        # specialize() is what drops phases no type in the game uses.
+        tables = dispatch_tables()
+        self._on_place = tables["critter:on_place"]
+        self._on_other_enter = tables["critter:on_other_enter"]
+        self._critter_can_collect = tables["critter:can_collect"]
+        self._on_night = tables["critter:on_night"]
+        self._on_enter_location = tables["location:on_enter_location"]
+        self._location_can_collect = tables["location:can_collect"]
+        # Codes of the types these critter phases act on, looked up in CritterList indexes
+        self._other_enter_types = tables["critter:on_other_enter:types"]
+        self._night_types = tables["critter:on_night:types"]
+        self._undo_log = None  # Receives undo records while a pushed move is being played
+        self._move_stack = []  # (undo records, hashes before the move) per pushed move
+        self._queue_hash = self._compute_queue_hash()
+        self.position_hash = self.compute_position_hash()
     
-    def _init_locations(self, config=None) -> List[Location]:
-        """Initialize locations from config or use defaults"""
-        if config is not None:
-            game_config = self._load_config(config)
+    def _type_codes(self) -> set:
+        """Codes of the critter types in the queue or on the board"""
+        codes = {critter.type.code for critter in self.critter_queue}
+        for location in self.locations:
+            codes.update(critter.type.code for critter in location.critters)
+        return codes
+    
+    def _init_locations(self, game_config=None) -> List[Location]:
+        """Initialize locations from a loaded GameConfig or use defaults"""
+        if game_config is not None:
             return game_config.to_locations()
         
         # Default locations
@@ -34,10 +144,9 @@ class GameEngine:
             locations.append(Location(i, location_type, mushroom_count))
         return locations
     
-    def _init_critters(self, config=None) -> List[Critter]:
-        """Initialize critters from config or use defaults"""
-        if config is not None:
-            game_config = self._load_config(config)
+    def _init_critters(self, game_config=None) -> List[Critter]:
+        """Initialize critters from a loaded GameConfig or use defaults"""
+        if game_config is not None:
             return game_config.to_critters()
         
         # Default random critters
@@ -45,7 +154,7 @@ class GameEngine:
         critter_types = list(CritterType)
         
         for _ in range(8):
-            critter_type = random.choice(critter_types)
+            critter_type = self.rng.choice(critter_types)
             mushrooms, lifespan = CRITTER_STATS[critter_type]
             critters.append(Critter(critter_type, mushrooms, lifespan))
         
@@ -56,23 +165,123 @@ class GameEngine:
         if isinstance(config, str):
             # Config is a file path
             from config import ConfigManager
-            return ConfigManager.load_config(config)
+            return ConfigManager.load_config(config, seed=self.rng)
         else:
             # Config is already a GameConfig object
             return config
     
+    def clone(self) -> 'GameEngine':
+        """Return an independent copy of the game that can be played forward"""
+        copies = {}
+        for critter in self.get_all_critters():
+            duplicate = object.__new__(Critter)
+            duplicate.__dict__.update(critter.__dict__)
+            copies[id(critter)] = duplicate
+
+        new = type(self).__new__(type(self))
+        new.day = self.day
+        new.locations = [Location(loc.id, loc.type, loc.mushrooms, loc.max_critters,
+                                  [copies[id(c)] for c in loc.critters])
+                         for loc in self.locations]
+        new.critter_queue = deque(copies[id(c)] for c in self.critter_queue)
+        # Critters that have left the board are never touched again, so they can be shared
+        new.all_critters_ever = [copies.get(id(c), c) for c in self.all_critters_ever]
+        new.game_over = self.game_over
+        new.game_won = self.game_won
+        new.rng = random.Random()
+        new.rng.setstate(self.rng.getstate())
+        new._init_derived_state()
+        return new
+
+    def specialize(self) -> 'GameEngine':
+        """
+        Switch to a process_turn generated for this game's board and critter types
+
+        Plays exactly as before, only faster; clones keep the specialized turn.
+        See specialize.py. Returns the engine.
+        """
+        from specialize import specialized_class
+        self.__class__ = specialized_class(self)
+        return self
+
+    def to_state(self) -> bytes:
+        """
+        Pack the position into a compact, hashable byte string
+
+        Holds the day, each location's type, capacity, mushrooms and critters, and the
+        queue order, with every critter stored as (type code, mushrooms per day, lifespan).
+        Equal positions give equal states. Collection history is not part of a position.
+        Each field takes one byte, or a WIDE_FIELD marker and a varint from 255 up.
+        """
+        packed = [self.day, len(self.locations)]
+        for location in self.locations:
+            packed += (location.type.code, location.max_critters,
+                       location.mushrooms >> 8, location.mushrooms & 0xFF, len(location.critters))
+            for critter in location.critters:
+                packed += (critter.type.code, critter.current_mushrooms_per_day, critter.current_lifespan)
+        packed.append(len(self.critter_queue))
+        for critter in self.critter_queue:
+            packed += (critter.type.code, critter.current_mushrooms_per_day, critter.current_lifespan)
+        return _pack_state(packed)
+
+    @classmethod
+    def from_state(cls, state: bytes, seed: Seed = None) -> 'GameEngine':
+        """Rebuild a playable engine from a to_state() byte string"""
+        critter_types = list(CritterType)
+        location_types = list(LocationType)
+        position = _unpack_state(state)
+
+        def read_critter(location_id):
+            critter_type = critter_types[next(position)]
+            mushrooms, lifespan = CRITTER_STATS[critter_type]
+            critter = Critter(critter_type, mushrooms, lifespan, current_location_id=location_id)
+            # Set directly so that a stat of 0 is not replaced by the base value
+            critter.current_mushrooms_per_day = next(position)
+            critter.current_lifespan = next(position)
+            return critter
+
+        engine = cls.__new__(cls)
+        engine.day = next(position)
+        engine.locations = []
+        for location_id in range(next(position)):
+            location_type = location_types[next(position)]
+            max_critters = next(position)
+            mushrooms = (next(position) << 8) | next(position)
+            critters = [read_critter(location_id) for _ in range(next(position))]
+            engine.locations.append(Location(location_id, location_type, mushrooms, max_critters, critters))
+        engine.critter_queue = deque(read_critter(None) for _ in range(next(position)))
+        engine.all_critters_ever = engine.get_all_critters()
+        engine.game_over = False
+        engine.game_won = False
+        engine.rng = make_rng(seed)
+        engine._init_derived_state()
+        engine._check_game_over()
+        return engine
+
     def get_valid_moves(self) -> List[tuple]:
         """Returns list of (critter_index, location_index) valid moves"""
-        valid_moves = []
-        for critter_idx in range(min(2, len(self.critter_queue))):
-            for location_idx in range(len(self.locations)):
-                if not self.locations[location_idx].is_full():
-                    valid_moves.append((critter_idx, location_idx))
-        return valid_moves
+        open_locations = [location_idx for location_idx, location in enumerate(self.locations)
+                          if not location.is_full()]
+        return [(critter_idx, location_idx)
+                for critter_idx in range(min(2, len(self.critter_queue)))
+                for location_idx in open_locations]
+    
+    @staticmethod
+    def _move_indexes(critter_choice, location_choice) -> tuple:
+        """Both choices as plain ints (NumPy and other integer types are accepted)"""
+        try:
+            return operator.index(critter_choice), operator.index(location_choice)
+        except TypeError:
+            raise ValueError("Invalid move") from None
     
     def process_turn(self, critter_choice: int, location_choice: int):
         """Process a complete turn with the given choices"""
-        if (critter_choice, location_choice) not in self.get_valid_moves():
+        if type(critter_choice) is not int or type(location_choice) is not int:
+            critter_choice, location_choice = self._move_indexes(critter_choice, location_choice)
+        # Same test as membership in get_valid_moves(), without building the list
+        if not (0 <= critter_choice < min(2, len(self.critter_queue)) and
+                0 <= location_choice < len(self.locations) and
+                not self.locations[location_choice].is_full()):
             raise ValueError("Invalid move")
         
         # 1. Get chosen critter and location
@@ -80,213 +289,325 @@ class GameEngine:
         target_location = self.locations[location_choice]
         
         # 2. Move critter to location
-        chosen_critter.current_location_id = location_choice
-        target_location.critters.append(chosen_critter)
+        self._set(chosen_critter, 'current_location_id', location_choice)
+        self._place(target_location, chosen_critter)
         
-        # 3. Apply placement effects
+        # 3. Move unchosen critter to back of queue (the chosen one has left it)
+        self._rotate_queue(critter_choice)
+        self._check_hash("queue rotation")
+        
+        # 4. Apply placement effects
         self._apply_placement_effects(chosen_critter, target_location)
+        self._check_hash("placement effects")
         
-        # 4. Apply location effects
+        # 5. Apply location effects
         self._apply_location_effects(chosen_critter, target_location)
-        
-        # 5. Move unchosen critter to back of queue
-        self._rotate_queue(critter_choice)
+        self._check_hash("location effects")
         
         # 6. Collect mushrooms
         self._collect_mushrooms()
+        self._check_hash("collection")
         
         # 7. Remove completed locations
         self._remove_completed_locations()
+        self._check_hash("completed locations")
         
         # 8. Apply end-of-day effects (Gopher movement)
         self._apply_end_of_day_effects()
+        self._check_hash("end-of-day effects")
         
         # 9. Reduce lifespans and advance day
         self._advance_day()
+        self._check_hash("advance day")
         
         # 10. Check win/lose conditions
         self._check_game_over()
     
+    def push_move(self, critter_choice: int, location_choice: int):
+        """Play a turn that can later be taken back with pop_move()"""
+        undo_log = []
+        hashes = (self.position_hash, self._queue_hash)
+        self._undo_log = undo_log
+        try:
+            self.process_turn(critter_choice, location_choice)
+        except Exception:
+            self._undo_log = None
+            self._undo(undo_log, hashes)
+            raise
+        self._undo_log = None
+        self._move_stack.append((undo_log, hashes))
+    
+    def pop_move(self):
+        """Take back the most recent pushed move, restoring every changed field"""
+        if not self._move_stack:
+            raise IndexError("No pushed move to pop")
+        self._undo(*self._move_stack.pop())
+    
+    def _undo(self, undo_log: list, hashes: tuple):
+        """Replay undo records newest-first"""
+        for restore, args in reversed(undo_log):
+            restore(*args)
+        self.position_hash, self._queue_hash = hashes
+    
+    def compute_position_hash(self) -> int:
+        """
+        Hash the whole position from scratch
+        
+        process_turn keeps position_hash equal to this as it goes. Call it again after
+        editing locations or the queue by hand.
+        """
+        position_hash = _zobrist(_DAY_KEY, self.day)
+        for location in self.locations:
+            position_hash ^= _zobrist(_LOCATION_KEY, location.id, location.type.code,
+                                      location.max_critters)
+            position_hash ^= _zobrist(_MUSHROOM_KEY, location.id, location.mushrooms)
+            for slot, critter in enumerate(location.critters):
+                position_hash ^= _board_key(location.id, slot, critter)
+        return position_hash ^ _mix64(self._compute_queue_hash())
+    
+    def _compute_queue_hash(self) -> int:
+        queue_hash = 0
+        for critter in reversed(self.critter_queue):
+            queue_hash = (queue_hash * _QUEUE_MULTIPLIER + _queue_key(critter)) & MASK64
+        return queue_hash
+    
+    def _check_hash(self, phase: str):
+        """In debug mode, fail as soon as a phase leaves position_hash out of date"""
+        if self.verify_hash and self.position_hash != self.compute_position_hash():
+            raise AssertionError(f"position_hash out of date after {phase}")
+    
+    # All changes made while processing a turn go through these helpers so that
+    # push_move() can record how to reverse them and position_hash stays current.
+    
+    def _set(self, obj, attribute: str, value):
+        """Set an attribute that is not part of the hashed position"""
+        if self._undo_log is not None:
+            self._undo_log.append((setattr, (obj, attribute, getattr(obj, attribute))))
+        setattr(obj, attribute, value)
+    
+    def _set_stat(self, critter: Critter, attribute: str, value: int, slot: Optional[int] = None):
+        """Change a critter's mushrooms per day or lifespan (slot: its index at its location, if known)"""
+        location_id = critter.current_location_id
+        if location_id is None:
+            slot = None
+        elif slot is None:
+            slot = self._slot_of(self.locations[location_id].critters, critter)
+        if slot is not None:
+            self.position_hash ^= _board_key(location_id, slot, critter)
+        self._set(critter, attribute, value)
+        if slot is not None:
+            self.position_hash ^= _board_key(location_id, slot, critter)
+    
+    def _set_mushrooms(self, location: Location, mushrooms: int):
+        self.position_hash ^= (_zobrist(_MUSHROOM_KEY, location.id, location.mushrooms) ^
+                               _zobrist(_MUSHROOM_KEY, location.id, mushrooms))
+        self._set(location, 'mushrooms', mushrooms)
+    
+    def _set_day(self, day: int):
+        self.position_hash ^= _zobrist(_DAY_KEY, self.day) ^ _zobrist(_DAY_KEY, day)
+        self._set(self, 'day', day)
+    
+    def _append(self, items: list, item):
+        """Append to a list that is not part of the hashed position"""
+        if self._undo_log is not None:
+            self._undo_log.append((items.pop, ()))
+        items.append(item)
+    
+    def _place(self, location: Location, critter: Critter):
+        """Add a critter to the end of a location's critters"""
+        self.position_hash ^= _board_key(location.id, len(location.critters), critter)
+        self._append(location.critters, critter)
+    
+    def _remove(self, location: Location, critter: Critter):
+        """Remove a critter from a location, shifting the ones behind it forward"""
+        critters = location.critters
+        index = critters.index(critter)
+        removed = critters[index]
+        for slot in range(index, len(critters)):
+            self.position_hash ^= _board_key(location.id, slot, critters[slot])
+        if self._undo_log is not None:
+            self._undo_log.append((critters.insert, (index, removed)))
+        del critters[index]
+        for slot in range(index, len(critters)):
+            self.position_hash ^= _board_key(location.id, slot, critters[slot])
+    
+    def _replace_critters(self, location: Location, new_critters: list):
+        """Replace a location's critters in place"""
+        critters = location.critters
+        for slot, critter in enumerate(critters):
+            self.position_hash ^= _board_key(location.id, slot, critter)
+        if self._undo_log is not None:
+            self._undo_log.append((critters.__setitem__, (slice(None), critters[:])))
+        critters[:] = new_critters
+        for slot, critter in enumerate(critters):
+            self.position_hash ^= _board_key(location.id, slot, critter)
+    
+    def _queue_popleft(self) -> Critter:
+        """Take the critter at the front of the queue"""
+        critter = self.critter_queue.popleft()
+        if self._undo_log is not None:
+            self._undo_log.append((self.critter_queue.appendleft, (critter,)))
+        queue_hash = ((self._queue_hash - _queue_key(critter)) * _QUEUE_MULTIPLIER_INVERSE) & MASK64
+        self.position_hash ^= _mix64(self._queue_hash) ^ _mix64(queue_hash)
+        self._queue_hash = queue_hash
+        return critter
+    
+    def _queue_append(self, critter: Critter):
+        """Put a critter at the back of the queue"""
+        length = len(self.critter_queue)
+        if length < len(_QUEUE_WEIGHTS):
+            weight = _QUEUE_WEIGHTS[length]
+        else:
+            weight = pow(_QUEUE_MULTIPLIER, length, 1 << 64)
+        queue_hash = (self._queue_hash + _queue_key(critter) * weight) & MASK64
+        self.position_hash ^= _mix64(self._queue_hash) ^ _mix64(queue_hash)
+        self._queue_hash = queue_hash
+        if self._undo_log is not None:
+            self._undo_log.append((self.critter_queue.pop, ()))
+        self.critter_queue.append(critter)
+    
+    @staticmethod
+    def _slot_of(critters: list, critter: Critter) -> Optional[int]:
+        """Index of this exact critter object in a location, or None"""
+        if type(critters) is CritterList:
+            return critters.slots.get(id(critter))
+        for slot, other in enumerate(critters):
+            if other is critter:
+                return slot
+        return None
+    
     def _apply_placement_effects(self, critter: Critter, location: Location):
         """Apply effects when a critter is placed at a location"""
-        
-        # Grizzly: Give -1 mushrooms per day to other critters at area
-        if critter.type == CritterType.GRIZZLY:
-            for other in location.critters[:-1]:  # Exclude the just-added critter
-                other.current_mushrooms_per_day = max(0, other.current_mushrooms_per_day - 1)
-        
-        # Goose: Summon basic 1/2 copies until area is full
-        if critter.type == CritterType.GOOSE:
-            while not location.is_full():
-                goose_copy = Critter(CritterType.GOOSE, 1, 2)
-                goose_copy.current_location_id = location.id
-                location.critters.append(goose_copy)
-                
-                # Track the new critter
-                self.all_critters_ever.append(goose_copy)
-                
-                # Apply location effects to the duplicate (they are "entering" the location)
-                self._apply_location_effects(goose_copy, location)
-                
-                # Apply Rhino/Sheep effects for the duplicate entering
-                self._apply_rhino_sheep_effects(goose_copy, location)
+        # Grizzly, Goose, ...
+        if self._on_place is not None:
+            hook = self._on_place[critter.type.code]
+            if hook is not None:
+                hook(self, critter, location)
         
         # Rhino/Sheep effects on existing critters
         self._apply_rhino_sheep_effects(critter, location)
     
     def _apply_rhino_sheep_effects(self, entering_critter: Critter, location: Location):
-        """Apply Rhino/Sheep effects when a critter enters a location"""
-        for existing in location.critters[:-1]:  # Exclude the just-added critter
-            if existing.type == CritterType.RHINO:
-                buff_amount = 1
-                if entering_critter.type == CritterType.PENGUIN:
-                    # Penguin swaps mushroom buff to lifespan buff
-                    existing.current_lifespan += buff_amount
-                else:
-                    existing.current_mushrooms_per_day += buff_amount
-            
-            elif existing.type == CritterType.SHEEP:
-                buff_amount = 1
-                if entering_critter.type == CritterType.PENGUIN:
-                    # Penguin swaps lifespan buff to mushroom buff
-                    existing.current_mushrooms_per_day += buff_amount
-                else:
-                    existing.current_lifespan += buff_amount
+        """Let the critters already at a location react to one entering (Rhino/Sheep)"""
+        hooks = self._on_other_enter
+        if hooks is not None:
+            critters = location.critters
+            if type(critters) is CritterList:
+                # A large location: only its Rhinos and Sheep
+                reacting = critters.of_types(self._other_enter_types)
+                if reacting and reacting[-1] is critters[-1]:
+                    reacting.pop()
+            else:
+                reacting = critters[:-1]  # Exclude the just-added critter
+            for existing in reacting:
+                hook = hooks[existing.type.code]
+                if hook is not None:
+                    hook(self, existing, entering_critter, location)
     
     def _apply_location_effects(self, critter: Critter, location: Location):
         """Apply location-specific effects to newly placed critter"""
-        if location.type == LocationType.CANYON:
-            # Canyon gives +1 mushrooms per day and +1 lifespan
-            # Penguin swaps these effects
-            critter.current_mushrooms_per_day += 1
-            critter.current_lifespan += 1
+        if self._on_enter_location is not None:
+            hook = self._on_enter_location[location.type.code]
+            if hook is not None:
+                hook(self, critter, location)
     
     def _rotate_queue(self, chosen_index: int):
         """Remove chosen critter and move unchosen critter to back"""
         if chosen_index == 0:
             # Remove first critter (chosen)
-            self.critter_queue.popleft()
+            self._queue_popleft()
             # Move second critter (unchosen) to back if it exists
             if len(self.critter_queue) >= 1:
-                unchosen = self.critter_queue.popleft()
-                self.critter_queue.append(unchosen)
+                unchosen = self._queue_popleft()
+                self._queue_append(unchosen)
         else:
             # chosen_index == 1, remove second critter and move first to back
             if len(self.critter_queue) >= 2:
                 # Move first critter (unchosen) to back
-                unchosen = self.critter_queue.popleft()  # Remove first
-                self.critter_queue.popleft()  # Remove second (chosen)
-                self.critter_queue.append(unchosen)  # Put first at back
+                unchosen = self._queue_popleft()  # Remove first
+                self._queue_popleft()  # Remove second (chosen)
+                self._queue_append(unchosen)  # Put first at back
     
     def _collect_mushrooms(self):
         """Calculate mushroom collection for all locations"""
+        critter_checks = self._critter_can_collect
         for location in self.locations:
+            if not location.critters:
+                continue
             daily_collection = 0
+            location_check = None
+            if self._location_can_collect is not None:
+                location_check = self._location_can_collect[location.type.code]
             
             for critter in location.critters:
-                can_collect = True
-                collection_amount = 0
+                # Crocodile (only when alone), Jungle (2+ mushrooms per day only), ...
+                if critter_checks is not None:
+                    check = critter_checks[critter.type.code]
+                    if check is not None and not check(self, critter, location):
+                        continue
+                if location_check is not None and not location_check(self, critter, location):
+                    continue
                 
-                # Crocodile: Can only collect when alone
-                if critter.type == CritterType.CROCODILE and len(location.critters) > 1:
-                    can_collect = False
-                
-                # Jungle: Only 2+ mushrooms per day critters can collect
-                if location.type == LocationType.JUNGLE and critter.current_mushrooms_per_day < 2:
-                    can_collect = False
-                
-                if can_collect:
-                    # Calculate how much this critter can collect (limited by remaining mushrooms)
-                    available_mushrooms = max(0, location.mushrooms - daily_collection)
-                    collection_amount = min(critter.current_mushrooms_per_day, available_mushrooms)
-                    if collection_amount > 0:
-                        critter.mushrooms_collected += collection_amount
-                        daily_collection += collection_amount
+                # Calculate how much this critter can collect (limited by remaining mushrooms)
+                available_mushrooms = max(0, location.mushrooms - daily_collection)
+                collection_amount = min(critter.current_mushrooms_per_day, available_mushrooms)
+                if collection_amount > 0:
+                    self._set(critter, 'mushrooms_collected', critter.mushrooms_collected + collection_amount)
+                    daily_collection += collection_amount
             
-            location.mushrooms = max(0, location.mushrooms - daily_collection)
+            remaining = max(0, location.mushrooms - daily_collection)
+            if remaining != location.mushrooms:
+                self._set_mushrooms(location, remaining)
     
     def _remove_completed_locations(self):
         """Remove locations with 0 mushrooms and their critters"""
         for location in self.locations[:]:  # Create a copy to iterate over
-            if location.mushrooms <= 0:
-                location.critters.clear()
+            if location.mushrooms <= 0 and location.critters:
+                self._replace_critters(location, [])
     
     def _apply_end_of_day_effects(self):
         """Apply end-of-day effects like Gopher movement"""
-        gophers_to_move = []
-        
-        # Find all gophers that need to move
-        for location in self.locations:
-            for critter in location.critters[:]:  # Copy to avoid modification during iteration
-                if critter.type == CritterType.GOPHER:
-                    gophers_to_move.append((critter, location.id))
+        hooks = self._on_night
+        if hooks is None:
+            return
         
-        # Process gopher movements
-        for gopher, current_loc_id in gophers_to_move:
-            moved = False
-            
-            # Try next location first
-            next_loc_id = (current_loc_id + 1) % 3
-            target_location = self.locations[next_loc_id]
-            
-            if not target_location.is_full():
-                # Move to next location
-                self.locations[current_loc_id].critters.remove(gopher)
-                gopher.current_location_id = next_loc_id
-                target_location.critters.append(gopher)
-                # Apply Rhino/Sheep effects when Gopher enters new location
-                self._apply_rhino_sheep_effects(gopher, target_location)
-                # Apply location effects when Gopher enters new location
-                self._apply_location_effects(gopher, target_location)
-                moved = True
-            else:
-                # Next location is full, try the one after that (skip)
-                skip_loc_id = (current_loc_id + 2) % 3
-                skip_location = self.locations[skip_loc_id]
-                
-                if not skip_location.is_full():
-                    # Move to the location after next (skip the full one)
-                    self.locations[current_loc_id].critters.remove(gopher)
-                    gopher.current_location_id = skip_loc_id
-                    skip_location.critters.append(gopher)
-                    # Apply Rhino/Sheep effects when Gopher enters new location
-                    self._apply_rhino_sheep_effects(gopher, skip_location)
-                    # Apply location effects when Gopher enters new location
-                    self._apply_location_effects(gopher, skip_location)
-                    moved = True
-            
-            # If couldn't move to either location, try to add to queue
-            if not moved:
-                if len(self.critter_queue) < 8:
-                    self.locations[current_loc_id].critters.remove(gopher)
-                    gopher.current_location_id = None
-                    self.critter_queue.append(gopher)
-                # If no queue spot available, gopher stays put
+        # Find every critter with a night rule first, so one that moves is not visited twice
+        # (at a large location, only its Gophers from the index)
+        acting = [(critter, location) for location in self.locations
+                  for critter in (location.critters.of_types(self._night_types)
+                                  if type(location.critters) is CritterList else location.critters)
+                  if hooks[critter.type.code] is not None]
+        for critter, location in acting:
+            hooks[critter.type.code](self, critter, location)
     
     def _advance_day(self):
         """Advance day and reduce lifespans"""
         # Reduce lifespans for all critters (except those at Beach)
         for location in self.locations:
             if location.type != LocationType.BEACH:
-                for critter in location.critters:
-                    critter.current_lifespan -= 1
+                for slot, critter in enumerate(location.critters):
+                    if critter.current_location_id != location.id:
+                        slot = None  # Placed by hand without its location; let _set_stat look
+                    self._set_stat(critter, 'current_lifespan', critter.current_lifespan - 1, slot)
             
             # Remove critters with 0 lifespan
-            location.critters = [c for c in location.critters if c.current_lifespan > 0]
+            survivors = [c for c in location.critters if c.current_lifespan > 0]
+            if len(survivors) < len(location.critters):
+                self._replace_critters(location, survivors)
         
-        self.day += 1
+        self._set_day(self.day + 1)
     
     def _check_game_over(self):
         """Check if the game is won or lost"""
         # Check win condition: all locations have 0 mushrooms
         if all(location.mushrooms <= 0 for location in self.locations):
-            self.game_won = True
-            self.game_over = True
+            self._set(self, 'game_won', True)
+            self._set(self, 'game_over', True)
             return
         
         # Check lose condition: day 8 with mushrooms remaining
         if self.day > 7:
-            self.game_over = True
+            self._set(self, 'game_over', True)
             return
     
     def get_game_state(self) -> dict:
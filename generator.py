@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+Puzzle generator for Spilled Mushrooms
+
+Two modes, both of which only emit puzzles with a known winning line:
+    "verify": sample a lineup and mushroom counts, keep the puzzle once the solver
+              proves it winnable
+    "playout": play the lineup on a board that cannot be emptied, then give each
+               location at most what was collected there, so the playout is a win
+"""
+
+from typing import Iterator, List, Optional, Sequence, Tuple
+from config import GameConfig
+from game_engine import GameEngine
+from models import CritterType, LocationType
+from policies import greedy_move
+from seeding import Seed, make_rng
+from solver import SearchCancelled, Solver, collection_bound
+
+# Starting mushrooms per location for construction playouts, more than can ever be collected
+OPEN_BOARD_MUSHROOMS = 999
+
+
+def greedy_line(engine: GameEngine) -> List[Tuple[int, int]]:
+    """Play the move that leaves the fewest mushrooms each day until the game ends"""
+    line = []
+    while not engine.game_over and engine.get_valid_moves():
+        move = greedy_move(engine)
+        engine.process_turn(*move)
+        line.append(move)
+    return line
+
+
+class PuzzleGenerator:
+    """Seedable source of solvable puzzles"""
+
+    MODES = ("verify", "playout")
+    PLAYOUT_POLICIES = ("random", "greedy")
+
+    def __init__(self, seed: Seed = None, num_critters: int = 8,
+                 required_critters: Sequence[str] = (), allowed_critters: Optional[Sequence[str]] = None,
+                 location_types: Optional[Sequence[str]] = None,
+                 mushroom_range: Tuple[int, int] = (5, 15), max_nodes: int = 300,
+                 mode: str = "verify", playout_policy: str = "random"):
+        """
+        Args:
+            seed: int seed for the generator's own random.Random (same seed, same puzzles),
+                  or a random.Random to draw from
+            num_critters: length of the critter queue
+            required_critters: critter types that must appear (repeat a type to require several)
+            allowed_critters: types the rest of the lineup is drawn from (all types by default)
+            location_types: the location mix, one location per entry (one of each type by default)
+            mushroom_range: inclusive range each location's starting mushrooms are drawn from;
+                            locations always get different counts
+            max_nodes: solver budget per candidate; candidates not proven winnable within it
+                       are rejected ("verify" mode)
+            mode: "verify" (generate then solve) or "playout" (construct from a playout)
+            playout_policy: how construction playouts choose moves, "random" or "greedy"
+        """
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown generation mode '{mode}', expected one of {self.MODES}")
+        if playout_policy not in self.PLAYOUT_POLICIES:
+            raise ValueError(f"Unknown playout policy '{playout_policy}', expected one of {self.PLAYOUT_POLICIES}")
+        self.mode = mode
+        self.playout_policy = playout_policy
+        self.rng = make_rng(seed)
+        self.num_critters = num_critters
+        self.required_critters = [CritterType(name.lower()).value for name in required_critters]
+        allowed = allowed_critters if allowed_critters is not None else [ct.value for ct in CritterType]
+        self.allowed_critters = [CritterType(name.lower()).value for name in allowed]
+        types = location_types if location_types is not None else [lt.value for lt in LocationType]
+        self.location_types = [LocationType(name.lower()).value for name in types]
+        self.mushroom_range = mushroom_range
+        self.max_nodes = max_nodes
+
+        low, high = mushroom_range
+        if len(self.required_critters) > num_critters:
+            raise ValueError(f"{len(self.required_critters)} required critters do not fit in a queue of {num_critters}")
+        if not self.allowed_critters and len(self.required_critters) < num_critters:
+            raise ValueError("No allowed critters to fill the rest of the lineup")
+        if not 0 < low <= high or high - low + 1 < len(self.location_types):
+            raise ValueError(f"Mushroom range {mushroom_range} cannot give {len(self.location_types)} "
+                             f"different positive counts")
+
+        self.attempts = 0
+        self.rejected_by_bound = 0
+        self.rejected_by_search = 0
+        self.rejected_by_playout = 0
+
+    def sample(self) -> GameConfig:
+        """Draw one candidate puzzle without checking it"""
+        critters = self.required_critters + self.rng.choices(
+            self.allowed_critters, k=self.num_critters - len(self.required_critters))
+        self.rng.shuffle(critters)
+        counts = self.rng.sample(range(self.mushroom_range[0], self.mushroom_range[1] + 1),
+                                 len(self.location_types))
+        locations = [{"type": location_type, "mushrooms": mushrooms}
+                     for location_type, mushrooms in zip(self.location_types, counts)]
+        return GameConfig(critters=critters, locations=locations)
+
+    def verify(self, config: GameConfig) -> Optional[List[Tuple[int, int]]]:
+        """
+        Winning line for the puzzle, or None if none was found within the node budget
+
+        A greedy playout settles most easy candidates; the rest go to the solver.
+        """
+        engine = GameEngine(config)
+        if collection_bound(engine) < sum(loc.mushrooms for loc in engine.locations):
+            self.rejected_by_bound += 1
+            return None
+
+        line = greedy_line(engine)
+        if engine.game_won:
+            return line
+
+        engine = GameEngine(config)
+        solver = Solver(max_nodes=self.max_nodes)
+        try:
+            remaining = solver.search(engine, 1)
+        except SearchCancelled:
+            remaining = None
+        if remaining != 0:
+            self.rejected_by_search += 1
+            return None
+        return solver.principal_line(engine, 0)
+
+    def construct(self) -> Optional[GameConfig]:
+        """
+        Build a puzzle around a playout, or None if the playout does not make one
+
+        The sampled lineup is played on an open board. Each location then starts with
+        a count drawn from the mushroom range, capped at what the playout collected
+        there. The playout is replayed on the finished puzzle to confirm the win and
+        is stored as its solution.
+        """
+        candidate = self.sample()
+        open_board = GameConfig(critters=candidate.critters, locations=[
+            {"type": loc["type"], "mushrooms": OPEN_BOARD_MUSHROOMS} for loc in candidate.locations])
+        engine = GameEngine(open_board)
+        if self.playout_policy == "greedy":
+            line = greedy_line(engine)
+        else:
+            line = []
+            while not engine.game_over and engine.get_valid_moves():
+                move = self.rng.choice(engine.get_valid_moves())
+                engine.process_turn(*move)
+                line.append(move)
+
+        low, high = self.mushroom_range
+        counts = []
+        for location in engine.locations:
+            collected = OPEN_BOARD_MUSHROOMS - location.mushrooms
+            if collected < low:
+                self.rejected_by_playout += 1
+                return None
+            counts.append(self.rng.randint(low, min(high, collected)))
+        if len(set(counts)) < len(counts):
+            self.rejected_by_playout += 1
+            return None
+
+        # An emptied location loses its critters, so an early finish can change the rest
+        config = GameConfig(critters=candidate.critters, locations=[
+            {"type": loc["type"], "mushrooms": mushrooms} for loc, mushrooms in zip(candidate.locations, counts)])
+        engine = GameEngine(config)
+        solution = []
+        for move in line:
+            if engine.game_over or move not in engine.get_valid_moves():
+                break
+            engine.process_turn(*move)
+            solution.append(list(move))
+        if not engine.game_won:
+            self.rejected_by_playout += 1
+            return None
+        config.solution = solution
+        return config
+
+    def generate(self) -> GameConfig:
+        """Sample until a candidate has a winning line, which is stored as its solution"""
+        while True:
+            self.attempts += 1
+            if self.mode == "playout":
+                config = self.construct()
+                if config is not None:
+                    return config
+                continue
+            config = self.sample()
+            line = self.verify(config)
+            if line is not None:
+                config.solution = [list(move) for move in line]
+                return config
+
+    def generate_many(self, count: int) -> List[GameConfig]:
+        return [self.generate() for _ in range(count)]
+
+    def __iter__(self) -> Iterator[GameConfig]:
+        while True:
+            yield self.generate()
+
+    def stats(self) -> dict:
+        return {
+            'attempts': self.attempts,
+            'rejected_by_bound': self.rejected_by_bound,
+            'rejected_by_search': self.rejected_by_search,
+            'rejected_by_playout': self.rejected_by_playout,
+        }
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    for mode in PuzzleGenerator.MODES:
+        generator = PuzzleGenerator(seed=0, mode=mode)
+        start = time.perf_counter()
+        puzzles = generator.generate_many(count)
+        elapsed = time.perf_counter() - start
+        print(f"{mode}: {count} puzzles in {elapsed:.2f}s ({count / elapsed:.0f}/s), {generator.stats()}")
+        print(f"  First: {puzzles[0]}")
@@ -9,6 +9,7 @@ import sys
 import os
 from game_ui import GameUI
 from logger import logged_output
+from puzzle_bank import split_puzzle_reference
 
 
 def main():
@@ -18,7 +19,8 @@ def main():
     # Check for config file argument
     if len(sys.argv) > 1:
         config_path = sys.argv[1]
-        if os.path.exists(config_path):
+        reference = split_puzzle_reference(config_path)
+        if os.path.exists(config_path) or (reference and os.path.exists(reference[0])):
             config = config_path
             print(f"Loading configuration from: {config_path}")
         else:
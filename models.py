@@ -12,12 +12,19 @@ class CritterType(Enum):
     GRIZZLY = "grizzly"
     GOOSE = "goose"
     SHEEP = "sheep"
+    
+    def __init__(self, value):
+        # Small integer code (declaration order) used when packing positions
+        self.code = len(type(self).__members__)
 
 
 class LocationType(Enum):
     BEACH = "beach"
     CANYON = "canyon"
     JUNGLE = "jungle"
+    
+    def __init__(self, value):
+        self.code = len(type(self).__members__)
 
 
 @dataclass
@@ -41,6 +48,88 @@ class Critter:
         return f"{self.type.value.title()} ({self.current_mushrooms_per_day}/{self.current_lifespan}){location}"
 
 
+class CritterList(list):
+    """
+    A location's critters, indexed by type and by slot
+
+    by_type maps a type code to the critters of that type here in slot order (a list
+    can be empty) and slots maps id(critter) to its slot; read them, do not modify
+    them. Every list operation keeps both current, so editing the list directly never
+    leaves them stale. Appending and popping the last critter update them in place;
+    any other change rebuilds them.
+    """
+    __slots__ = ("by_type", "slots")
+
+    def __init__(self, critters=()):
+        list.__init__(self, critters)
+        self._reindex()
+
+    def __reduce__(self):
+        return CritterList, (list(self),)
+
+    def _reindex(self):
+        by_type = {}
+        for critter in self:
+            code = critter.type.code
+            if code in by_type:
+                by_type[code].append(critter)
+            else:
+                by_type[code] = [critter]
+        self.by_type = by_type
+        self.slots = {id(critter): slot for slot, critter in enumerate(self)}
+
+    def of_types(self, codes) -> List[Critter]:
+        """The critters here whose type code is in codes, in slot order"""
+        found = [critter for code in codes for critter in self.by_type.get(code, ())]
+        if len(codes) > 1:
+            found.sort(key=lambda critter: self.slots[id(critter)])
+        return found
+
+    def append(self, critter: Critter):
+        self.slots[id(critter)] = len(self)
+        list.append(self, critter)
+        same_type = self.by_type.get(critter.type.code)
+        if same_type is None:
+            self.by_type[critter.type.code] = [critter]
+        else:
+            same_type.append(critter)
+
+    def pop(self, index: int = -1) -> Critter:
+        last = index == -1 or index == len(self) - 1
+        critter = list.pop(self, index)
+        if last:
+            del self.slots[id(critter)]
+            self.by_type[critter.type.code].pop()
+        else:
+            self._reindex()
+        return critter
+
+    def _reindexing(method):
+        def wrapper(self, *args, **kwargs):
+            result = method(self, *args, **kwargs)
+            self._reindex()
+            return result
+        wrapper.__name__ = method.__name__
+        return wrapper
+
+    insert = _reindexing(list.insert)
+    remove = _reindexing(list.remove)
+    extend = _reindexing(list.extend)
+    clear = _reindexing(list.clear)
+    sort = _reindexing(list.sort)
+    reverse = _reindexing(list.reverse)
+    __setitem__ = _reindexing(list.__setitem__)
+    __delitem__ = _reindexing(list.__delitem__)
+    __iadd__ = _reindexing(list.__iadd__)
+    __imul__ = _reindexing(list.__imul__)
+    del _reindexing
+
+
+# Locations that can hold more critters than this keep them in a CritterList; smaller
+# ones use a plain list, which is cheaper to scan than an index is to keep up
+INDEXED_CAPACITY = 32
+
+
 @dataclass
 class Location:
     id: int
@@ -49,6 +138,10 @@ class Location:
     max_critters: int = 3
     critters: List[Critter] = field(default_factory=list)
     
+    def __post_init__(self):
+        if self.max_critters > INDEXED_CAPACITY and type(self.critters) is not CritterList:
+            self.critters = CritterList(self.critters)
+    
     def is_full(self) -> bool:
         return len(self.critters) >= self.max_critters
     
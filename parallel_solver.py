@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Parallel puzzle solver for Spilled Mushrooms
+
+Splits the first one or two plies of the search into subtrees and hands them to a
+process pool as workers become free. A win found by any worker cancels the rest.
+"""
+
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import List, Optional, Tuple
+from game_engine import GameEngine
+from solver import SearchCancelled, Solver, SolveResult, _distinct_moves, solve
+from transposition import SharedTranspositionTable, TranspositionTable
+
+# Per-process state set up by _init_worker
+_table = None
+_stop_event = None
+
+
+def _init_worker(stop_event, table_name: Optional[str], table_capacity: int):
+    """Attach to the shared table, or keep a private one for every subtree this worker searches"""
+    global _table, _stop_event
+    _stop_event = stop_event
+    if table_name is not None:
+        _table = SharedTranspositionTable.attach(table_name, table_capacity)
+    else:
+        _table = TranspositionTable()
+
+
+def _search_subtree(state: bytes, prefix: List[Tuple[int, int]], cutoff: int):
+    """Worker task: search the position reached by playing prefix from the packed root"""
+    engine = GameEngine.from_state(state)
+    for move in prefix:
+        engine.push_move(*move)
+
+    solver = Solver(_table, stop_event=_stop_event)
+    try:
+        remaining = solver.search(engine, cutoff)
+    except SearchCancelled:
+        return None, [], solver.nodes, solver.pruned
+    line = solver.principal_line(engine, remaining) if remaining < cutoff else []
+    return remaining, line, solver.nodes, solver.pruned
+
+
+def split_moves(engine: GameEngine, depth: int) -> List[List[Tuple[int, int]]]:
+    """Move prefixes of `depth` plies (fewer where the game ends), one per distinct position"""
+    prefixes = []
+    seen = set()
+
+    def walk(prefix):
+        moves = _distinct_moves(engine) if len(prefix) < depth and not engine.game_over else []
+        if not moves:
+            if engine.position_hash not in seen:
+                seen.add(engine.position_hash)
+                prefixes.append(list(prefix))
+            return
+        for move in moves:
+            engine.push_move(*move)
+            prefix.append(move)
+            walk(prefix)
+            prefix.pop()
+            engine.pop_move()
+
+    walk([])
+    return prefixes
+
+
+def parallel_solve(config=None, workers: Optional[int] = None, split_depth: int = 2,
+                   share_table: bool = False, minimize: bool = False,
+                   table_bytes: int = 64 * 1024 * 1024) -> SolveResult:
+    """
+    Decide whether a puzzle can be won using a pool of worker processes
+
+    Args:
+        config: GameConfig object, config file path (str), or GameEngine position to solve from
+        workers: number of processes (os.cpu_count() by default; 1 solves in this process)
+        split_depth: plies expanded here before handing subtrees to workers (1 or 2)
+        share_table: give all workers one SharedTranspositionTable instead of a table each
+        minimize: as for solve(); later subtrees are searched against the best found so far
+        table_bytes: size of the shared table
+    """
+    engine = config.clone() if isinstance(config, GameEngine) else GameEngine(config)
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1:
+        return solve(engine, minimize=minimize)
+
+    root = engine.to_state()
+    cutoff = sum(loc.mushrooms for loc in engine.locations) + 1 if minimize else 1
+    pending = iter(split_moves(engine, split_depth))
+
+    context = multiprocessing.get_context()
+    stop_event = context.Event()
+    shared = SharedTranspositionTable.create(table_bytes) if share_table else None
+    initargs = (stop_event, shared.name if shared else None, shared.capacity if shared else 0)
+
+    best_remaining, best_line, exact = None, [], False
+    nodes = pruned = 0
+    try:
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker,
+                                 initargs=initargs) as pool:
+            running = {}
+
+            def submit_next():
+                prefix = next(pending, None)
+                if prefix is not None:
+                    limit = cutoff if not exact else min(cutoff, best_remaining)
+                    running[pool.submit(_search_subtree, root, prefix, limit)] = (prefix, limit)
+
+            # Keep a couple of subtrees queued per worker so nobody waits for work
+            for _ in range(2 * workers):
+                submit_next()
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    prefix, limit = running.pop(future)
+                    remaining, line, subtree_nodes, subtree_pruned = future.result()
+                    nodes += subtree_nodes
+                    pruned += subtree_pruned
+                    if remaining is None:
+                        continue
+                    if remaining < limit and (not exact or remaining < best_remaining):
+                        best_remaining, best_line, exact = remaining, prefix + line, True
+                    elif not exact and (best_remaining is None or remaining < best_remaining):
+                        best_remaining = remaining  # Only a lower bound so far
+                    submit_next()
+
+                if exact and best_remaining == 0:
+                    stop_event.set()
+                    for future in running:
+                        future.cancel()
+                    break
+    finally:
+        if shared is not None:
+            shared.close()
+            shared.unlink()
+
+    return SolveResult(best_remaining == 0, best_line, best_remaining, nodes, pruned, exact)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    paths = sys.argv[1:] or ["configs/balanced.json", "configs/high_damage.json"]
+    for path in paths:
+        start = time.perf_counter()
+        result = parallel_solve(path, share_table=True)
+        elapsed = time.perf_counter() - start
+        print(f"{path}: {result} in {elapsed:.3f}s")
+        if result.moves:
+            print(f"  Line: {result.moves}")
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Move-selection policies for headless Spilled Mushrooms games
+
+A policy is any callable policy(engine, rng) -> (critter index, location index) that
+returns one of engine.get_valid_moves(). It is only called while the game is running
+and has at least one valid move.
+"""
+
+import random
+from typing import Callable, Optional, Tuple
+from game_engine import GameEngine
+from solver import Solver
+from transposition import TranspositionTable
+
+Move = Tuple[int, int]
+Policy = Callable[[GameEngine, random.Random], Move]
+
+
+def first_move(engine: GameEngine, rng: random.Random) -> Move:
+    """The first valid move, as simple_game.py plays"""
+    return engine.get_valid_moves()[0]
+
+
+def random_move(engine: GameEngine, rng: random.Random) -> Move:
+    """A valid move chosen uniformly"""
+    return rng.choice(engine.get_valid_moves())
+
+
+def greedy_move(engine: GameEngine, rng: random.Random = None) -> Move:
+    """The move that leaves the fewest mushrooms at the end of the day (the first on ties)"""
+    best = None
+    for move in engine.get_valid_moves():
+        engine.push_move(*move)
+        remaining = sum(loc.mushrooms for loc in engine.locations)
+        engine.pop_move()
+        if best is None or remaining < best[0]:
+            best = (remaining, move)
+    return best[1]
+
+
+class OptimalPolicy:
+    """
+    Plays a move on a line that leaves the fewest mushrooms possible
+
+    One transposition table is kept for every game the policy plays, so repeated
+    games of the same puzzle only search it once.
+    """
+
+    def __init__(self, table: Optional[TranspositionTable] = None):
+        self.solver = Solver(table)
+
+    def __call__(self, engine: GameEngine, rng: random.Random = None) -> Move:
+        remaining = sum(loc.mushrooms for loc in engine.locations)
+        entry = self.solver.table.probe(engine.position_hash)
+        if entry is None or not entry.exact or entry.best_move is None:
+            best = self.solver.search(engine, remaining + 1)
+            entry = self.solver.table.probe(engine.position_hash)
+            if entry is None or not entry.exact or entry.best_move is None:
+                # The table would not keep this position (a deeper entry holds its slot)
+                return self.solver._best_move(engine, best)
+        return entry.best_move
+
+
+POLICIES = {
+    "first": first_move,
+    "random": random_move,
+    "greedy": greedy_move,
+    "optimal": OptimalPolicy,
+}
+
+
+def get_policy(policy) -> Policy:
+    """A policy callable from a name in POLICIES or a callable (passed through)"""
+    if callable(policy):
+        return policy
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy '{policy}', expected one of {list(POLICIES)}")
+    # Classes hold per-run state such as a solver table, so each run gets its own
+    return POLICIES[policy]() if isinstance(POLICIES[policy], type) else POLICIES[policy]
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Single-file puzzle bank for Spilled Mushrooms
+
+Puzzles are stored as fixed-width binary records read through mmap, so puzzle #n is
+one struct.unpack at a known offset however large the bank is. Secondary indexes by
+difficulty band and critter composition are stored after the records as sorted
+record-number lists plus a small JSON directory.
+
+Layout:
+    header   magic, version, record size, slot counts, record count, index location
+    records  critter codes, location type codes, location mushrooms, solution moves,
+             band code, score, winning lines
+    indexes  uint32 record numbers per band and per composition
+    directory JSON mapping index names to (offset, length) of their record numbers
+"""
+
+import heapq
+import json
+import mmap
+import struct
+from array import array
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence
+from config import GameConfig
+from difficulty import BANDS, Difficulty
+from models import CritterType, LocationType, LOCATION_STATS
+
+MAGIC = b"MUSHBANK"
+VERSION = 1
+HEADER = struct.Struct("<8sHHHHHIQQ")
+HEADER_BYTES = 64
+EMPTY = 0xFF  # Unused critter, location or solution slot, or an unscored band
+
+CRITTER_TYPES = list(CritterType)
+LOCATION_TYPES = list(LocationType)
+BAND_NAMES = [name for name, _ in BANDS] + ["unsolvable"]
+
+
+class BankEntry(NamedTuple):
+    """One stored puzzle and its difficulty summary"""
+    config: GameConfig
+    band: Optional[str]  # None if the puzzle was stored without a difficulty
+    score: Optional[float]
+    winning_lines: int
+
+
+def _record_struct(critter_slots: int, location_slots: int, solution_slots: int) -> struct.Struct:
+    return struct.Struct(f"<{critter_slots}B{location_slots}B{location_slots}H{solution_slots}BBHI")
+
+
+def composition_key(critters: Iterable[str]) -> str:
+    """Canonical 'type:count' string for a lineup, ignoring order"""
+    counts = {}
+    for name in critters:
+        critter_type = CritterType(name.lower())
+        counts[critter_type] = counts.get(critter_type, 0) + 1
+    return ",".join(f"{ct.value}:{counts[ct]}" for ct in CRITTER_TYPES if ct in counts)
+
+
+def _parse_composition(key: str) -> Dict[str, int]:
+    return {name: int(count) for name, count in (part.split(":") for part in key.split(",") if part)}
+
+
+class PuzzleBank:
+    """Read-only, memory-mapped view of a bank file"""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        (magic, version, record_size, self.critter_slots, self.location_slots, self.solution_slots,
+         self._count, self._index_offset, self._index_length) = HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a puzzle bank")
+        if version != VERSION:
+            raise ValueError(f"{path} is bank version {version}, expected {VERSION}")
+        self._record = _record_struct(self.critter_slots, self.location_slots, self.solution_slots)
+        if self._record.size != record_size:
+            raise ValueError(f"{path} has {record_size}-byte records, expected {self._record.size}")
+        self._directory = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> GameConfig:
+        return self.entry(index).config
+
+    def __iter__(self) -> Iterator[GameConfig]:
+        for index in range(self._count):
+            yield self.entry(index).config
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._mmap.close()
+
+    def entry(self, index: int) -> BankEntry:
+        """Decode record `index` (negative numbers count from the end)"""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(f"Puzzle #{index} is out of range for a bank of {self._count}")
+        fields = self._record.unpack_from(self._mmap, HEADER_BYTES + index * self._record.size)
+
+        critter_codes = fields[:self.critter_slots]
+        rest = fields[self.critter_slots:]
+        location_codes = rest[:self.location_slots]
+        mushrooms = rest[self.location_slots:2 * self.location_slots]
+        moves = rest[2 * self.location_slots:2 * self.location_slots + self.solution_slots]
+        band_code, score, winning_lines = rest[-3:]
+
+        config = GameConfig(
+            critters=[CRITTER_TYPES[code].value for code in critter_codes if code != EMPTY],
+            locations=[{"type": LOCATION_TYPES[code].value, "mushrooms": count}
+                       for code, count in zip(location_codes, mushrooms) if code != EMPTY],
+            solution=[[move >> 4, move & 0xF] for move in moves if move != EMPTY] or None,
+        )
+        if band_code == EMPTY:
+            return BankEntry(config, None, None, winning_lines)
+        return BankEntry(config, BAND_NAMES[band_code], score / 10000, winning_lines)
+
+    def _load_directory(self) -> dict:
+        if self._directory is None:
+            raw = self._mmap[self._index_offset:self._index_offset + self._index_length]
+            self._directory = json.loads(raw)
+        return self._directory
+
+    def _index(self, name: str) -> Sequence[int]:
+        location = self._load_directory().get(name)
+        if location is None:
+            return array('I')
+        offset, length = location
+        return array('I', self._mmap[offset:offset + 4 * length])
+
+    def band(self, name: str) -> Sequence[int]:
+        """Sorted record numbers of every puzzle in a difficulty band"""
+        if name not in BAND_NAMES:
+            raise ValueError(f"Unknown band '{name}', expected one of {BAND_NAMES}")
+        return self._index(f"band:{name}")
+
+    def compositions(self) -> List[str]:
+        """Every distinct lineup composition in the bank"""
+        return [name[len("composition:"):] for name in self._load_directory() if name.startswith("composition:")]
+
+    def with_composition(self, critters: Iterable[str]) -> Sequence[int]:
+        """Sorted record numbers of puzzles whose lineup is exactly these critters, in any order"""
+        return self._index(f"composition:{composition_key(critters)}")
+
+    def with_critters(self, critters: Iterable[str]) -> List[int]:
+        """Sorted record numbers of puzzles whose lineup includes at least these critters"""
+        required = _parse_composition(composition_key(critters))
+        matches = [self._index(f"composition:{key}") for key in self.compositions()
+                   if all(_parse_composition(key).get(name, 0) >= count for name, count in required.items())]
+        return list(heapq.merge(*matches))
+
+    @staticmethod
+    def write(path: str, configs: Iterable[GameConfig],
+              difficulties: Optional[Iterable[Optional[Difficulty]]] = None,
+              critter_slots: int = 8, location_slots: int = 3, solution_slots: int = 7) -> int:
+        """
+        Write a bank from configs (and matching difficulties), returning the record count
+
+        Records are streamed to disk; only the index record numbers are kept in memory.
+        """
+        record = _record_struct(critter_slots, location_slots, solution_slots)
+        indexes: Dict[str, array] = {}
+        difficulties = iter(difficulties) if difficulties is not None else None
+        count = 0
+
+        with open(path, 'wb') as f:
+            f.write(bytes(HEADER_BYTES))
+            for config in configs:
+                result = next(difficulties, None) if difficulties is not None else None
+                f.write(record.pack(*PuzzleBank._fields(config, result, critter_slots,
+                                                        location_slots, solution_slots)))
+                names = [f"composition:{composition_key(config.critters)}"]
+                if result is not None:
+                    names.append(f"band:{result.band}")
+                for name in names:
+                    indexes.setdefault(name, array('I')).append(count)
+                count += 1
+
+            directory = {}
+            offset = f.tell()
+            for name, numbers in indexes.items():
+                directory[name] = [offset, len(numbers)]
+                numbers.tofile(f)
+                offset += 4 * len(numbers)
+            raw = json.dumps(directory).encode()
+            f.write(raw)
+
+            f.seek(0)
+            f.write(HEADER.pack(MAGIC, VERSION, record.size, critter_slots, location_slots, solution_slots,
+                                count, offset, len(raw)))
+        return count
+
+    @staticmethod
+    def _fields(config: GameConfig, result: Optional[Difficulty], critter_slots: int,
+                location_slots: int, solution_slots: int) -> list:
+        critters = [CritterType(name.lower()).code for name in config.critters]
+        locations = config.locations
+        if locations is None:  # The default board, stored as the locations it plays on
+            locations = [{"type": location_type.value, "mushrooms": mushrooms}
+                         for location_type, mushrooms in LOCATION_STATS.items()]
+        solution = config.solution or []
+        if len(critters) > critter_slots or len(locations) > location_slots or len(solution) > solution_slots:
+            raise ValueError(f"Puzzle does not fit in {critter_slots} critters, {location_slots} locations "
+                             f"and {solution_slots} solution moves")
+        if any(not 0 < loc["mushrooms"] <= 0xFFFF for loc in locations):
+            raise ValueError("Location mushrooms must be between 1 and 65535")
+        if any(not (0 <= critter <= 0xF and 0 <= location <= 0xF) for critter, location in solution):
+            raise ValueError("Solution moves must have critter and location indexes between 0 and 15")
+
+        pad = location_slots - len(locations)
+        fields = critters + [EMPTY] * (critter_slots - len(critters))
+        fields += [LocationType(loc["type"].lower()).code for loc in locations] + [EMPTY] * pad
+        fields += [loc["mushrooms"] for loc in locations] + [0] * pad
+        fields += [(critter << 4) | location for critter, location in solution]
+        fields += [EMPTY] * (solution_slots - len(solution))
+        if result is None:
+            fields += [EMPTY, 0, 0]
+        else:
+            fields += [BAND_NAMES.index(result.band), round(result.score * 10000),
+                       min(result.winning_lines, 0xFFFFFFFF)]
+        return fields
+
+
+def split_puzzle_reference(reference: str) -> Optional[tuple]:
+    """('bank path', number) for references like 'puzzles.bank#48213', otherwise None"""
+    path, _, number = reference.rpartition('#')
+    if path and number.isdigit():
+        return path, int(number)
+    return None
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    from config import dedupe_configs
+    from difficulty import difficulty
+    from generator import PuzzleGenerator
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 puzzle_bank.py <bank file> [count] [--score]")
+        sys.exit(1)
+
+    path = sys.argv[1]
+    count = int(sys.argv[2]) if len(sys.argv) > 2 and sys.argv[2].isdigit() else 1000
+    generator = PuzzleGenerator(seed=0, mode="playout")
+    puzzles = list(dedupe_configs(generator.generate_many(count)))
+    scores = [difficulty(config) for config in puzzles] if "--score" in sys.argv else None
+
+    start = time.perf_counter()
+    PuzzleBank.write(path, puzzles, scores)
+    print(f"Wrote {len(puzzles)} distinct puzzles to {path} in {time.perf_counter() - start:.2f}s")
+    with PuzzleBank(path) as bank:
+        start = time.perf_counter()
+        for index in range(len(bank)):
+            bank.entry(index)
+        print(f"Read every record in {time.perf_counter() - start:.2f}s; puzzle #0: {bank.entry(0)}")
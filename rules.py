@@ -0,0 +1,181 @@
+"""
+Critter and location rules for Spilled Mushrooms, registered as hooks by type
+
+Each rule is a function registered for a phase and one or more critter or location
+types. A GameEngine takes its dispatch tables from dispatch_tables() when it is
+created: a list per phase indexed by type code, or None when nothing is registered
+for the phase, which the engine then skips without looking at any critter. At a
+large-capacity location the on_other_enter and on_night hooks are only offered the
+critters of their types, which the engine finds through its CritterList index.
+
+Critter phases:
+    on_place(engine, critter, location)                 the critter was just placed there
+    on_other_enter(engine, existing, entering, location) another critter entered its location
+    can_collect(engine, critter, location) -> bool      whether it may collect today
+    on_night(engine, critter, location)                 after collection, before lifespans drop
+
+Location phases:
+    on_enter_location(engine, critter, location)        a critter entered (placed, summoned or moved)
+    can_collect(engine, critter, location) -> bool      whether a critter there may collect today
+
+Hooks change the position only through GameEngine's undo-logged helpers (_set_stat,
+_place, _remove, ...), so push_move/pop_move and position_hash keep working.
+"""
+
+from enum import Enum
+from typing import Callable, Dict, List, Optional, Tuple, Type
+from models import Critter, CritterType, LocationType
+
+CRITTER_PHASES = ("on_place", "on_other_enter", "can_collect", "on_night")
+LOCATION_PHASES = ("on_enter_location", "can_collect")
+
+CRITTER_HOOKS: Dict[str, Dict[CritterType, Callable]] = {phase: {} for phase in CRITTER_PHASES}
+LOCATION_HOOKS: Dict[str, Dict[LocationType, Callable]] = {phase: {} for phase in LOCATION_PHASES}
+
+
+def critter_hook(phase: str, *critter_types: CritterType):
+    """Decorator registering a rule for critters of these types (engines created afterwards use it)"""
+    if phase not in CRITTER_HOOKS:
+        raise ValueError(f"Unknown critter phase '{phase}', expected one of {CRITTER_PHASES}")
+
+    def register(function):
+        global _tables
+        for critter_type in critter_types:
+            CRITTER_HOOKS[phase][critter_type] = function
+        _tables = None
+        return function
+    return register
+
+
+def location_hook(phase: str, *location_types: LocationType):
+    """Decorator registering a rule for locations of these types"""
+    if phase not in LOCATION_HOOKS:
+        raise ValueError(f"Unknown location phase '{phase}', expected one of {LOCATION_PHASES}")
+
+    def register(function):
+        global _tables
+        for location_type in location_types:
+            LOCATION_HOOKS[phase][location_type] = function
+        _tables = None
+        return function
+    return register
+
+
+def _dispatch_table(hooks: Dict[Enum, Callable], types: Type[Enum]) -> Optional[List[Optional[Callable]]]:
+    """Hooks of one phase as a list indexed by type code, or None if there are none"""
+    if not hooks:
+        return None
+    return [hooks.get(member) for member in types]
+
+
+def _hooked_types(hooks: Dict[Enum, Callable]) -> Tuple[int, ...]:
+    """Codes of the types with a hook in one phase, for looking them up in CritterList indexes"""
+    return tuple(sorted(member.code for member in hooks))
+
+
+_tables = None
+_tables_key = None
+
+
+def dispatch_tables() -> Dict[str, Optional[List[Optional[Callable]]]]:
+    """
+    Tables for every phase as they stand now, keyed "critter:<phase>" / "location:<phase>",
+    plus "critter:<phase>:types", the codes of the critter types each critter phase acts on
+
+    Rebuilt on first use after the registry changes and shared by the engines created
+    until the next change; engines never modify them.
+    """
+    global _tables, _tables_key
+    key = tuple(len(hooks) for hooks in CRITTER_HOOKS.values()) + \
+        tuple(len(hooks) for hooks in LOCATION_HOOKS.values())
+    if _tables is None or key != _tables_key:
+        _tables = {f"critter:{phase}": _dispatch_table(CRITTER_HOOKS[phase], CritterType)
+                   for phase in CRITTER_PHASES}
+        _tables.update({f"critter:{phase}:types": _hooked_types(CRITTER_HOOKS[phase])
+                        for phase in CRITTER_PHASES})
+        _tables.update({f"location:{phase}": _dispatch_table(LOCATION_HOOKS[phase], LocationType)
+                        for phase in LOCATION_PHASES})
+        _tables_key = key
+    return _tables
+
+
+@critter_hook("on_place", CritterType.GRIZZLY)
+def grizzly_place(engine, critter, location):
+    """Grizzly: give -1 mushrooms per day to the other critters there"""
+    for other in location.critters[:-1]:  # Exclude the just-added critter
+        engine._set_stat(other, 'current_mushrooms_per_day', max(0, other.current_mushrooms_per_day - 1))
+
+
+@critter_hook("on_place", CritterType.GOOSE)
+def goose_place(engine, critter, location):
+    """Goose: summon basic 1/2 copies until the location is full"""
+    while not location.is_full():
+        goose_copy = Critter(CritterType.GOOSE, 1, 2)
+        goose_copy.current_location_id = location.id
+        engine._place(location, goose_copy)
+
+        # Track the new critter
+        engine._append(engine.all_critters_ever, goose_copy)
+
+        # Each copy is "entering" the location
+        engine._apply_location_effects(goose_copy, location)
+        engine._apply_rhino_sheep_effects(goose_copy, location)
+
+
+@critter_hook("on_other_enter", CritterType.RHINO)
+def rhino_enter(engine, rhino, entering, location):
+    """Rhino: +1 mushrooms per day when another critter enters (a Penguin makes it +1 lifespan)"""
+    if entering.type == CritterType.PENGUIN:
+        engine._set_stat(rhino, 'current_lifespan', rhino.current_lifespan + 1)
+    else:
+        engine._set_stat(rhino, 'current_mushrooms_per_day', rhino.current_mushrooms_per_day + 1)
+
+
+@critter_hook("on_other_enter", CritterType.SHEEP)
+def sheep_enter(engine, sheep, entering, location):
+    """Sheep: +1 lifespan when another critter enters (a Penguin makes it +1 mushrooms per day)"""
+    if entering.type == CritterType.PENGUIN:
+        engine._set_stat(sheep, 'current_mushrooms_per_day', sheep.current_mushrooms_per_day + 1)
+    else:
+        engine._set_stat(sheep, 'current_lifespan', sheep.current_lifespan + 1)
+
+
+@critter_hook("can_collect", CritterType.CROCODILE)
+def crocodile_collects(engine, crocodile, location) -> bool:
+    """Crocodile: can only collect when alone"""
+    return len(location.critters) <= 1
+
+
+@critter_hook("on_night", CritterType.GOPHER)
+def gopher_night(engine, gopher, location):
+    """Gopher: move to the next location, skipping a full one, or back to the queue if both are full"""
+    current_loc_id = location.id
+    for target_id in ((current_loc_id + 1) % 3, (current_loc_id + 2) % 3):
+        target_location = engine.locations[target_id]
+        if not target_location.is_full():
+            engine._remove(location, gopher)
+            engine._set(gopher, 'current_location_id', target_id)
+            engine._place(target_location, gopher)
+            # Entering the new location triggers Rhino/Sheep and location effects
+            engine._apply_rhino_sheep_effects(gopher, target_location)
+            engine._apply_location_effects(gopher, target_location)
+            return
+
+    if len(engine.critter_queue) < 8:
+        engine._remove(location, gopher)
+        engine._set(gopher, 'current_location_id', None)
+        engine._queue_append(gopher)
+    # If no queue spot available, gopher stays put
+
+
+@location_hook("on_enter_location", LocationType.CANYON)
+def canyon_enter(engine, critter, location):
+    """Canyon: +1 mushrooms per day and +1 lifespan"""
+    engine._set_stat(critter, 'current_mushrooms_per_day', critter.current_mushrooms_per_day + 1)
+    engine._set_stat(critter, 'current_lifespan', critter.current_lifespan + 1)
+
+
+@location_hook("can_collect", LocationType.JUNGLE)
+def jungle_collects(engine, critter, location) -> bool:
+    """Jungle: only critters collecting 2+ mushrooms per day can collect"""
+    return critter.current_mushrooms_per_day >= 2
@@ -0,0 +1,37 @@
+"""
+Reproducible random streams for Spilled Mushrooms
+
+Engines, generators and simulations each take a seed or their own random.Random
+instead of sharing the global random module. Seeds for parallel work are derived
+from a root seed and the index of each task (not each worker), so results are the
+same whatever the number of worker processes.
+"""
+
+import hashlib
+import random
+from typing import List, Optional, Union
+
+Seed = Optional[Union[int, random.Random]]
+
+
+def make_rng(seed: Seed = None) -> random.Random:
+    """A random.Random for a seed, passing an existing instance through unchanged"""
+    if isinstance(seed, random.Random):
+        return seed
+    return random.Random(seed)
+
+
+def derive_seed(seed: int, *path: int) -> int:
+    """
+    Independent 64-bit seed for a node in a tree of streams rooted at `seed`
+
+    derive_seed(s, i) for i = 0, 1, ... gives unrelated seeds, and derive_seed(s, i, j)
+    splits stream i again. The result is stable across processes and Python versions.
+    """
+    key = ",".join(str(part) for part in (seed,) + path).encode()
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'little')
+
+
+def split_seed(seed: int, count: int) -> List[int]:
+    """`count` independent child seeds, one per task"""
+    return [derive_seed(seed, index) for index in range(count)]
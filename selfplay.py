@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Self-play datasets of (position, move, outcome) samples for training evaluators
+
+Games are played with a policy from policies.py ("optimal" plays the solver's moves)
+and every position before a move becomes one fixed-width record. Records are written
+in shards of games_per_shard games, each a single .npy file of RECORD_DTYPE records
+that readers can memory-map without loading.
+
+A manifest.json beside the shards records the run parameters and every finished
+shard. It is rewritten atomically as each shard lands, so an interrupted run picks
+up where it stopped, and asking an existing dataset for more games only plays the
+new shards. Game i uses the same seed as in simulate(), so the same run parameters
+give the same shards however many workers write them.
+"""
+
+import json
+import os
+import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterator, List, Optional
+import numpy as np
+from env import NUM_LOCATIONS, OBSERVATION_SIZE, observe
+from game_engine import GameEngine
+from policies import POLICIES, get_policy
+from seeding import derive_seed
+from simulate import _load_configs
+
+MANIFEST = "manifest.json"
+VERSION = 1
+
+RECORD_DTYPE = np.dtype([
+    ("observation", np.int16, (OBSERVATION_SIZE,)),  # env.observe() of the position
+    ("move", np.int8),  # critter choice * 3 + location, as in env.py
+    ("won", np.bool_),  # Whether the game this position came from was won
+    ("remaining", np.int16),  # Mushrooms left when that game ended
+    ("game", np.int64),  # Game index within the run
+])
+MAX_MOVES = 7  # One move a day
+
+
+def shard_name(index: int) -> str:
+    return f"shard-{index:05d}.npy"
+
+
+def play_records(engine: GameEngine, policy, rng: random.Random, game: int) -> np.ndarray:
+    """Play one game and return a record for every position a move was made from"""
+    records = np.zeros(MAX_MOVES, dtype=RECORD_DTYPE)
+    count = 0
+    while not engine.game_over and engine.get_valid_moves():
+        critter_idx, location_idx = policy(engine, rng)
+        records["observation"][count] = observe(engine)
+        records["move"][count] = critter_idx * NUM_LOCATIONS + location_idx
+        engine.process_turn(critter_idx, location_idx)
+        count += 1
+    records = records[:count]
+    records["won"] = engine.game_won
+    records["remaining"] = sum(loc.mushrooms for loc in engine.locations)
+    records["game"] = game
+    return records
+
+
+# Per-process state set up by _init_worker
+_configs = None
+_policy = None
+
+
+def _init_worker(configs, policy: str):
+    global _configs, _policy
+    _configs = configs
+    _policy = get_policy(policy)
+
+
+def _write_shard(directory: str, seed: int, index: int, start: int, stop: int) -> dict:
+    """Worker task: play games start..stop-1 and write them as shard `index`"""
+    games = [play_records(GameEngine(_configs[game % len(_configs)], seed=rng), _policy, rng, game)
+             for game, rng in ((game, random.Random(derive_seed(seed, game))) for game in range(start, stop))]
+    records = np.concatenate(games)
+
+    # Written under a temporary name so a crash never leaves a truncated shard behind
+    path = os.path.join(directory, shard_name(index))
+    with open(path + ".tmp", 'wb') as f:
+        np.save(f, records)
+    os.replace(path + ".tmp", path)
+    return {"index": index, "file": shard_name(index), "games": stop - start, "records": len(records),
+            "wins": int(sum(game["won"][0] for game in games if len(game)))}
+
+
+def _save_manifest(directory: str, manifest: dict):
+    path = os.path.join(directory, MANIFEST)
+    with open(path + ".tmp", 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+
+def build_dataset(directory: str, configs, games: int, policy: str = "random", seed: int = 0,
+                  games_per_shard: int = 10000, workers: Optional[int] = None) -> dict:
+    """
+    Play `games` games into shards under `directory`, resuming any earlier run there
+
+    Args:
+        directory: dataset directory (created if missing)
+        configs: GameConfig or config file path (str), or a list of them to cycle through
+        games: total games the dataset should hold
+        policy: policy name from policies.POLICIES
+        seed: run seed; game i uses random.Random(derive_seed(seed, i))
+        games_per_shard: games per shard (and per task); each worker holds one shard in memory
+        workers: number of processes (os.cpu_count() by default; 1 plays in this process)
+
+    Returns:
+        The manifest
+    """
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy '{policy}', expected one of {list(POLICIES)}")
+    configs = _load_configs(configs)
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(directory, exist_ok=True)
+
+    params = {"version": VERSION, "policy": policy, "seed": seed, "games_per_shard": games_per_shard,
+              "configs": [config.to_dict() for config in configs], "dtype": RECORD_DTYPE.descr}
+    params = json.loads(json.dumps(params))  # Tuples become lists, as read back from disk
+    path = os.path.join(directory, MANIFEST)
+    if os.path.exists(path):
+        with open(path) as f:
+            manifest = json.load(f)
+        changed = [key for key in params if manifest.get(key) != params[key]]
+        if changed:
+            raise ValueError(f"{directory} holds a dataset with different {', '.join(changed)}")
+    else:
+        manifest = dict(params, shards=[])
+
+    manifest["games"] = max(games, manifest.get("games", 0))
+    spans = [(index, index * games_per_shard, min((index + 1) * games_per_shard, manifest["games"]))
+             for index in range(-(-manifest["games"] // games_per_shard))]
+    # A shard is finished only if it is on disk and holds every game it should now (the
+    # last shard of a smaller run is rebuilt once the dataset grows past it)
+    expected = {index: stop - start for index, start, stop in spans}
+    finished = {shard["index"] for shard in manifest["shards"]
+                if os.path.exists(os.path.join(directory, shard["file"])) and
+                shard["games"] == expected.get(shard["index"])}
+    manifest["shards"] = [shard for shard in manifest["shards"] if shard["index"] in finished]
+    tasks = [span for span in spans if span[0] not in finished]
+
+    def record(shard):
+        manifest["shards"].append(shard)
+        manifest["shards"].sort(key=lambda entry: entry["index"])
+        _save_manifest(directory, manifest)
+
+    _save_manifest(directory, manifest)
+    if workers <= 1:
+        _init_worker(configs, policy)
+        for index, start, stop in tasks:
+            record(_write_shard(directory, seed, index, start, stop))
+        return manifest
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(configs, policy)) as pool:
+        pending = deque()
+        for index, start, stop in tasks:
+            pending.append(pool.submit(_write_shard, directory, seed, index, start, stop))
+            if len(pending) >= 2 * workers:
+                record(pending.popleft().result())
+        while pending:
+            record(pending.popleft().result())
+    return manifest
+
+
+class SelfPlayDataset:
+    """Read-only view of a dataset directory; shards are memory-mapped, never loaded"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, MANIFEST)) as f:
+            self.manifest = json.load(f)
+
+    def __len__(self) -> int:
+        return sum(shard["records"] for shard in self.manifest["shards"])
+
+    @property
+    def shard_count(self) -> int:
+        return len(self.manifest["shards"])
+
+    def shard(self, number: int) -> np.ndarray:
+        """Records of the number-th finished shard, memory-mapped"""
+        return np.load(os.path.join(self.directory, self.manifest["shards"][number]["file"]), mmap_mode='r')
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for number in range(self.shard_count):
+            yield self.shard(number)
+
+    def shards(self) -> List[np.ndarray]:
+        return list(self)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) < 2:
+        print("Usage: python3 selfplay.py <directory> [games] [policy] [config ...]")
+        sys.exit(1)
+    directory = sys.argv[1]
+    games = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+    policy = sys.argv[3] if len(sys.argv) > 3 else "random"
+    paths = sys.argv[4:] or ["configs/balanced.json", "configs/easy.json",
+                             "configs/high_damage.json", "configs/support.json"]
+    start = time.perf_counter()
+    manifest = build_dataset(directory, paths, games, policy, games_per_shard=1000)
+    dataset = SelfPlayDataset(directory)
+    print(f"{dataset.shard_count} shards, {len(dataset)} records in {time.perf_counter() - start:.2f}s")
@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+"""
+Headless batch simulation for Spilled Mushrooms
+
+Plays many games over a set of configs with a policy from policies.py, printing
+nothing per turn, and reports throughput, win rate and what each critter type
+collected. Game i plays configs[i % len(configs)] with its own random stream
+derived from the run seed, so any game can be replayed on its own and results do
+not depend on how games are split into chunks or across worker processes.
+
+monte_carlo() spreads the games over a process pool in chunks. Each chunk sends
+back one SimulationStats, never per-game results, so IPC stays a few hundred bytes
+per chunk. sequential_monte_carlo() plays each config in chunks only until its win
+rate interval is narrow enough, so configs that are plainly always lost or always
+won stop early and the budget goes to the uncertain ones.
+"""
+
+import math
+import os
+import random
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Union
+from config import ConfigManager, GameConfig
+from game_engine import GameEngine
+from models import CritterType
+from policies import Policy, get_policy
+from seeding import derive_seed
+from statistics import NormalDist
+
+
+@dataclass
+class RunningMean:
+    """Welford mean and variance accumulator that can also absorb other accumulators"""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # Sum of squared differences from the mean
+
+    def add(self, value: float, count: int = 1):
+        """Add `count` copies of value"""
+        self.merge(RunningMean(count, float(value), 0.0))
+
+    def merge(self, other: 'RunningMean') -> 'RunningMean':
+        """Combine with another accumulator (Chan et al.'s pairwise update)"""
+        if other.count:
+            total = self.count + other.count
+            delta = other.mean - self.mean
+            self.mean += delta * other.count / total
+            self.m2 += other.m2 + delta * delta * self.count * other.count / total
+            self.count = total
+        return self
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    def interval(self, z: float) -> Tuple[float, float]:
+        """Normal-approximation confidence interval for the mean"""
+        half = z * math.sqrt(self.variance / self.count) if self.count else math.inf
+        return self.mean - half, self.mean + half
+
+
+def wilson_interval(successes: int, trials: int, z: float) -> Tuple[float, float]:
+    """Wilson score interval for a rate; unlike the normal one it does not collapse at 0% or 100%"""
+    if not trials:
+        return 0.0, 1.0
+    rate = successes / trials
+    scale = 1 + z * z / trials
+    center = (rate + z * z / (2 * trials)) / scale
+    half = z * math.sqrt(rate * (1 - rate) / trials + z * z / (4 * trials * trials)) / scale
+    return max(0.0, center - half), min(1.0, center + half)
+
+
+@dataclass
+class SimulationStats:
+    """Aggregate results of a batch of games"""
+    games: int = 0
+    wins: int = 0
+    turns: int = 0
+    remaining_histogram: Dict[int, int] = field(default_factory=dict)  # Mushrooms left -> games
+    critter_counts: Dict[str, int] = field(default_factory=dict)  # Critters of each type that took part
+    critter_collected: Dict[str, int] = field(default_factory=dict)  # Mushrooms collected by each type
+    elapsed: float = 0.0
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins / self.games if self.games else 0.0
+
+    @property
+    def mushrooms_remaining(self) -> int:
+        """Mushrooms left summed over all games"""
+        return sum(left * games for left, games in self.remaining_histogram.items())
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    def record(self, engine: GameEngine):
+        """Add one finished game"""
+        self.games += 1
+        self.wins += engine.game_won
+        self.turns += engine.day - 1
+        left = sum(loc.mushrooms for loc in engine.locations)
+        self.remaining_histogram[left] = self.remaining_histogram.get(left, 0) + 1
+        counts = self.critter_counts
+        collected = self.critter_collected
+        for critter in engine.all_critters_ever:
+            name = critter.type.value
+            counts[name] = counts.get(name, 0) + 1
+            collected[name] = collected.get(name, 0) + critter.mushrooms_collected
+
+    def merge(self, other: 'SimulationStats') -> 'SimulationStats':
+        """Add another batch's results into this one"""
+        self.games += other.games
+        self.wins += other.wins
+        self.turns += other.turns
+        for left, games in other.remaining_histogram.items():
+            self.remaining_histogram[left] = self.remaining_histogram.get(left, 0) + games
+        for name, count in other.critter_counts.items():
+            self.critter_counts[name] = self.critter_counts.get(name, 0) + count
+        for name, count in other.critter_collected.items():
+            self.critter_collected[name] = self.critter_collected.get(name, 0) + count
+        self.elapsed += other.elapsed
+        return self
+
+    def __str__(self):
+        lines = [f"{self.games} games in {self.elapsed:.2f}s ({self.games_per_second:.0f} games/s), "
+                 f"win rate {self.win_rate:.2%}, "
+                 f"{self.mushrooms_remaining / max(self.games, 1):.2f} mushrooms left per game"]
+        for critter_type in CritterType:
+            name = critter_type.value
+            if self.critter_counts.get(name):
+                count = self.critter_counts[name]
+                lines.append(f"  {name.title():<10} {count:>8} played, "
+                             f"{self.critter_collected[name] / count:.2f} collected each")
+        return "\n".join(lines)
+
+
+def play_game(engine: GameEngine, policy: Policy, rng: random.Random) -> GameEngine:
+    """Play the engine's game to the end with the policy and return it"""
+    while not engine.game_over:
+        if not engine.get_valid_moves():
+            break
+        engine.process_turn(*policy(engine, rng))
+    return engine
+
+
+def _load_configs(configs) -> List[GameConfig]:
+    if isinstance(configs, (str, GameConfig)):
+        configs = [configs]
+    loaded = [ConfigManager.load_config(config) if isinstance(config, str) else config for config in configs]
+    if not loaded:
+        raise ValueError("No configs to simulate")
+    return loaded
+
+
+def _play_range(configs: List[GameConfig], policy: Policy, seed: int, start: int, stop: int,
+                specialize: bool = False) -> SimulationStats:
+    """Play games start..stop-1 of a run"""
+    stats = SimulationStats()
+    began = time.perf_counter()
+    for index in range(start, stop):
+        rng = random.Random(derive_seed(seed, index))
+        engine = GameEngine(configs[index % len(configs)], seed=rng)
+        if specialize:
+            engine.specialize()
+        stats.record(play_game(engine, policy, rng))
+    stats.elapsed = time.perf_counter() - began
+    return stats
+
+
+def simulate(configs: Union[str, GameConfig, Sequence[Union[str, GameConfig]]], games: int = 1000,
+             policy="random", seed: int = None, specialize: bool = False) -> SimulationStats:
+    """
+    Play `games` games in this process and aggregate the results
+
+    Args:
+        configs: GameConfig or config file path (str), or a list of them to cycle through
+        games: number of games to play
+        policy: policy name from policies.POLICIES, or a policy callable
+        seed: run seed; game i uses random.Random(derive_seed(seed, i)) (random if None)
+        specialize: play with GameEngine.specialize() turns (same results, faster)
+    """
+    if seed is None:
+        seed = random.getrandbits(64)
+    return _play_range(_load_configs(configs), get_policy(policy), seed, 0, games, specialize)
+
+
+# Per-process state set up by _init_worker
+_configs = None
+_policy = None
+_specialize = False
+
+
+def _init_worker(configs: List[GameConfig], policy, specialize: bool = False):
+    """Receive the configs and policy once per worker instead of once per chunk"""
+    global _configs, _policy, _specialize
+    _configs = configs
+    _policy = get_policy(policy)
+    _specialize = specialize
+
+
+def _run_chunk(seed: int, start: int, stop: int) -> SimulationStats:
+    return _play_range(_configs, _policy, seed, start, stop, _specialize)
+
+
+def _chunks(games: int, chunk_size: int) -> Iterator[Tuple[int, int]]:
+    for start in range(0, games, chunk_size):
+        yield start, min(start + chunk_size, games)
+
+
+def iter_monte_carlo(config, policy="random", n: int = 100000, workers: Optional[int] = None,
+                     seed: int = None, chunk_size: int = 2000,
+                     specialize: bool = False) -> Iterator[SimulationStats]:
+    """
+    Stream one SimulationStats per chunk of games as chunks finish, in game order
+
+    Arguments are as for monte_carlo(). Merging every chunk gives monte_carlo()'s result.
+    """
+    configs = _load_configs(config)
+    workers = workers or os.cpu_count() or 1
+    if seed is None:
+        seed = random.getrandbits(64)
+    if workers <= 1:
+        policy = get_policy(policy)
+        for start, stop in _chunks(n, chunk_size):
+            yield _play_range(configs, policy, seed, start, stop, specialize)
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(configs, policy, specialize)) as pool:
+        pending = deque()
+        for start, stop in _chunks(n, chunk_size):
+            pending.append(pool.submit(_run_chunk, seed, start, stop))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def monte_carlo(config, policy="random", n: int = 100000, workers: Optional[int] = None,
+                seed: int = None, chunk_size: int = 2000, specialize: bool = False) -> SimulationStats:
+    """
+    Estimate a puzzle's outcomes under a policy by playing n games across a process pool
+
+    Args:
+        config: GameConfig or config file path (str), or a list of them to cycle through
+        policy: policy name from policies.POLICIES, or a module-level policy function
+                (it is pickled to the workers)
+        n: number of games
+        workers: number of processes (os.cpu_count() by default; 1 plays in this process)
+        seed: run seed; the result is the same for any workers and chunk_size (random if None)
+        chunk_size: games per task; each task returns a single aggregate
+        specialize: play with GameEngine.specialize() turns (same results, faster)
+    """
+    stats = SimulationStats()
+    start = time.perf_counter()
+    for chunk in iter_monte_carlo(config, policy, n, workers, seed, chunk_size, specialize):
+        stats.merge(chunk)
+    stats.elapsed = time.perf_counter() - start
+    return stats
+
+
+@dataclass
+class Estimate:
+    """Running win-rate and mushrooms-left estimate for one config"""
+    config: GameConfig
+    z: float
+    wins: RunningMean = field(default_factory=RunningMean)  # Mean of 1 per win, 0 per loss
+    remaining: RunningMean = field(default_factory=RunningMean)  # Mushrooms left per game
+    stats: SimulationStats = field(default_factory=SimulationStats)
+    converged: bool = False  # Stopped because the interval was narrow enough, not the budget
+
+    @property
+    def games(self) -> int:
+        return self.stats.games
+
+    @property
+    def win_rate(self) -> float:
+        return self.wins.mean
+
+    @property
+    def interval(self) -> Tuple[float, float]:
+        return wilson_interval(self.stats.wins, self.stats.games, self.z)
+
+    @property
+    def width(self) -> float:
+        low, high = self.interval
+        return high - low
+
+    def add(self, chunk: SimulationStats):
+        self.stats.merge(chunk)
+        self.wins.merge(RunningMean(chunk.games, chunk.win_rate, chunk.wins * (1 - chunk.win_rate)))
+        for left, games in chunk.remaining_histogram.items():
+            self.remaining.add(left, games)
+
+    def __str__(self):
+        low, high = self.interval
+        return (f"{self.games} games, win rate {self.win_rate:.2%} [{low:.2%}, {high:.2%}], "
+                f"{self.remaining.mean:.2f} mushrooms left"
+                f"{'' if self.converged else ' (budget spent)'}")
+
+
+def _run_config_chunk(index: int, seed: int, start: int, stop: int) -> SimulationStats:
+    return _play_range([_configs[index]], _policy, seed, start, stop, _specialize)
+
+
+def sequential_monte_carlo(configs, policy="random", width: float = 0.05, confidence: float = 0.95,
+                           chunk_size: int = 200, min_games: int = 200, max_games: int = 100000,
+                           workers: Optional[int] = None, seed: int = None,
+                           specialize: bool = False) -> List[Estimate]:
+    """
+    Estimate each config's win rate, playing it only until the estimate is tight enough
+
+    Every config is played in chunks, the least-played config first. A config stops once
+    it has played min_games and its Wilson interval at `confidence` is at most `width`
+    wide, or once it has played max_games. Chunks are applied to a config in game order
+    and chunks scheduled past its stopping point are dropped, so the result is the same
+    for any number of workers.
+
+    Args:
+        configs: GameConfig or config file path (str), or a list of them
+        policy: policy name from policies.POLICIES, or a module-level policy function
+        width: target width of the win-rate interval
+        confidence: confidence level of the interval
+        chunk_size: games per task
+        min_games: games every config plays before it may stop
+        max_games: most games any config plays
+        workers: number of processes (os.cpu_count() by default; 1 plays in this process)
+        seed: run seed; config k plays games seeded from derive_seed(seed, k) (random if None)
+        specialize: play with GameEngine.specialize() turns (same results, faster)
+
+    Returns:
+        One Estimate per config, in order; Estimate.games is the samples it used
+    """
+    configs = _load_configs(configs)
+    workers = workers or os.cpu_count() or 1
+    if seed is None:
+        seed = random.getrandbits(64)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    estimates = [Estimate(config, z) for config in configs]
+    config_seeds = [derive_seed(seed, index) for index in range(len(configs))]
+    scheduled = [0] * len(configs)  # Games handed out per config
+    finished = [False] * len(configs)
+    arrived = [{} for _ in configs]  # Chunks waiting for earlier chunks of the same config
+
+    def next_task():
+        open_configs = [index for index in range(len(configs))
+                        if not finished[index] and scheduled[index] < max_games]
+        if not open_configs:
+            return None
+        index = min(open_configs, key=lambda k: scheduled[k])
+        start = scheduled[index]
+        scheduled[index] = min(start + chunk_size, max_games)
+        return index, config_seeds[index], start, scheduled[index]
+
+    def receive(index, start, chunk):
+        arrived[index][start] = chunk
+        estimate = estimates[index]
+        while not finished[index] and estimate.games in arrived[index]:
+            estimate.add(arrived[index].pop(estimate.games))
+            if estimate.games >= min_games and estimate.width <= width:
+                finished[index] = estimate.converged = True
+            elif estimate.games >= max_games:
+                finished[index] = True
+
+    if workers <= 1:
+        policy = get_policy(policy)
+        task = next_task()
+        while task is not None:
+            index, config_seed, start, stop = task
+            receive(index, start, _play_range([configs[index]], policy, config_seed, start, stop, specialize))
+            task = next_task()
+        return estimates
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(configs, policy, specialize)) as pool:
+        running = {}
+
+        def fill():
+            while len(running) < 2 * workers:
+                task = next_task()
+                if task is None:
+                    break
+                running[pool.submit(_run_config_chunk, *task)] = task
+
+        fill()
+        while running:
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, _, start, _ = running.pop(future)
+                receive(index, start, future.result())
+            fill()
+    return estimates
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1 and not sys.argv[1].isdigit():
+        print("Usage: python3 simulate.py [games] [policy] [config ...]")
+        sys.exit(1)
+    games = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    policies = [sys.argv[2]] if len(sys.argv) > 2 else ["first", "random", "greedy"]
+    paths = sys.argv[3:] or ["configs/balanced.json", "configs/easy.json",
+                             "configs/high_damage.json", "configs/support.json"]
+    for name in policies:
+        print(f"{name}: {simulate(paths, games, name, seed=0)}")
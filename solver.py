@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Exhaustive puzzle solver for Spilled Mushrooms
+
+Searches every move sequence offered by GameEngine.get_valid_moves() over the
+seven days and either returns a winning line or proves that none exists. Branches
+that cannot beat the best result so far are cut using an optimistic bound on the
+mushrooms still collectable.
+"""
+
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+from game_engine import GameEngine
+from models import CritterType, LocationType
+from transposition import TranspositionTable
+
+
+@dataclass
+class SolveResult:
+    """Outcome of an exhaustive search"""
+    solvable: bool
+    moves: List[Tuple[int, int]] = field(default_factory=list)  # Winning line, or best line found
+    remaining: int = 0  # Mushrooms left at the end of `moves` (0 when solvable)
+    nodes: int = 0  # Number of positions expanded
+    pruned: int = 0  # Number of positions cut by the collection bound
+    exact: bool = True  # False if an unsolvable search stopped once a win was ruled out
+
+    def __str__(self):
+        counts = f"({self.nodes} nodes searched, {self.pruned} pruned)"
+        if self.solvable:
+            return f"Solvable in {len(self.moves)} moves {counts}"
+        if not self.exact:
+            return f"Unsolvable - at least {self.remaining} mushrooms always remain {counts}"
+        return f"Unsolvable - best line leaves {self.remaining} mushrooms {counts}"
+
+
+def _critter_key(critter) -> tuple:
+    return (critter.type, critter.current_mushrooms_per_day, critter.current_lifespan)
+
+
+def _distinct_moves(engine: GameEngine) -> List[Tuple[int, int]]:
+    """
+    Valid moves with obviously equivalent ones removed
+
+    A critter sent to an emptied location is cleared away the same night wherever it
+    went, and two identical critters at the front of the queue are interchangeable.
+    """
+    queue = engine.critter_queue
+    same_pair = (len(queue) >= 2 and
+                 _critter_key(queue[0]) == _critter_key(queue[1]))
+    moves = []
+    for critter_idx in range(1 if same_pair else min(2, len(queue))):
+        sent_to_empty = False
+        for location_idx, location in enumerate(engine.locations):
+            if location.is_full():
+                continue
+            if location.mushrooms <= 0:
+                if sent_to_empty:
+                    continue
+                sent_to_empty = True
+            moves.append((critter_idx, location_idx))
+    return moves
+
+
+def collection_bound(engine: GameEngine) -> int:
+    """
+    Optimistic upper bound on the mushrooms that can still be collected
+
+    Every critter is credited with the most it could gather on each remaining day:
+    its current mushrooms per day plus every buff it could still receive (Canyon
+    entries, Rhino and Sheep buffs from the most entries possible), for as many days
+    as its lifespan allows (all of them at the Beach). Jungle only counts days on
+    which the rate reaches 2, and a Crocodile stuck with a companion that outlives it
+    counts nothing. At most one queued critter is played per day.
+    """
+    days = 8 - engine.day
+    if engine.game_over or days <= 0:
+        return 0
+
+    locations = engine.locations
+    queue = engine.critter_queue
+    has_beach = any(loc.type == LocationType.BEACH for loc in locations)
+    has_canyon = any(loc.type == LocationType.CANYON for loc in locations)
+    canyon_bonus = 1 if has_canyon else 0
+    max_capacity = max(loc.max_critters for loc in locations)
+    board_gophers = [c for loc in locations for c in loc.critters if c.type == CritterType.GOPHER]
+    gophers = len(board_gophers) + sum(1 for c in queue if c.type == CritterType.GOPHER)
+    penguins = sum(1 for c in queue if c.type == CritterType.PENGUIN)
+    geese = sum(1 for c in queue if c.type == CritterType.GOOSE)
+
+    # Most critters that can enter one location per day, and in total
+    entries_per_day = 1 + (max_capacity - 1 if geese else 0) + gophers
+    total_entries = days + (max_capacity - 1) * min(geese, days) + gophers * days
+
+    def gain(critter_type, day):
+        """Most mushrooms per day a critter can have gained by collection on `day`"""
+        if critter_type == CritterType.RHINO:
+            return min(entries_per_day * (day + 1), total_entries)
+        if critter_type == CritterType.SHEEP:
+            return min(day + 1, penguins)
+        if critter_type == CritterType.GOPHER:
+            return day * canyon_bonus
+        return 0
+
+    def extra_lifespan(critter_type):
+        if critter_type == CritterType.SHEEP:
+            return total_entries
+        if critter_type == CritterType.RHINO:
+            return penguins
+        if critter_type == CritterType.GOPHER:
+            return days * canyon_bonus
+        return 0
+
+    running_totals = {}
+
+    def potential(critter_type, mushrooms, alive, first_day):
+        """(mushrooms anywhere, mushrooms at a Jungle) collectable from first_day on"""
+        key = (critter_type, mushrooms)
+        totals = running_totals.get(key)
+        if totals is None:
+            anywhere, jungle = [0], [0]
+            for day in range(days):
+                rate = mushrooms + gain(critter_type, day)
+                anywhere.append(anywhere[-1] + rate)
+                jungle.append(jungle[-1] + (rate if rate >= 2 else 0))
+            totals = running_totals[key] = (anywhere, jungle)
+        last = min(days, first_day + alive)
+        if last <= first_day:
+            return 0, 0
+        anywhere, jungle = totals
+        return anywhere[last] - anywhere[first_day], jungle[last] - jungle[first_day]
+
+    # Critters already placed (Gophers move, so they are counted with the queue)
+    board = []
+    for location in locations:
+        collectable = 0
+        for critter in location.critters:
+            if critter.type == CritterType.GOPHER:
+                continue
+            if location.type == LocationType.BEACH:
+                alive = days
+            else:
+                alive = critter.current_lifespan + extra_lifespan(critter.type)
+            if critter.type == CritterType.CROCODILE and any(
+                    other is not critter and other.type != CritterType.GOPHER and
+                    (location.type == LocationType.BEACH or other.current_lifespan >= alive)
+                    for other in location.critters):
+                continue  # Never alone while it lives
+            anywhere, jungle = potential(critter.type, critter.current_mushrooms_per_day, alive, 0)
+            collectable += jungle if location.type == LocationType.JUNGLE else anywhere
+        board.append(collectable)
+
+    floating_anywhere = floating_jungle = 0
+    for gopher in board_gophers:
+        alive = days if has_beach or has_canyon else gopher.current_lifespan
+        anywhere, jungle = potential(gopher.type, gopher.current_mushrooms_per_day, alive, 0)
+        floating_anywhere += anywhere
+        floating_jungle += jungle
+
+    # Queued critters: value of each if played on each remaining day
+    by_day = []
+    seen = {}
+    for critter in queue:
+        if has_beach:
+            alive = days
+        else:
+            alive = critter.current_lifespan + canyon_bonus + extra_lifespan(critter.type)
+        key = (critter.type, critter.current_mushrooms_per_day, alive)
+        if key in seen:
+            by_day.append(seen[key])  # Same stats as an earlier queued critter
+            continue
+        values = seen[key] = []
+        for first_day in range(days):
+            anywhere, _ = potential(critter.type, critter.current_mushrooms_per_day + canyon_bonus,
+                                    alive, first_day)
+            _, jungle = potential(critter.type, critter.current_mushrooms_per_day, alive, first_day)
+            if critter.type == CritterType.GOOSE:
+                copy_alive = days if has_beach else 2 + canyon_bonus
+                copies, _ = potential(CritterType.GOOSE, 1 + canyon_bonus, copy_alive, first_day)
+                anywhere += (max_capacity - 1) * copies
+            values.append((anywhere, jungle))
+        by_day.append(values)
+
+    for variant in (0, 1):
+        # Either the best `days` critters all played today, or the best critter each day
+        best_today = sorted((values[0][variant] for values in by_day), reverse=True)[:days]
+        best_each_day = sum(max((values[day][variant] for values in by_day), default=0)
+                            for day in range(days))
+        queued = min(sum(best_today), best_each_day)
+        if variant == 0:
+            floating_anywhere += queued
+        else:
+            floating_jungle += queued
+
+    total = sum(loc.mushrooms for loc in locations)
+    pooled = sum(min(loc.mushrooms, placed) for loc, placed in zip(locations, board)) + floating_anywhere
+    per_location = sum(
+        min(loc.mushrooms, placed + (floating_jungle if loc.type == LocationType.JUNGLE else floating_anywhere))
+        for loc, placed in zip(locations, board))
+    return min(total, pooled, per_location)
+
+
+class SearchCancelled(Exception):
+    """Raised inside a search once its stop_event has been set or its node budget is spent"""
+
+
+class Solver:
+    """Depth-first branch-and-bound search over all move sequences with a transposition table"""
+
+    def __init__(self, table: Optional[TranspositionTable] = None, use_bound: bool = True,
+                 stop_event=None, max_nodes: Optional[int] = None):
+        """
+        Args:
+            table: TranspositionTable (or SharedTranspositionTable) to read and fill
+            use_bound: prune with collection_bound()
+            stop_event: threading/multiprocessing Event polled while searching; once it is
+                        set the search raises SearchCancelled
+            max_nodes: raise SearchCancelled once this many positions have been expanded
+        """
+        self.nodes = 0
+        self.pruned = 0
+        self.table = table if table is not None else TranspositionTable()
+        self.use_bound = use_bound
+        self.stop_event = stop_event
+        self.max_nodes = max_nodes
+
+    def search(self, engine: GameEngine, cutoff: int) -> int:
+        """
+        Return the fewest mushrooms that can be left at the end from this position
+
+        The answer is exact when it is below cutoff. Otherwise the position cannot
+        do better than cutoff and the value returned is only a lower bound.
+        """
+        remaining = sum(loc.mushrooms for loc in engine.locations)
+        if engine.game_over:
+            return remaining
+
+        entry = self.table.probe(engine.position_hash)
+        if entry is not None and (entry.exact or entry.remaining >= cutoff):
+            return entry.remaining
+
+        depth = 8 - engine.day
+        if self.use_bound:
+            at_least = remaining - collection_bound(engine)
+            if at_least >= cutoff:
+                self.pruned += 1
+                self.table.store(engine.position_hash, at_least, None, depth, exact=False)
+                return at_least
+
+        self.nodes += 1
+        if self.stop_event is not None and not self.nodes % 256 and self.stop_event.is_set():
+            raise SearchCancelled()
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise SearchCancelled()
+        best_remaining = None
+        best_move = None
+        for move in _distinct_moves(engine):
+            engine.push_move(*move)
+            child_remaining = self.search(engine, cutoff if best_remaining is None else min(cutoff, best_remaining))
+            engine.pop_move()
+            if best_remaining is None or child_remaining < best_remaining:
+                best_remaining, best_move = child_remaining, move
+                if child_remaining == 0:
+                    break  # A win cannot be improved on
+
+        if best_move is None:
+            best_remaining = remaining  # No moves left: the game ends as it stands
+        exact = best_move is None or best_remaining < cutoff
+        self.table.store(engine.position_hash, best_remaining, best_move, depth, exact)
+        return best_remaining
+
+    def principal_line(self, engine: GameEngine, remaining: int) -> List[Tuple[int, int]]:
+        """Follow the stored best moves from this position, searching again where evicted"""
+        line = []
+        while not engine.game_over:
+            entry = self.table.probe(engine.position_hash)
+            if entry is None or not entry.exact:
+                self.search(engine, remaining + 1)
+                entry = self.table.probe(engine.position_hash)
+            move = entry.best_move if entry is not None and entry.exact else None
+            if move is None:
+                # The table would not keep this position (a deeper entry holds its slot)
+                move = self._best_move(engine, remaining)
+                if move is None:
+                    break  # No moves left: the game ends as it stands
+            engine.push_move(*move)
+            line.append(move)
+        for _ in line:
+            engine.pop_move()
+        return line
+
+    def _best_move(self, engine: GameEngine, remaining: int) -> Optional[Tuple[int, int]]:
+        """A move whose position still leaves `remaining` mushrooms, found by searching each one"""
+        for move in _distinct_moves(engine):
+            engine.push_move(*move)
+            child_remaining = self.search(engine, remaining + 1)
+            engine.pop_move()
+            if child_remaining == remaining:
+                return move
+        return None
+
+
+def solve(config=None, table: Optional[TranspositionTable] = None, minimize: bool = False) -> SolveResult:
+    """
+    Decide whether a puzzle can be won
+
+    Args:
+        config: GameConfig object, config file path (str), or GameEngine position to solve from
+        table: TranspositionTable to reuse across searches (a fresh one by default)
+        minimize: for unsolvable puzzles, keep searching for the line that leaves the fewest
+                  mushrooms instead of stopping once a win is ruled out
+    """
+    engine = config.clone() if isinstance(config, GameEngine) else GameEngine(config)
+    solver = Solver(table)
+    cutoff = sum(loc.mushrooms for loc in engine.locations) + 1 if minimize else 1
+    remaining = solver.search(engine, cutoff)
+    exact = remaining < cutoff
+    moves = solver.principal_line(engine, remaining) if exact else []
+    return SolveResult(remaining == 0, moves, remaining, solver.nodes, solver.pruned, exact)
+
+
+def iter_solutions(config=None, table: Optional[TranspositionTable] = None) -> Iterator[List[Tuple[int, int]]]:
+    """
+    Yield every winning line, one at a time, in get_valid_moves() order
+
+    Lines are distinct move sequences, so two moves that happen to reach the same
+    position are both followed. Only the current line is held in memory; subtrees are
+    entered only once a search (memoized in `table`) has shown they contain a win.
+    """
+    engine = config.clone() if isinstance(config, GameEngine) else GameEngine(config)
+    solver = Solver(table)
+    line = []
+
+    def walk():
+        if engine.game_won:
+            yield list(line)
+            return
+        if engine.game_over or solver.search(engine, 1) > 0:
+            return
+        for move in engine.get_valid_moves():
+            engine.push_move(*move)
+            line.append(move)
+            yield from walk()
+            line.pop()
+            engine.pop_move()
+
+    return walk()
+
+
+def count_solutions(config=None) -> int:
+    """
+    Number of distinct winning lines (the lines iter_solutions() yields)
+
+    Counts are memoized by position hash, so every position reached by several move
+    orders is counted once and the total is a sum over transposed states rather than
+    a walk over every line. Positions the collection bound rules out count zero.
+    """
+    engine = config.clone() if isinstance(config, GameEngine) else GameEngine(config)
+    counts = {}
+
+    def count() -> int:
+        if engine.game_over:
+            return 1 if engine.game_won else 0
+        key = engine.position_hash
+        if key in counts:
+            return counts[key]
+        total = 0
+        if collection_bound(engine) >= sum(loc.mushrooms for loc in engine.locations):
+            for move in engine.get_valid_moves():
+                engine.push_move(*move)
+                total += count()
+                engine.pop_move()
+        counts[key] = total
+        return total
+
+    return count()
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    paths = sys.argv[1:] or ["configs/balanced.json", "configs/easy.json",
+                             "configs/high_damage.json", "configs/support.json"]
+    for path in paths:
+        table = TranspositionTable()
+        start = time.perf_counter()
+        result = solve(path, table)
+        elapsed = time.perf_counter() - start
+        print(f"{path}: {result} in {elapsed:.3f}s")
+        print(f"  Table: {table}")
+        if result.moves:
+            print(f"  Line: {result.moves}")
+            print(f"  Winning lines: {count_solutions(path)}")
@@ -0,0 +1,232 @@
+"""
+Config-specialized turn processing for Spilled Mushrooms
+
+GameEngine.process_turn has to handle every critter and location type on every turn.
+Within one game most of that is dead weight: the board's location types and
+capacities never change, and the only critters that can ever be on it are those of
+the types in the lineup (a Goose only summons Geese, a Gopher only walks back into
+the queue). specialized_class() generates the source of a process_turn for one such
+shape, compiles it once, and returns a GameEngine subclass that uses it:
+
+- rule phases with no hook for any type in the game are left out entirely, and the
+  location hooks and the Beach test are resolved per location when the code is built
+- the per-location steps are unrolled over the board's locations
+- Zobrist keys, undo records and the queue hash are updated inline instead of through
+  the _set/_set_stat/_place/_queue_* helpers (popping and re-appending the queue mixes
+  the queue hash once instead of three times)
+
+The generated turn makes the same changes in the same order as the generic one, so
+positions, position_hash, collection totals and push_move/pop_move all match it
+exactly; tests/test_specialize.py plays both side by side to check that. Rules still
+come from the engine's hook tables, so a live phase calls the same functions.
+It assumes what every engine path maintains: each placed critter's current_location_id
+names the location holding it, and hooks only bring in critters of types already in
+the game. With verify_hash on, the hash is checked after each group of phases.
+"""
+
+from typing import Dict, List, Tuple
+from game_engine import (GameEngine, MASK64, _BOARD_KEY, _DAY_KEY, _MUSHROOM_KEY, _QUEUE_KEY,
+                         _QUEUE_MULTIPLIER, _QUEUE_MULTIPLIER_INVERSE, _QUEUE_WEIGHTS,
+                         _mix64, _zobrist, _zobrist_keys)
+from models import LocationType
+
+_classes: Dict[tuple, type] = {}
+
+
+def specialization_key(engine: GameEngine) -> tuple:
+    """What the generated code depends on: the board's shape and which rule phases are live"""
+    codes = engine._type_codes()
+
+    def live(table):
+        return table is not None and any(table[code] is not None for code in codes)
+
+    locations = tuple((location.type.code, location.max_critters,
+                       location.type == LocationType.BEACH,
+                       engine._on_enter_location is not None
+                       and engine._on_enter_location[location.type.code] is not None,
+                       engine._location_can_collect is not None
+                       and engine._location_can_collect[location.type.code] is not None)
+                      for location in engine.locations)
+    return (type(engine), locations, live(engine._on_place), live(engine._on_other_enter),
+            live(engine._critter_can_collect), live(engine._on_night))
+
+
+def specialized_class(engine: GameEngine) -> type:
+    """GameEngine subclass whose process_turn is generated for this engine's game (cached)"""
+    key = specialization_key(engine)
+    cls = _classes.get(key)
+    if cls is None:
+        base = key[0]
+        namespace = {"setattr": setattr, "MASK64": MASK64,
+                     "INVERSE": _QUEUE_MULTIPLIER_INVERSE, "MULTIPLIER": _QUEUE_MULTIPLIER,
+                     "WEIGHTS": _QUEUE_WEIGHTS, "mix": _mix64, "zobrist": _zobrist,
+                     "key": _zobrist_keys.get}
+        source = generate_source(key)
+        exec(compile(source, f"<specialized process_turn {len(_classes)}>", "exec"), namespace)
+        cls = _classes[key] = type(f"Specialized{base.__name__}", (base,), {
+            "process_turn": namespace["process_turn"],
+            "specialization": key,
+            "__module__": base.__module__,
+        })
+    return cls
+
+
+def generate_source(key: tuple) -> str:
+    """Python source of process_turn for a specialization_key()"""
+    _, locations, on_place, on_other_enter, critter_can_collect, on_night = key
+    count = len(locations)
+    names = [f"loc{index}" for index in range(count)]
+    lines: List[Tuple[int, str]] = []
+
+    def emit(indent: int, *code: str):
+        lines.extend((indent, line) for line in code)
+
+    def zobrist_key(features: str) -> str:
+        # Inline _zobrist(): the dict lookup, and the call only for a key not seen yet
+        return f"(key(({features})) or zobrist({features}))"
+
+    def log(indent: int, record: str):
+        emit(indent, "if log is not None:", f"    log.append({record})")
+
+    def check_hash(phase: str):
+        emit(1, "if self.verify_hash:", f"    self._check_hash('{phase}')")
+
+    emit(0, "def process_turn(self, critter_choice, location_choice):",
+         '    """Process a complete turn with the given choices (generated for one game)"""')
+    emit(1, "queue = self.critter_queue",
+         "locations = self.locations",
+         f"{', '.join(names)}, = locations",
+         "if type(critter_choice) is not int or type(location_choice) is not int:",
+         "    critter_choice, location_choice = self._move_indexes(critter_choice, location_choice)",
+         "if not (0 <= critter_choice < min(2, len(queue)) and",
+         f"        0 <= location_choice < {count} and",
+         f"        len(locations[location_choice].critters) < {tuple(capacity for _, capacity, *_ in locations)}"
+         "[location_choice]):",
+         '    raise ValueError("Invalid move")',
+         "log = self._undo_log",
+         "chosen = queue[critter_choice]")
+
+    # Queue rotation: take out the chosen critter and send the unchosen one to the back
+    emit(1, "queue_hash = self._queue_hash",
+         "first = queue.popleft()")
+    log(1, "(queue.appendleft, (first,))")
+    emit(1, f"queue_hash = ((queue_hash - {zobrist_key(f'{_QUEUE_KEY}, first.type.code, first.current_mushrooms_per_day, first.current_lifespan')}) * INVERSE) & MASK64",
+         "if queue:",
+         "    second = queue.popleft()")
+    log(2, "(queue.appendleft, (second,))")
+    emit(2, f"queue_hash = ((queue_hash - {zobrist_key(f'{_QUEUE_KEY}, second.type.code, second.current_mushrooms_per_day, second.current_lifespan')}) * INVERSE) & MASK64",
+         "unchosen = second if critter_choice == 0 else first",
+         "length = len(queue)",
+         f"weight = WEIGHTS[length] if length < {len(_QUEUE_WEIGHTS)} else pow(MULTIPLIER, length, 1 << 64)",
+         f"queue_hash = (queue_hash + {zobrist_key(f'{_QUEUE_KEY}, unchosen.type.code, unchosen.current_mushrooms_per_day, unchosen.current_lifespan')} * weight) & MASK64")
+    log(2, "(queue.pop, ())")
+    emit(2, "queue.append(unchosen)")
+    emit(1, "self.position_hash ^= mix(self._queue_hash) ^ mix(queue_hash)",
+         "self._queue_hash = queue_hash")
+
+    # Placement, placement effects and location effects, one branch per location
+    for index, (type_code, _, _, enter_hook, _) in enumerate(locations):
+        name = names[index]
+        emit(1, f"{'if' if index == 0 else 'elif'} location_choice == {index}:")
+        emit(2, f"critters = {name}.critters")
+        log(2, "(setattr, (chosen, 'current_location_id', chosen.current_location_id))")
+        emit(2, f"chosen.current_location_id = {index}",
+             f"self.position_hash ^= {zobrist_key(f'{_BOARD_KEY}, {index}, len(critters), chosen.type.code, chosen.current_mushrooms_per_day, chosen.current_lifespan')}")
+        log(2, "(critters.pop, ())")
+        emit(2, "critters.append(chosen)")
+        if on_place:
+            emit(2, "hook = self._on_place[chosen.type.code]",
+                 "if hook is not None:",
+                 f"    hook(self, chosen, {name})")
+        if on_other_enter:
+            emit(2, "if len(critters) > 1:",
+                 f"    self._apply_rhino_sheep_effects(chosen, {name})")
+        if enter_hook:
+            emit(2, f"self._on_enter_location[{type_code}](self, chosen, {name})")
+    check_hash("placement")
+
+    # Collection
+    if critter_can_collect:
+        emit(1, "critter_checks = self._critter_can_collect")
+    for index, (type_code, _, _, _, collect_hook) in enumerate(locations):
+        name = names[index]
+        emit(1, f"critters = {name}.critters",
+             "if critters:",
+             f"    mushrooms = {name}.mushrooms",
+             "    daily_collection = 0")
+        if collect_hook:
+            emit(2, f"location_check = self._location_can_collect[{type_code}]")
+        emit(2, "for critter in critters:")
+        if critter_can_collect:
+            emit(3, "check = critter_checks[critter.type.code]",
+                 f"if check is not None and not check(self, critter, {name}):",
+                 "    continue")
+        if collect_hook:
+            emit(3, f"if not location_check(self, critter, {name}):",
+                 "    continue")
+        emit(3, "available = mushrooms - daily_collection",
+             "amount = critter.current_mushrooms_per_day",
+             "if amount > available:",
+             "    amount = available",
+             "if amount > 0:")
+        log(4, "(setattr, (critter, 'mushrooms_collected', critter.mushrooms_collected))")
+        emit(4, "critter.mushrooms_collected += amount",
+             "daily_collection += amount")
+        emit(2, "remaining = mushrooms - daily_collection",
+             "if remaining < 0:",
+             "    remaining = 0",
+             "if remaining != mushrooms:",
+             f"    self.position_hash ^= {zobrist_key(f'{_MUSHROOM_KEY}, {index}, mushrooms')} ^ "
+             f"{zobrist_key(f'{_MUSHROOM_KEY}, {index}, remaining')}")
+        log(3, f"(setattr, ({name}, 'mushrooms', mushrooms))")
+        emit(3, f"{name}.mushrooms = remaining")
+    check_hash("collection")
+
+    # Completed locations lose their critters
+    for name in names:
+        emit(1, f"if {name}.mushrooms <= 0 and {name}.critters:",
+             f"    self._replace_critters({name}, [])")
+
+    if on_night:
+        emit(1, "self._apply_end_of_day_effects()")
+    check_hash("end-of-day effects")
+
+    # Lifespans drop (except at a Beach) and critters at 0 leave
+    for index, (_, _, beach, _, _) in enumerate(locations):
+        name = names[index]
+        emit(1, f"critters = {name}.critters")
+        if beach:
+            emit(1, "for critter in critters:",
+                 "    if critter.current_lifespan <= 0:",
+                 f"        self._replace_critters({name}, [c for c in critters if c.current_lifespan > 0])",
+                 "        break")
+            continue
+        emit(1, "if critters:",
+             "    changed = 0",
+             "    dead = False",
+             "    for slot, critter in enumerate(critters):",
+             "        lifespan = critter.current_lifespan",
+             "        code = critter.type.code",
+             "        per_day = critter.current_mushrooms_per_day")
+        log(3, "(setattr, (critter, 'current_lifespan', lifespan))")
+        emit(3, "critter.current_lifespan = lifespan - 1",
+             f"changed ^= {zobrist_key(f'{_BOARD_KEY}, {index}, slot, code, per_day, lifespan')} ^ "
+             f"{zobrist_key(f'{_BOARD_KEY}, {index}, slot, code, per_day, lifespan - 1')}",
+             "if lifespan <= 1:",
+             "    dead = True")
+        emit(2, "self.position_hash ^= changed",
+             "if dead:",
+             f"    self._replace_critters({name}, [c for c in critters if c.current_lifespan > 0])")
+
+    emit(1, "day = self.day",
+         f"self.position_hash ^= {zobrist_key(f'{_DAY_KEY}, day')} ^ {zobrist_key(f'{_DAY_KEY}, day + 1')}")
+    log(1, "(setattr, (self, 'day', day))")
+    emit(1, "self.day = day + 1")
+    check_hash("advance day")
+
+    emit(1, f"if {' and '.join(f'{name}.mushrooms <= 0' for name in names)}:",
+         "    self._set(self, 'game_won', True)",
+         "    self._set(self, 'game_over', True)",
+         "elif day + 1 > 7:",
+         "    self._set(self, 'game_over', True)")
+    return "\n".join("    " * indent + line for indent, line in lines) + "\n"
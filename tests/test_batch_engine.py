@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Differential test of the vectorized BatchGameEngine against GameEngine
+"""
+
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from batch_engine import BatchGameEngine, simulate_batch
+from config import GameConfig
+from game_engine import GameEngine
+from models import CritterType, LocationType
+from simulate import simulate
+
+
+def random_configs(count, seed):
+    """Lineups of 3-10 critters over every type, including Gopher-heavy ones, on random boards"""
+    rng = random.Random(seed)
+    critter_names = [ct.value for ct in CritterType] + ["gopher", "goose"]
+    location_names = [lt.value for lt in LocationType]
+    return [GameConfig(critters=[rng.choice(critter_names) for _ in range(rng.randint(3, 10))],
+                       locations=[{"type": rng.choice(location_names), "mushrooms": rng.randint(1, 40)}
+                                  for _ in range(3)])
+            for _ in range(count)]
+
+
+def test_matches_game_engine():
+    """Every game should be in exactly GameEngine's position after every step"""
+    print("Testing BatchGameEngine against GameEngine...")
+
+    configs = random_configs(100, seed=1)
+    batch = BatchGameEngine(configs, 400)
+    engines = [GameEngine(configs[i % len(configs)]) for i in range(400)]
+    rng = np.random.default_rng(2)
+
+    mismatches = steps = 0
+    while not batch.finished.all():
+        active = ~batch.finished
+        critters, locations = batch.random_moves(rng)
+        for game in np.flatnonzero(active):
+            engines[game].process_turn(int(critters[game]), int(locations[game]))
+        batch.step(critters, locations, active)
+        steps += 1
+        for game, engine in enumerate(engines):
+            if (engine.to_state() != batch.to_state(game) or engine.game_over != batch.game_over[game]
+                    or engine.game_won != batch.game_won[game]):
+                mismatches += 1
+
+    for game, engine in enumerate(engines):
+        collected = [0] * len(CritterType)
+        for critter in engine.all_critters_ever:
+            collected[critter.type.code] += critter.mushrooms_collected
+        mismatches += collected != batch.type_collected[game].tolist()
+
+    ok = mismatches == 0 and steps >= 7
+    print(f"  {'✅' if ok else '❌'} 400 games over {steps} steps, {mismatches} mismatches")
+    assert ok
+
+
+def test_first_move_stats_match_simulate():
+    """The first-move policy is deterministic, so aggregates should match simulate() exactly"""
+    print(f"\n{'='*60}")
+    print("Testing simulate_batch against simulate...")
+
+    paths = ["configs/balanced.json", "configs/easy.json", "configs/high_damage.json", "configs/support.json"]
+    expected = simulate(paths, 40, "first", seed=0)
+    result = simulate_batch(paths, 40, "first", seed=0, batch_size=16)
+    fields = lambda stats: (stats.games, stats.wins, stats.turns, stats.remaining_histogram,
+                            stats.critter_counts, stats.critter_collected)
+    ok = fields(result) == fields(expected)
+    print(f"  {'✅' if ok else '❌'} {result.games} games, {result.mushrooms_remaining} mushrooms left")
+    assert ok
+
+
+def test_invalid_moves_rejected():
+    print(f"\n{'='*60}")
+    print("Testing move validation...")
+
+    batch = BatchGameEngine("configs/easy.json", 3)
+    try:
+        batch.step([0, 2, 0], [0, 0, 0])
+        ok = False
+    except ValueError:
+        ok = batch.day.tolist() == [1, 1, 1]
+    try:
+        BatchGameEngine(GameConfig(critters=["frog"], locations=[{"type": "beach", "mushrooms": 3}]), 1)
+        ok = False
+    except ValueError:
+        pass
+    print(f"  {'✅' if ok else '❌'} Invalid moves and boards without 3 locations raise ValueError")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_matches_game_engine()
+    test_first_move_stats_match_simulate()
+    test_invalid_moves_rejected()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test the optimistic collection bound used to prune the solver's search
+"""
+
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import GameConfig
+from game_engine import GameEngine
+from models import CritterType, LocationType
+from solver import Solver, collection_bound, solve
+
+
+def random_config(rng):
+    critters = [rng.choice(list(CritterType)).value for _ in range(6)]
+    locations = [{"type": rng.choice(list(LocationType)).value, "mushrooms": rng.randint(4, 20)}
+                 for _ in range(3)]
+    return GameConfig(critters=critters, locations=locations)
+
+
+def test_bound_never_underestimates():
+    """At every reachable position the bound should cover the best achievable collection"""
+    print("Testing collection bound against exhaustive search...")
+
+    rng = random.Random(5)
+    checked = 0
+    violations = 0
+
+    def best_remaining(engine, memo):
+        nonlocal checked, violations
+        remaining = sum(loc.mushrooms for loc in engine.locations)
+        if engine.game_over or not engine.get_valid_moves():
+            return remaining
+        key = engine.to_state()
+        if key not in memo:
+            best = remaining
+            for move in engine.get_valid_moves():
+                engine.push_move(*move)
+                best = min(best, best_remaining(engine, memo))
+                engine.pop_move()
+            memo[key] = best
+            checked += 1
+            if collection_bound(engine) < remaining - best:
+                violations += 1
+        return memo[key]
+
+    for _ in range(2):
+        config = random_config(rng)
+        best_remaining(GameEngine(config), {})
+
+    print(f"  {'✅' if violations == 0 else '❌'} {violations} violations over {checked} positions")
+    assert violations == 0
+
+
+def test_pruned_search_matches_full_search():
+    """Pruning should change how much is searched, never the answer"""
+    print(f"\n{'='*60}")
+    print("Testing pruned vs unpruned search...")
+
+    rng = random.Random(8)
+    configs = ["configs/easy.json", "configs/support.json", "configs/test_custom.json"]
+    configs += [random_config(rng) for _ in range(2)]
+
+    for config in configs:
+        engine = GameEngine(config)
+        cutoff = sum(loc.mushrooms for loc in engine.locations) + 1
+        full = Solver(use_bound=False)
+        expected = full.search(engine, cutoff)
+
+        result = solve(engine, minimize=True)
+        name = config if isinstance(config, str) else "random"
+        ok = result.remaining == expected and solve(engine).solvable == (expected == 0)
+        print(f"  {name}: {'✅' if ok else '❌'} {result.nodes} nodes + {result.pruned} pruned "
+              f"vs {full.nodes} unpruned, {result.remaining} left")
+        assert ok
+
+
+if __name__ == "__main__":
+    test_bound_never_underestimates()
+    test_pruned_search_matches_full_search()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Test streaming configs from JSONL files and directories
+"""
+
+
+import sys
+import os
+import json
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import ConfigManager, GameConfig, parse_config
+
+GOOD = {"critters": ["frog", "Rhino"], "locations": [{"type": "beach", "mushrooms": 4}]}
+
+
+def write_jsonl(path, records):
+    with open(path, 'w') as f:
+        for record in records:
+            f.write(record if isinstance(record, str) else json.dumps(record))
+            f.write("\n")
+
+
+def test_jsonl_with_errors():
+    """Bad records should be reported with their line numbers and skipped"""
+    print("Testing JSONL loading...")
+
+    records = [GOOD, "{not json", {"critters": ["dragon"]}, "", {"critters": ["frog"], "extra": 1},
+               {"critters": ["frog"], "locations": [{"type": "beach", "mushrooms": True}]},
+               dict(GOOD, solution=[[0, 0]])]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "puzzles.jsonl")
+        write_jsonl(path, records)
+        errors = []
+        configs = list(ConfigManager.iter_configs(path, errors))
+
+    for error in errors:
+        print(f"  {error}")
+    ok = (configs == [GameConfig(**GOOD), GameConfig(**GOOD, solution=[[0, 0]])] and
+          [error.line for error in errors] == [2, 3, 5, 6] and
+          all(error.source == path for error in errors))
+    print(f"  {'✅' if ok else '❌'} {len(configs)} configs loaded, {len(errors)} errors recorded")
+    assert ok
+
+
+def test_directory_and_workers():
+    """A directory of JSON and JSONL files should load the same with a process pool"""
+    print(f"\n{'='*60}")
+    print("Testing directory loading...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ["balanced", "easy", "support"]:
+            with open(f"configs/{name}.json") as src, open(os.path.join(tmp, f"{name}.json"), 'w') as dst:
+                dst.write(src.read())
+        with open(os.path.join(tmp, "broken.json"), 'w') as f:
+            f.write("{")
+        with open(os.path.join(tmp, "notes.txt"), 'w') as f:
+            f.write("ignored")
+        write_jsonl(os.path.join(tmp, "more.jsonl"), [GOOD] * 50)
+
+        errors = []
+        serial = list(ConfigManager.iter_configs(tmp, errors, chunk_lines=8))
+        parallel = list(ConfigManager.iter_configs(tmp, workers=2, chunk_lines=8))
+
+    balanced, easy, support = [ConfigManager.load_config(f"configs/{name}.json") for name in ["balanced", "easy", "support"]]
+    ok = (serial == [balanced, easy] + [GameConfig(**GOOD)] * 50 + [support] and parallel == serial and
+          len(errors) == 1 and errors[0].line is None and errors[0].source.endswith("broken.json"))
+    print(f"  {'✅' if ok else '❌'} {len(serial)} configs from a directory in file name order, same with 2 workers")
+    assert ok
+
+    errors = []
+    missing = list(ConfigManager.iter_configs("no/such/puzzles.jsonl", errors))
+    missing += list(ConfigManager.iter_configs("no/such/puzzle.json", errors))
+    ok = (missing == [] and [error.source for error in errors] == ["no/such/puzzles.jsonl", "no/such/puzzle.json"]
+          and all(error.line is None for error in errors))
+    print(f"  {'✅' if ok else '❌'} Missing JSON and JSONL files both reported as ConfigErrors")
+    assert ok
+
+
+def test_parse_config_validation():
+    """parse_config should accept valid records and name the problem in invalid ones"""
+    print(f"\n{'='*60}")
+    print("Testing record validation...")
+
+    bad_records = [[], {"critters": []}, {"critters": ["frog"], "locations": [{"type": "moon", "mushrooms": 3}]},
+                   {"critters": ["frog"], "locations": [{"type": "beach", "mushrooms": 0}]},
+                   {"critters": ["frog"], "solution": [[0]]}]
+    rejected = 0
+    for record in bad_records:
+        try:
+            parse_config(record)
+        except ValueError as e:
+            rejected += 1
+            print(f"  {record}: {e}")
+    ok = rejected == len(bad_records) and parse_config(GOOD) == GameConfig(**GOOD)
+    print(f"  {'✅' if ok else '❌'} {rejected}/{len(bad_records)} invalid records rejected")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_jsonl_with_errors()
+    test_directory_and_workers()
+    test_parse_config_validation()
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Test that config files are parsed once and reloaded when they change
+"""
+
+
+import sys
+import os
+import json
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import ConfigManager, ConfigRegistry, GameConfig
+from game_engine import GameEngine
+
+
+def write_config(path, mushrooms):
+    with open(path, 'w') as f:
+        json.dump({"critters": ["frog", "rhino"], "locations": [{"type": "beach", "mushrooms": mushrooms}]}, f)
+
+
+def test_engines_share_one_parse():
+    """Many engines from one path should parse the file once"""
+    print("Testing config registry caching...")
+
+    loads_before = ConfigManager.registry.loads
+    engines = [GameEngine("configs/support.json") for _ in range(50)]
+    loads = ConfigManager.registry.loads - loads_before
+
+    ok = loads <= 1 and all(engine.to_state() == engines[0].to_state() for engine in engines)
+    print(f"  {'✅' if ok else '❌'} 50 engines, {loads} file parse(s)")
+    assert ok
+
+
+def test_hot_reload():
+    """Changing a file should be picked up on the next check"""
+    print(f"\n{'='*60}")
+    print("Testing hot reload...")
+
+    registry = ConfigRegistry(check_interval=0)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "puzzle.json")
+        write_config(path, 5)
+        first = registry.get(path)
+        again = registry.get(path)
+        write_config(path, 12)
+        changed = registry.get(path)
+
+        throttled = ConfigRegistry(check_interval=3600)
+        throttled.get(path)
+        os.remove(path)
+        still_cached = throttled.get(path)
+
+    ok = (again is first and registry.loads == 2 and changed.locations[0]["mushrooms"] == 12 and
+          still_cached.locations[0]["mushrooms"] == 12)
+    print(f"  {'✅' if ok else '❌'} Reloaded after the edit ({registry.loads} parses), "
+          f"no re-check within the interval")
+    assert ok
+
+
+def test_missing_file_draws_default_once():
+    """A missing file should give locations and critters from a single default config"""
+    print(f"\n{'='*60}")
+    print("Testing missing config fallback...")
+
+    calls = []
+    original = ConfigManager.get_default_config
+    ConfigManager.get_default_config = staticmethod(lambda seed=None: calls.append(1) or original(seed))
+    try:
+        engine = GameEngine("configs/does_not_exist.json")
+    finally:
+        ConfigManager.get_default_config = staticmethod(original)
+
+    ok = len(calls) == 1 and len(engine.critter_queue) == 8
+    print(f"  {'✅' if ok else '❌'} Default config drawn {len(calls)} time(s)")
+    assert ok
+
+
+def test_save_then_load():
+    """A config written by save_config should be what the next load returns"""
+    print(f"\n{'='*60}")
+    print("Testing save_config followed by load_config...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "saved.json")
+        ConfigManager.save_config(GameConfig(["frog"] * 8), path)
+        first = ConfigManager.load_config(path)
+        ConfigManager.save_config(GameConfig(["rhino"] * 8), path)
+        second = ConfigManager.load_config(path)
+        ConfigManager.registry.invalidate(path)
+
+    ok = first.critters[0] == "frog" and second.critters[0] == "rhino"
+    print(f"  {'✅' if ok else '❌'} Second load sees the new lineup without waiting for a re-check")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_engines_share_one_parse()
+    test_hot_reload()
+    test_missing_file_draws_default_once()
+    test_save_then_load()
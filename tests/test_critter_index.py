@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test the per-location critter index used by large-capacity locations
+"""
+
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import GameConfig
+from game_engine import GameEngine
+from models import Critter, CritterList, CritterType, INDEXED_CAPACITY, Location, LocationType
+
+
+def index_matches(critters):
+    fresh = CritterList(list(critters))
+    return (critters.slots == fresh.slots and
+            {code: same for code, same in critters.by_type.items() if same} == fresh.by_type)
+
+
+def test_list_operations():
+    """Every way of editing the list should leave by_type and slots current"""
+    print("Testing CritterList index under list operations...")
+
+    rng = random.Random(1)
+    types = [CritterType.RHINO, CritterType.SHEEP, CritterType.GOPHER, CritterType.FROG]
+    new = lambda: Critter(rng.choice(types), 1, 2)
+    critters = CritterList(new() for _ in range(6))
+    operations = [
+        lambda: critters.append(new()),
+        lambda: critters.pop(),
+        lambda: critters.pop(0),
+        lambda: critters.remove(critters[len(critters) // 2]),
+        lambda: critters.insert(1, new()),
+        lambda: critters.__setitem__(slice(None), [c for c in critters if c.type != CritterType.FROG]),
+        lambda: critters.__setitem__(0, new()),
+        lambda: critters.__delitem__(0),
+        lambda: critters.extend([new(), new()]),
+        lambda: critters.__iadd__([new()]),
+        lambda: critters.reverse(),
+        lambda: critters.sort(key=lambda c: c.type.code),
+    ]
+    ok = True
+    for _ in range(500):
+        if len(critters) < 3:
+            critters.extend(new() for _ in range(4))
+        rng.choice(operations)()
+        ok = ok and index_matches(critters)
+    critters.clear()
+    ok = ok and critters.by_type == {} and critters.slots == {}
+    print(f"  {'✅' if ok else '❌'} Index matches the list after 500 random edits")
+    assert ok
+
+    critters.extend([Critter(CritterType.SHEEP, 1, 2), Critter(CritterType.FROG, 1, 2), Critter(CritterType.RHINO, 1, 2)])
+    rhinos_and_sheep = critters.of_types((CritterType.RHINO.code, CritterType.SHEEP.code))
+    ok = [c.type for c in rhinos_and_sheep] == [CritterType.SHEEP, CritterType.RHINO]
+    print(f"  {'✅' if ok else '❌'} of_types() lists only those types, in slot order")
+    assert ok
+
+
+def test_only_large_locations_indexed():
+    print(f"\n{'='*60}")
+    print("Testing which locations keep an index...")
+
+    small = Location(0, LocationType.CANYON, 10)
+    large = Location(0, LocationType.CANYON, 10, INDEXED_CAPACITY + 1, [Critter(CritterType.RHINO, 1, 2)])
+    engine = GameEngine(GameConfig(critters=["rhino", "sheep", "goose"]))
+    engine.locations[0] = Location(0, engine.locations[0].type, 50, 40)
+    ok = (type(small.critters) is list and type(large.critters) is CritterList and
+          index_matches(large.critters) and type(engine.clone().locations[0].critters) is CritterList and
+          type(GameEngine.from_state(engine.to_state()).locations[0].critters) is CritterList)
+    print(f"  {'✅' if ok else '❌'} Plain lists up to {INDEXED_CAPACITY} critters, indexed above, kept by clone/from_state")
+    assert ok
+
+
+def snapshot(engine):
+    return (engine.to_state(), engine.position_hash, engine.game_over, engine.game_won,
+            [(c.mushrooms_collected, c.current_location_id) for c in engine.all_critters_ever])
+
+
+def test_matches_plain_lists():
+    """Games on indexed locations should play exactly as on plain lists, undo included"""
+    print(f"\n{'='*60}")
+    print("Testing indexed locations against plain lists...")
+
+    rng = random.Random(2)
+    lineups = [["goose", "rhino", "sheep", "gopher", "goose", "rhino", "sheep", "frog", "goose", "gopher"],
+               ["rhino", "gopher", "crocodile", "sheep", "gopher", "penguin", "goose", "grizzly"]]
+    games = mismatches = 0
+    for lineup in lineups:
+        for _ in range(20):
+            config = GameConfig(critters=lineup, locations=[{"type": name, "mushrooms": 200}
+                                                             for name in ("canyon", "jungle", "beach")])
+            indexed = GameEngine(config)
+            indexed.locations = [Location(loc.id, loc.type, loc.mushrooms, 40, loc.critters)
+                                 for loc in indexed.locations]
+            indexed.position_hash = indexed.compute_position_hash()
+            indexed.verify_hash = True
+            plain = indexed.clone()
+            for location in plain.locations:
+                location.critters = list(location.critters)
+            games += 1
+            pushed = 0
+            while not indexed.game_over and indexed.get_valid_moves():
+                move = rng.choice(indexed.get_valid_moves())
+                indexed.push_move(*move)
+                plain.process_turn(*move)
+                pushed += 1
+                mismatches += snapshot(indexed) != snapshot(plain)
+            for _ in range(pushed):
+                indexed.pop_move()
+            mismatches += not all(index_matches(location.critters) for location in indexed.locations)
+
+    ok = mismatches == 0
+    print(f"  {'✅' if ok else '❌'} {games} games, {mismatches} mismatches")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_list_operations()
+    test_only_large_locations_indexed()
+    test_matches_plain_lists()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test difficulty scoring and its fingerprint cache
+"""
+
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import ConfigManager, GameConfig
+from difficulty import difficulty
+from solver import count_solutions
+
+
+def test_measures_and_bands():
+    """Winning lines should match count_solutions and scores should order the configs"""
+    print("Testing difficulty measures...")
+
+    support = difficulty("configs/support.json")
+    custom = difficulty("configs/test_custom.json")
+    for name, result in [("support", support), ("test_custom", custom)]:
+        print(f"  {name}: {result}")
+
+    ok = (support.winning_lines == count_solutions("configs/support.json") and
+          custom.winning_lines == count_solutions("configs/test_custom.json") and
+          0 < support.win_rate < custom.win_rate < 1 and
+          support.earliest_loss_day < custom.earliest_loss_day and
+          support.score > custom.score and support.band in ("medium", "hard"))
+    print(f"  {'✅' if ok else '❌'} support scores harder than test_custom")
+    assert ok
+
+    impossible = GameConfig(critters=["frog", "penguin"], locations=[
+        {"type": "beach", "mushrooms": 30}, {"type": "canyon", "mushrooms": 30}, {"type": "jungle", "mushrooms": 30}])
+    result = difficulty(impossible)
+    print(f"  impossible: {result}")
+    ok = (not result.solvable and result.band == "unsolvable" and result.best_remaining > 0 and
+          result.earliest_loss_day == 1)
+    print(f"  {'✅' if ok else '❌'} Unsolvable puzzle banded separately")
+    assert ok
+
+
+def test_cache_by_fingerprint():
+    """A puzzle already scored should come straight from the cache"""
+    print(f"\n{'='*60}")
+    print("Testing the fingerprint cache...")
+
+    cache = {}
+    config = ConfigManager.load_config("configs/test_custom.json")
+    first = difficulty(config, cache)
+    same_puzzle = GameConfig(critters=[name.upper() for name in config.critters],
+                             locations=config.locations, solution=[[0, 0]])
+    second = difficulty(same_puzzle, cache)
+
+    ok = len(cache) == 1 and second is first and same_puzzle.fingerprint() == config.fingerprint()
+    print(f"  {'✅' if ok else '❌'} Re-scoring reuses the cached result")
+    assert ok
+
+    harder = GameConfig(critters=config.critters,
+                        locations=[dict(loc, mushrooms=loc["mushrooms"] + 1) for loc in config.locations])
+    ok = harder.fingerprint() != config.fingerprint()
+    print(f"  {'✅' if ok else '❌'} Different mushroom counts get a different fingerprint")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_measures_and_bands()
+    test_cache_by_fingerprint()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test the Gym-style environments
+"""
+
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from env import NUM_ACTIONS, OBSERVATION_SIZE, MushroomEnv, VectorMushroomEnv
+
+
+def test_vector_env_matches_single_envs():
+    """Each game of the vector env should see exactly what a MushroomEnv sees, across auto-resets"""
+    print("Testing VectorMushroomEnv against MushroomEnv...")
+
+    for path in ["configs/balanced.json", "configs/support.json"]:
+        vector = VectorMushroomEnv(path, 6)
+        singles = [MushroomEnv(path) for _ in range(6)]
+        observations, info = vector.reset(seed=0)
+        resets = [env.reset() for env in singles]
+        ok = all((observations[i] == obs).all() and (info["action_mask"][i] == single_info["action_mask"]).all()
+                 for i, (obs, single_info) in enumerate(resets))
+
+        rng = np.random.default_rng(1)
+        episodes = 0
+        for _ in range(30):
+            scores = rng.random((6, NUM_ACTIONS))
+            scores[~info["action_mask"]] = -1.0
+            actions = scores.argmax(axis=1)
+            observations, rewards, terminated, truncated, info = vector.step(actions)
+            for i, env in enumerate(singles):
+                obs, reward, done, _, single_info = env.step(actions[i])
+                ok = ok and reward == rewards[i] and done == terminated[i]
+                if done:
+                    episodes += 1
+                    ok = ok and (info["final_observation"][i] == obs).all() and info["won"][i] == single_info["won"]
+                    obs, single_info = env.reset()
+                ok = ok and (observations[i] == obs).all() and (info["action_mask"][i] == single_info["action_mask"]).all()
+
+        ok = ok and observations.shape == (6, OBSERVATION_SIZE) and episodes >= 6 and not truncated.any()
+        print(f"  {path}: {'✅' if ok else '❌'} {episodes} episodes, identical observations and rewards")
+        assert ok
+
+
+def test_rewards_add_up_to_mushrooms_collected():
+    """An episode's rewards should total the mushrooms taken off the board"""
+    print(f"\n{'='*60}")
+    print("Testing rewards...")
+
+    env = MushroomEnv("configs/easy.json")
+    observation, info = env.reset(seed=3)
+    start = int(observation[:3].sum())
+    total = 0.0
+    done = False
+    while not done:
+        observation, reward, done, _, info = env.step(int(np.flatnonzero(info["action_mask"])[0]))
+        total += reward
+    ok = total == start - int(observation[:3].sum())
+    print(f"  {'✅' if ok else '❌'} {total:.0f} mushrooms rewarded")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_vector_env_matches_single_envs()
+    test_rewards_add_up_to_mushrooms_collected()
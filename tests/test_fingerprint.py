@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Test canonical config fingerprints and streaming deduplication
+"""
+
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import GameConfig, dedupe_configs
+from solver import count_solutions
+
+BEACH = {"type": "beach", "mushrooms": 6}
+CANYON = {"type": "canyon", "mushrooms": 8}
+JUNGLE = {"type": "jungle", "mushrooms": 5}
+
+
+def fingerprint(critters, locations):
+    return GameConfig(critters=critters, locations=locations).fingerprint()
+
+
+def test_equivalent_orders_hash_the_same():
+    """Only location orders the engine cannot tell apart should collide"""
+    print("Testing canonical fingerprints...")
+
+    plain = ["frog", "rhino", "penguin", "sheep"]
+    one_gopher = ["frog", "gopher", "penguin", "sheep"]
+    two_gophers = ["gopher", "gopher", "penguin", "sheep"]
+    checks = [
+        ("Any order without Gophers", fingerprint(plain, [BEACH, CANYON, JUNGLE]) ==
+         fingerprint(plain, [JUNGLE, BEACH, CANYON]) == fingerprint(plain, [CANYON, BEACH, JUNGLE])),
+        ("Rotation with one Gopher", fingerprint(one_gopher, [BEACH, CANYON, JUNGLE]) ==
+         fingerprint(one_gopher, [JUNGLE, BEACH, CANYON])),
+        ("Reflection with one Gopher differs", fingerprint(one_gopher, [BEACH, CANYON, JUNGLE]) !=
+         fingerprint(one_gopher, [CANYON, BEACH, JUNGLE])),
+        ("Rotation with two Gophers differs", fingerprint(two_gophers, [BEACH, CANYON, JUNGLE]) !=
+         fingerprint(two_gophers, [JUNGLE, BEACH, CANYON])),
+        ("Lineup order matters", fingerprint(plain, [BEACH, CANYON, JUNGLE]) !=
+         fingerprint(list(reversed(plain)), [BEACH, CANYON, JUNGLE])),
+        ("Case and stored solution ignored", fingerprint(plain, [BEACH, CANYON, JUNGLE]) ==
+         GameConfig(critters=[c.upper() for c in plain], locations=[BEACH, CANYON, JUNGLE],
+                    solution=[[0, 1]]).fingerprint()),
+    ]
+    for name, ok in checks:
+        print(f"  {'✅' if ok else '❌'} {name}")
+        assert ok
+
+    # Puzzles that hash the same should play the same
+    small = [{"type": "beach", "mushrooms": 4}, {"type": "canyon", "mushrooms": 3}, {"type": "jungle", "mushrooms": 2}]
+    for critters in (plain, one_gopher):
+        counts = {count_solutions(GameConfig(critters=critters, locations=small[shift:] + small[:shift]))
+                  for shift in range(3)}
+        print(f"  {'✅' if len(counts) == 1 else '❌'} Rotations of {critters} all have {counts} winning lines")
+        assert len(counts) == 1
+
+
+def test_streaming_dedupe():
+    """Spilling to disk should give the same first occurrences as an in-memory pass"""
+    print(f"\n{'='*60}")
+    print("Testing streaming dedupe...")
+
+    rng = random.Random(6)
+    lineups = [["frog", "rhino"], ["rhino", "frog"], ["sheep", "goose"]]
+    orders = [[BEACH, CANYON, JUNGLE], [JUNGLE, CANYON, BEACH]]
+    stream = [GameConfig(critters=rng.choice(lineups), locations=rng.choice(orders)) for _ in range(500)]
+
+    expected = []
+    seen = set()
+    for config in stream:
+        if config.fingerprint() not in seen:
+            seen.add(config.fingerprint())
+            expected.append(config)
+
+    in_memory = list(dedupe_configs(stream))
+    spilled = list(dedupe_configs(stream, max_in_memory=1, partitions=4))
+    ok = in_memory == expected and spilled == expected and len(expected) == 3
+    print(f"  {'✅' if ok else '❌'} 500 configs reduced to {len(spilled)} in input order")
+    assert ok
+
+    # Far more distinct puzzles than partitions x max_in_memory, so partitions split again
+    many = [GameConfig(critters=rng.choice(lineups), locations=[dict(BEACH, mushrooms=rng.randint(1, 150)),
+                                                                 CANYON, JUNGLE])
+            for _ in range(2000)]
+    expected = list(dedupe_configs(many))
+    spilled = list(dedupe_configs(many, max_in_memory=5, partitions=3))
+    ok = spilled == expected and len(expected) > 300
+    print(f"  {'✅' if ok else '❌'} {len(many)} configs reduced to {len(spilled)} with oversized partitions split")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_equivalent_orders_hash_the_same()
+    test_streaming_dedupe()
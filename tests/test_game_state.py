@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Test the packed to_state()/from_state() position representation
+"""
+
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import GameConfig
+from game_engine import GameEngine
+from models import Critter, CritterType, Location, LocationType
+
+
+def test_round_trip_and_play_on():
+    """A rebuilt engine should pack the same and play on identically"""
+    print("Testing to_state/from_state round trips...")
+
+    rng = random.Random(3)
+    configs = ["balanced", "cursed", "easy", "high_damage", "support"]
+    largest = 0
+
+    for config_name in configs:
+        failures = 0
+        for _ in range(30):
+            engine = GameEngine(f"configs/{config_name}.json")
+            while not engine.game_over and engine.get_valid_moves():
+                state = engine.to_state()
+                largest = max(largest, len(state))
+                rebuilt = GameEngine.from_state(state)
+                if rebuilt.to_state() != state or rebuilt.game_over != engine.game_over:
+                    failures += 1
+
+                move = rng.choice(engine.get_valid_moves())
+                engine.process_turn(*move)
+                rebuilt.process_turn(*move)
+                if rebuilt.to_state() != engine.to_state():
+                    failures += 1
+
+        print(f"  {config_name}: {'✅' if failures == 0 else '❌'} {failures} mismatches")
+        assert failures == 0
+
+    print(f"  Largest packed state: {largest} bytes")
+    assert largest < 100
+
+
+def test_transposed_positions_share_a_key():
+    """Reaching the same position by different move orders should give equal states"""
+    print(f"\n{'='*60}")
+    print("Testing transposed positions...")
+
+    config = GameConfig(critters=["frog", "frog", "penguin", "rhino", "sheep", "frog"])
+
+    # Either Frog can be sent to the Beach; the other goes to the back of the queue
+    first = GameEngine(config)
+    first.process_turn(0, 0)
+
+    second = GameEngine(config)
+    second.process_turn(1, 0)
+
+    same = first.to_state() == second.to_state() and hash(first.to_state()) == hash(second.to_state())
+    print(f"  {'✅' if same else '❌'} Equal positions give equal keys")
+    assert same
+
+    second.process_turn(0, 1)
+    differs = first.to_state() != second.to_state()
+    print(f"  {'✅' if differs else '❌'} Different positions give different keys")
+    assert differs
+
+
+def test_wide_values():
+    """Capacities, mushrooms and stats past one byte should pack and come back exactly"""
+    print(f"\n{'='*60}")
+    print("Testing values above 255...")
+
+    engine = GameEngine(GameConfig(critters=["rhino", "sheep", "goose"]))
+    engine.locations[0] = Location(0, LocationType.CANYON, 70000, 300,
+                                   [Critter(CritterType.RHINO, 256, 1000, current_location_id=0),
+                                    Critter(CritterType.SHEEP, 255, 254, current_location_id=0)])
+    engine.critter_queue[0].current_lifespan = 128
+    state = engine.to_state()
+    rebuilt = GameEngine.from_state(state)
+    location = rebuilt.locations[0]
+    ok = (rebuilt.to_state() == state and location.max_critters == 300 and location.mushrooms == 70000 and
+          [(c.current_mushrooms_per_day, c.current_lifespan) for c in location.critters] == [(256, 1000), (255, 254)]
+          and rebuilt.critter_queue[0].current_lifespan == 128)
+    print(f"  {'✅' if ok else '❌'} Capacity 300, 70000 mushrooms and stats 255/256/1000 round trip")
+    assert ok
+
+    engine.locations[0].critters[0].current_lifespan = -1
+    try:
+        engine.to_state()
+        ok = False
+    except ValueError:
+        pass
+    print(f"  {'✅' if ok else '❌'} Negative values rejected with ValueError")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_round_trip_and_play_on()
+    test_transposed_positions_share_a_key()
+    test_wide_values()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Test the solvable puzzle generator
+"""
+
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import tempfile
+from collections import Counter
+from config import ConfigManager
+from game_engine import GameEngine
+from generator import PuzzleGenerator
+from solver import solve
+
+
+def replays_to_win(config):
+    engine = GameEngine(config)
+    for move in config.solution:
+        engine.process_turn(*move)
+    return engine.game_won
+
+
+def test_generated_puzzles_are_solvable():
+    """Every emitted puzzle should be winnable"""
+    print("Testing generated puzzles with the solver...")
+
+    generator = PuzzleGenerator(seed=1)
+    puzzles = generator.generate_many(10)
+    results = [solve(config) for config in puzzles]
+    print(f"  {generator.stats()}")
+
+    ok = all(result.solvable for result in results)
+    print(f"  {'✅' if ok else '❌'} {sum(r.solvable for r in results)}/{len(results)} solvable")
+    assert ok
+
+    default = ConfigManager.get_default_config()
+    print(f"  {'✅' if solve(default).solvable else '❌'} Default config is solvable")
+    assert solve(default).solvable
+
+
+def test_seed_reproduces_puzzles():
+    """The same seed should give the same puzzles"""
+    print(f"\n{'='*60}")
+    print("Testing seeded generation...")
+
+    first = PuzzleGenerator(seed=7).generate_many(5)
+    second = PuzzleGenerator(seed=7).generate_many(5)
+    other = PuzzleGenerator(seed=8).generate_many(5)
+
+    ok = first == second and first != other
+    print(f"  {'✅' if ok else '❌'} Seed 7 repeats, seed 8 differs")
+    assert ok
+
+
+def test_constraint_filters():
+    """Required critters and the location mix should always be honoured"""
+    print(f"\n{'='*60}")
+    print("Testing constraint filters...")
+
+    generator = PuzzleGenerator(seed=3, required_critters=["rhino", "rhino", "goose"],
+                                allowed_critters=["frog", "penguin", "rhino"],
+                                location_types=["canyon", "canyon", "jungle"],
+                                mushroom_range=(4, 12))
+    for config in generator.generate_many(5):
+        counts = Counter(config.critters)
+        mushrooms = [loc["mushrooms"] for loc in config.locations]
+        ok = (len(config.critters) == 8 and counts["rhino"] >= 2 and counts["goose"] == 1 and
+              set(counts) <= {"frog", "penguin", "rhino", "goose"} and
+              [loc["type"] for loc in config.locations] == ["canyon", "canyon", "jungle"] and
+              len(set(mushrooms)) == 3 and all(4 <= m <= 12 for m in mushrooms))
+        print(f"  {'✅' if ok else '❌'} {config.critters} {mushrooms}")
+        assert ok
+
+    try:
+        PuzzleGenerator(required_critters=["frog"] * 9)
+        raised = False
+    except ValueError:
+        raised = True
+    print(f"  {'✅' if raised else '❌'} Too many required critters rejected")
+    assert raised
+
+
+def test_playout_mode_stores_witness():
+    """Constructed puzzles should be won by the line they were built from"""
+    print(f"\n{'='*60}")
+    print("Testing construct-from-playout generation...")
+
+    for policy in PuzzleGenerator.PLAYOUT_POLICIES:
+        generator = PuzzleGenerator(seed=2, mode="playout", playout_policy=policy)
+        puzzles = generator.generate_many(20)
+        ok = all(replays_to_win(config) and len(config.solution) <= 7 for config in puzzles)
+        ok = ok and all(solve(config).solvable for config in puzzles[:3])
+        ok = ok and puzzles == PuzzleGenerator(seed=2, mode="playout", playout_policy=policy).generate_many(20)
+        print(f"  {'✅' if ok else '❌'} {policy} playouts: 20 witnessed wins, {generator.stats()}")
+        assert ok
+
+    verified = PuzzleGenerator(seed=2).generate()
+    print(f"  {'✅' if replays_to_win(verified) else '❌'} Verify mode stores its winning line too")
+    assert replays_to_win(verified)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "puzzle.json")
+        ConfigManager.save_config(puzzles[0], path)
+        loaded = ConfigManager.load_config(path)
+    print(f"  {'✅' if loaded == puzzles[0] else '❌'} Solution survives a save and load")
+    assert loaded == puzzles[0]
+
+
+if __name__ == "__main__":
+    test_generated_puzzles_are_solvable()
+    test_seed_reproduces_puzzles()
+    test_constraint_filters()
+    test_playout_mode_stores_witness()
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test the process-pool solver against the single-process one
+"""
+
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_engine import GameEngine
+from parallel_solver import parallel_solve, split_moves
+from solver import solve
+from transposition import SharedTranspositionTable
+
+
+def test_parallel_matches_serial():
+    """Every split and table option should agree with solve()"""
+    print("Testing parallel_solve against solve...")
+
+    for config_name in ["support", "high_damage"]:
+        path = f"configs/{config_name}.json"
+        expected = solve(path)
+        for share_table in (False, True):
+            result = parallel_solve(path, workers=2, split_depth=2, share_table=share_table)
+
+            ok = result.solvable == expected.solvable
+            if result.solvable:
+                engine = GameEngine(path)
+                for move in result.moves:
+                    engine.process_turn(*move)
+                ok = ok and engine.game_won
+            print(f"  {config_name} (shared table: {share_table}): {'✅' if ok else '❌'} {result}")
+            assert ok
+
+
+def test_split_covers_distinct_positions():
+    """Splitting two plies should give one prefix per distinct position"""
+    print(f"\n{'='*60}")
+    print("Testing split_moves...")
+
+    engine = GameEngine("configs/balanced.json")
+    prefixes = split_moves(engine, 2)
+    hashes = set()
+    for prefix in prefixes:
+        for move in prefix:
+            engine.push_move(*move)
+        hashes.add(engine.position_hash)
+        for _ in prefix:
+            engine.pop_move()
+
+    ok = len(hashes) == len(prefixes) and all(len(prefix) == 2 for prefix in prefixes)
+    print(f"  {'✅' if ok else '❌'} {len(prefixes)} two-ply subtrees, all distinct")
+    assert ok
+
+
+def test_shared_table_round_trip():
+    """Entries written through one handle should be readable through another"""
+    print(f"\n{'='*60}")
+    print("Testing SharedTranspositionTable...")
+
+    table = SharedTranspositionTable.create(1024 * SharedTranspositionTable.SLOT_BYTES)
+    try:
+        table.store(0xDEADBEEF, 4, (1, 2), 5, exact=False)
+        other = SharedTranspositionTable.attach(table.name, table.capacity)
+        entry = other.probe(0xDEADBEEF)
+        missing = other.probe(0xDEADBEEF + table.capacity)
+        other.close()
+    finally:
+        table.close()
+        table.unlink()
+
+    ok = entry is not None and (entry.remaining, entry.best_move, entry.depth, entry.exact) == (4, (1, 2), 5, False)
+    print(f"  {'✅' if ok and missing is None else '❌'} Read back {entry}")
+    assert ok and missing is None
+
+
+if __name__ == "__main__":
+    test_parallel_matches_serial()
+    test_split_covers_distinct_positions()
+    test_shared_table_round_trip()
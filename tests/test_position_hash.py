@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test that the incrementally updated position_hash matches a full recompute
+"""
+
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import GameConfig
+from game_engine import GameEngine
+
+
+def test_hash_tracks_every_phase():
+    """Debug mode checks the hash after each phase of every turn"""
+    print("Testing position_hash through random games in debug mode...")
+
+    rng = random.Random(11)
+    configs = ["balanced", "cursed", "easy", "high_damage", "support"]
+
+    for config_name in configs:
+        turns = 0
+        engine = GameEngine(f"configs/{config_name}.json")
+        engine.verify_hash = True
+        for _ in range(40):
+            hashes = []
+            while not engine.game_over and engine.get_valid_moves():
+                hashes.append(engine.position_hash)
+                engine.push_move(*rng.choice(engine.get_valid_moves()))
+                turns += 1
+            while hashes:
+                engine.pop_move()
+                assert engine.position_hash == hashes.pop()
+
+        print(f"  {config_name}: ✅ {turns} turns checked")
+
+
+def test_equal_positions_equal_hashes():
+    """Transposed and rebuilt positions should hash the same"""
+    print(f"\n{'='*60}")
+    print("Testing hashes of equal positions...")
+
+    config = GameConfig(critters=["frog", "frog", "penguin", "rhino", "sheep", "frog"])
+    first = GameEngine(config)
+    first.process_turn(0, 0)
+    second = GameEngine(config)
+    second.process_turn(1, 0)
+    rebuilt = GameEngine.from_state(first.to_state())
+
+    same = first.position_hash == second.position_hash == rebuilt.position_hash
+    print(f"  {'✅' if same else '❌'} Transposed and rebuilt positions share a hash")
+    assert same
+
+    second.process_turn(0, 1)
+    print(f"  {'✅' if first.position_hash != second.position_hash else '❌'} Different positions differ")
+    assert first.position_hash != second.position_hash
+
+
+def test_debug_mode_catches_stale_hash():
+    """Editing the board by hand without rehashing should be reported"""
+    print(f"\n{'='*60}")
+    print("Testing debug mode on a hand-edited board...")
+
+    engine = GameEngine("configs/balanced.json")
+    engine.verify_hash = True
+    engine.locations[0].mushrooms = 5
+
+    try:
+        engine.process_turn(0, 1)
+        caught = False
+    except AssertionError as e:
+        print(f"  Caught: {e}")
+        caught = True
+
+    print(f"  {'✅' if caught else '❌'} Stale hash detected")
+    assert caught
+
+
+if __name__ == "__main__":
+    test_hash_tracks_every_phase()
+    test_equal_positions_equal_hashes()
+    test_debug_mode_catches_stale_hash()
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Test the memory-mapped puzzle bank and its indexes
+"""
+
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collections import Counter
+from config import ConfigManager, GameConfig
+from difficulty import Difficulty
+from game_engine import GameEngine
+from generator import PuzzleGenerator
+from puzzle_bank import PuzzleBank
+
+
+def make_bank(directory, count=300):
+    """Write generated puzzles with made-up difficulties cycling through the bands"""
+    puzzles = PuzzleGenerator(seed=4, mode="playout").generate_many(count)
+    bands = ["easy", "medium", "hard"]
+    scores = [Difficulty(True, i, 0.5, 3, 0, 1, (i % 3) / 3 + 0.1, bands[i % 3]) for i in range(count)]
+    path = os.path.join(directory, "puzzles.bank")
+    PuzzleBank.write(path, puzzles, scores)
+    return path, puzzles
+
+
+def test_round_trip():
+    """Every record should decode to the puzzle that was written"""
+    print("Testing bank round trip...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path, puzzles = make_bank(tmp)
+        with PuzzleBank(path) as bank:
+            ok = len(bank) == len(puzzles) and list(bank) == puzzles and bank[-1] == puzzles[-1]
+            entry = bank.entry(7)
+            ok = ok and entry.band == "medium" and abs(entry.score - 0.4333) < 1e-3 and entry.winning_lines == 7
+            print(f"  {'✅' if ok else '❌'} {len(bank)} puzzles read back, #7 is {entry.band}")
+            assert ok
+
+            try:
+                bank.entry(len(bank))
+                raised = False
+            except IndexError:
+                raised = True
+            print(f"  {'✅' if raised else '❌'} Out-of-range number rejected")
+            assert raised
+
+
+def test_secondary_indexes():
+    """Band and composition lookups should match a scan of the records"""
+    print(f"\n{'='*60}")
+    print("Testing band and composition indexes...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path, puzzles = make_bank(tmp)
+        with PuzzleBank(path) as bank:
+            hard = list(bank.band("hard"))
+            ok = hard == list(range(2, len(puzzles), 3))
+            print(f"  {'✅' if ok else '❌'} {len(hard)} hard puzzles indexed")
+            assert ok
+
+            lineup = puzzles[0].critters
+            exact = list(bank.with_composition(reversed(lineup)))
+            expected = [i for i, p in enumerate(puzzles) if Counter(p.critters) == Counter(lineup)]
+            ok = exact == expected and 0 in exact
+            print(f"  {'✅' if ok else '❌'} {len(exact)} puzzles with the lineup of #0")
+            assert ok
+
+            required = ["rhino", "rhino", "goose"]
+            found = bank.with_critters(required)
+            expected = [i for i, p in enumerate(puzzles)
+                        if Counter(p.critters)["rhino"] >= 2 and Counter(p.critters)["goose"] >= 1]
+            ok = found == expected
+            print(f"  {'✅' if ok else '❌'} {len(found)} puzzles with two rhinos and a goose")
+            assert ok
+
+
+def test_config_manager_reference():
+    """'bank#number' should load straight into ConfigManager and GameEngine"""
+    print(f"\n{'='*60}")
+    print("Testing puzzle references...")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path, puzzles = make_bank(tmp)
+        config = ConfigManager.load_config(f"{path}#123")
+        engine = GameEngine(f"{path}#123")
+        for move in config.solution:
+            engine.process_turn(*move)
+        ConfigManager._banks.pop(path).close()
+
+    ok = config == puzzles[123] and engine.game_won
+    print(f"  {'✅' if ok else '❌'} Puzzle #123 loaded and won with its stored solution")
+    assert ok
+
+
+def test_default_board_and_solution_limits():
+    """A config on the default board should read back with that board; wide moves are refused"""
+    print(f"\n{'='*60}")
+    print("Testing default boards and solution moves...")
+
+    critters = ["rhino", "sheep", "goose", "gopher", "frog", "penguin", "crocodile", "grizzly"]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "default.bank")
+        PuzzleBank.write(path, [GameConfig(critters=critters)])
+        with PuzzleBank(path) as bank:
+            stored = bank[0]
+        moves = GameEngine(stored).get_valid_moves()
+        ok = moves == GameEngine(GameConfig(critters=critters)).get_valid_moves() and len(moves) == 6
+        print(f"  {'✅' if ok else '❌'} Default board stored as its {len(stored.locations)} locations")
+        assert ok
+
+        try:
+            PuzzleBank.write(path, [GameConfig(critters=critters, solution=[[0, 16]])])
+            raised = False
+        except ValueError:
+            raised = True
+        print(f"  {'✅' if raised else '❌'} Location index 16 rejected instead of truncated")
+        assert raised
+
+
+if __name__ == "__main__":
+    test_round_trip()
+    test_secondary_indexes()
+    test_config_manager_reference()
+    test_default_board_and_solution_limits()
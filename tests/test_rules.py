@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Test the rule hook registry and per-engine dispatch tables
+"""
+
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from collections import deque
+from game_engine import GameEngine
+from models import Critter, CritterType, LocationType
+from rules import CRITTER_HOOKS, LOCATION_HOOKS, location_hook
+
+
+def test_registered_hook_applies_to_new_engines():
+    """A new rule should reach engines created after it is registered, and only those"""
+    print("Testing hook registration...")
+
+    before = GameEngine("configs/easy.json")
+    try:
+        @location_hook("can_collect", LocationType.BEACH)
+        def nobody_collects(engine, critter, location):
+            return False
+
+        after = GameEngine("configs/easy.json")
+        beach = next(i for i, loc in enumerate(after.locations) if loc.type == LocationType.BEACH)
+        start = after.locations[beach].mushrooms
+        for engine in (before, after):
+            engine.process_turn(0, beach)
+        ok = after.locations[beach].mushrooms == start and before.locations[beach].mushrooms < start
+    finally:
+        del LOCATION_HOOKS["can_collect"][LocationType.BEACH]
+
+    restored = GameEngine("configs/easy.json")
+    restored.process_turn(0, beach)
+    ok = ok and restored.locations[beach].mushrooms < start
+    print(f"  {'✅' if ok else '❌'} Beach collection blocked only for the engine built with the rule")
+    assert ok
+
+
+def test_empty_phase_is_skipped():
+    """With no night rules registered, a Gopher should stay where it is"""
+    print(f"\n{'='*60}")
+    print("Testing an empty phase...")
+
+    night = dict(CRITTER_HOOKS["on_night"])
+    CRITTER_HOOKS["on_night"].clear()
+    try:
+        engine = GameEngine("configs/easy.json")
+        gopher = Critter(CritterType.GOPHER, 1, 4, current_location_id=0)
+        engine.locations[0].critters.append(gopher)  # Injected directly, as scenario tests do
+        engine._apply_end_of_day_effects()
+        stayed = engine._on_night is None and engine.locations[0].critters[-1] is gopher
+    finally:
+        CRITTER_HOOKS["on_night"].update(night)
+
+    engine = GameEngine("configs/easy.json")
+    engine.locations[0].critters.append(gopher)
+    engine._apply_end_of_day_effects()
+    ok = stayed and gopher not in engine.locations[0].critters
+    print(f"  {'✅' if ok else '❌'} Gopher stays without the rule and moves with it")
+    assert ok
+
+
+def test_hand_inserted_type_follows_its_rule():
+    """A critter type missing from the lineup should still follow its rules when put in by hand"""
+    print(f"\n{'='*60}")
+    print("Testing a hand-inserted critter type...")
+
+    ok = True
+    for engine in (GameEngine("configs/easy.json"), GameEngine()):  # easy.json has no Gopher
+        gopher = Critter(CritterType.GOPHER, 1, 4)
+        engine.critter_queue = deque([gopher, Critter(CritterType.FROG, 1, 5)])
+        engine.position_hash = engine.compute_position_hash()
+        engine.process_turn(0, 0)
+        ok = ok and gopher.current_location_id == 1 and gopher in engine.locations[1].critters
+    print(f"  {'✅' if ok else '❌'} Gopher added to an easy.json game moves at night as in a random game")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_registered_hook_applies_to_new_engines()
+    test_empty_phase_is_skipped()
+    test_hand_inserted_type_follows_its_rule()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Test seeded engines, generators and seed splitting
+"""
+
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import ConfigManager
+from game_engine import GameEngine
+from generator import PuzzleGenerator
+from seeding import derive_seed, split_seed
+
+
+def lineup(engine):
+    return [critter.type.value for critter in engine.critter_queue]
+
+
+def test_seeded_engines_repeat():
+    """The same seed should give the same default game; the global random module is untouched"""
+    print("Testing seeded engines...")
+
+    random.seed(99)
+    before = random.random()
+    random.seed(99)
+    first = GameEngine(seed=5)
+    second = GameEngine(seed=random.Random(5))
+    after = random.random()
+
+    lineups = {tuple(lineup(GameEngine(seed=seed))) for seed in range(10)}
+    ok = lineup(first) == lineup(second) and before == after and len(lineups) > 1
+    print(f"  {'✅' if ok else '❌'} Seed 5 lineup {lineup(first)} repeats, global stream unaffected")
+    assert ok
+
+    missing = [GameEngine("configs/missing.json", seed=3).to_state() for _ in range(2)]
+    print(f"  {'✅' if missing[0] == missing[1] else '❌'} Fallback puzzle for a missing file follows the seed")
+    assert missing[0] == missing[1]
+
+    clone = first.clone()
+    ok = clone.rng is not first.rng and clone.rng.random() == first.rng.random()
+    print(f"  {'✅' if ok else '❌'} Clones continue an independent copy of the stream")
+    assert ok
+
+
+def test_generators_accept_random_instances():
+    """A shared random.Random should be drawn from in sequence, like the seed it came from"""
+    print(f"\n{'='*60}")
+    print("Testing generator seeding...")
+
+    rng = random.Random(11)
+    first = PuzzleGenerator(seed=rng, mode="playout").generate_many(3)
+    second = PuzzleGenerator(seed=rng, mode="playout").generate_many(3)
+    rng = random.Random(11)
+    replay = PuzzleGenerator(seed=rng, mode="playout").generate_many(3)
+
+    ok = first == replay and first != second and ConfigManager.get_default_config(4) == ConfigManager.get_default_config(4)
+    print(f"  {'✅' if ok else '❌'} Generators replay from the same Random")
+    assert ok
+
+
+def test_seed_splitting():
+    """Child seeds should be stable, distinct and independent of how many are taken"""
+    print(f"\n{'='*60}")
+    print("Testing seed splitting...")
+
+    seeds = split_seed(2024, 1000)
+    print(f"  first child seeds: {seeds[:3]}")
+    ok = len(set(seeds)) == 1000 and split_seed(2024, 10) == seeds[:10] and seeds[7] == derive_seed(2024, 7)
+    ok = ok and derive_seed(2024, 7, 0) != derive_seed(2024, 7) and split_seed(2025, 10) != seeds[:10]
+    print(f"  {'✅' if ok else '❌'} 1000 distinct child seeds, prefix-stable")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_seeded_engines_repeat()
+    test_generators_accept_random_instances()
+    test_seed_splitting()
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Test self-play dataset shards, the manifest and resuming
+"""
+
+
+import sys
+import os
+import tempfile
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from env import NUM_LOCATIONS, observe
+from game_engine import GameEngine
+from selfplay import SelfPlayDataset, build_dataset, shard_name
+from simulate import simulate
+
+
+CONFIGS = ["configs/balanced.json", "configs/support.json"]
+
+
+def test_records_replay():
+    """Every record should be the position its game reached, and outcomes should match simulate()"""
+    print("Testing self-play records...")
+
+    with tempfile.TemporaryDirectory() as directory:
+        build_dataset(directory, CONFIGS, 12, "optimal", seed=4, games_per_shard=5, workers=1)
+        dataset = SelfPlayDataset(directory)
+        records = np.concatenate(dataset.shards())
+
+        ok = dataset.shard_count == 3 and isinstance(dataset.shard(0), np.memmap)
+        for game in range(12):
+            moves = records[records["game"] == game]
+            engine = GameEngine(CONFIGS[game % 2])
+            for record in moves:
+                ok = ok and (record["observation"] == observe(engine)).all()
+                engine.process_turn(*divmod(int(record["move"]), NUM_LOCATIONS))
+            ok = ok and engine.game_over and (moves["won"] == engine.game_won).all()
+            ok = ok and (moves["remaining"] == sum(loc.mushrooms for loc in engine.locations)).all()
+
+        wins = sum(shard["wins"] for shard in dataset.manifest["shards"])
+        ok = ok and wins == simulate(CONFIGS, 12, "optimal", seed=4).wins and wins > 0
+        print(f"  {'✅' if ok else '❌'} {len(dataset)} records from 12 games replay exactly, {wins} wins")
+        assert ok
+
+
+def test_resume_and_workers():
+    """Lost shards are rebuilt identically, more games only add shards, and workers do not change bytes"""
+    print(f"\n{'='*60}")
+    print("Testing resuming...")
+
+    with tempfile.TemporaryDirectory() as serial, tempfile.TemporaryDirectory() as pooled:
+        build_dataset(serial, CONFIGS, 20, "random", seed=9, games_per_shard=10, workers=1)
+        with open(os.path.join(serial, shard_name(1)), 'rb') as f:
+            original = f.read()
+        os.remove(os.path.join(serial, shard_name(1)))
+        written = os.path.getmtime(os.path.join(serial, shard_name(0)))
+
+        manifest = build_dataset(serial, CONFIGS, 25, "random", seed=9, games_per_shard=10, workers=1)
+        with open(os.path.join(serial, shard_name(1)), 'rb') as f:
+            ok = f.read() == original
+        ok = ok and os.path.getmtime(os.path.join(serial, shard_name(0))) == written
+        ok = ok and [shard["games"] for shard in manifest["shards"]] == [10, 10, 5]
+
+        build_dataset(pooled, CONFIGS, 25, "random", seed=9, games_per_shard=10, workers=2)
+        for index in range(3):
+            with open(os.path.join(serial, shard_name(index)), 'rb') as a, \
+                 open(os.path.join(pooled, shard_name(index)), 'rb') as b:
+                ok = ok and a.read() == b.read()
+
+        try:
+            build_dataset(serial, CONFIGS, 25, "greedy", seed=9, games_per_shard=10, workers=1)
+            ok = False
+        except ValueError:
+            pass
+        print(f"  {'✅' if ok else '❌'} Rebuilt shard 1, added shard 2, same bytes with 2 workers")
+        assert ok
+
+    with tempfile.TemporaryDirectory() as grown, tempfile.TemporaryDirectory() as direct:
+        build_dataset(grown, CONFIGS, 15, "random", seed=9, games_per_shard=10, workers=1)
+        manifest = build_dataset(grown, CONFIGS, 20, "random", seed=9, games_per_shard=10, workers=1)
+        build_dataset(direct, CONFIGS, 20, "random", seed=9, games_per_shard=10, workers=1)
+        ok = [shard["games"] for shard in manifest["shards"]] == [10, 10]
+        ok = ok and sorted(set(SelfPlayDataset(grown).shard(1)["game"])) == list(range(10, 20))
+        with open(os.path.join(grown, shard_name(1)), 'rb') as a, open(os.path.join(direct, shard_name(1)), 'rb') as b:
+            ok = ok and a.read() == b.read()
+        print(f"  {'✅' if ok else '❌'} Partial last shard refilled when the dataset grows")
+        assert ok
+
+
+if __name__ == "__main__":
+    test_records_replay()
+    test_resume_and_workers()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Test headless simulation, Monte Carlo runs and the move policies
+"""
+
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_engine import GameEngine
+from policies import OptimalPolicy, first_move, get_policy
+from simulate import RunningMean, iter_monte_carlo, monte_carlo, play_game, sequential_monte_carlo, simulate
+from solver import solve
+from transposition import TranspositionTable
+
+
+CONFIGS = ["configs/balanced.json", "configs/easy.json"]
+
+
+def test_first_move_matches_simple_game():
+    """The first-move policy should play exactly the valid_moves[0] line"""
+    print("Testing first-move simulation...")
+
+    stats = simulate("configs/easy.json", 3, "first", seed=0)
+    engine = GameEngine("configs/easy.json")
+    while not engine.game_over and engine.get_valid_moves():
+        engine.process_turn(*engine.get_valid_moves()[0])
+    remaining = sum(loc.mushrooms for loc in engine.locations)
+
+    ok = stats.games == 3 and stats.wins == 3 * engine.game_won and stats.mushrooms_remaining == 3 * remaining
+    print(f"  {'✅' if ok else '❌'} {stats.games} games, {stats.wins} wins, {stats.mushrooms_remaining} left")
+    assert ok
+
+
+def test_seeded_runs_repeat():
+    """The same seed should give the same results, game by game"""
+    print(f"\n{'='*60}")
+    print("Testing seeded random simulation...")
+
+    first = simulate(CONFIGS, 40, "random", seed=7)
+    second = simulate(CONFIGS, 40, "random", seed=7)
+    ok = (first.wins, first.critter_collected, first.mushrooms_remaining) == \
+         (second.wins, second.critter_collected, second.mushrooms_remaining)
+    print(f"  {'✅' if ok else '❌'} Win rate {first.win_rate:.2%} both times")
+    assert ok
+
+
+def test_stats_account_for_every_critter():
+    """Per-type counts and collections should add up to the games played"""
+    print(f"\n{'='*60}")
+    print("Testing per-critter stats...")
+
+    stats = simulate(CONFIGS, 20, "greedy", seed=1)
+    total = 0
+    for index in range(20):
+        engine = play_game(GameEngine(CONFIGS[index % 2]), get_policy("greedy"), random.Random())
+        total += sum(critter.mushrooms_collected for critter in engine.all_critters_ever)
+    ok = sum(stats.critter_collected.values()) == total and sum(stats.critter_counts.values()) >= 20 * 8
+    print(f"  {'✅' if ok else '❌'} {total} mushrooms collected across {sum(stats.critter_counts.values())} critters")
+    assert ok
+
+
+def test_optimal_policy_wins_solvable_puzzles():
+    """The solver policy should win every solvable puzzle it plays"""
+    print(f"\n{'='*60}")
+    print("Testing the optimal policy...")
+
+    for path in ["configs/support.json", "configs/high_damage.json"]:
+        result = solve(path, minimize=True)
+        engine = play_game(GameEngine(path), OptimalPolicy(), random.Random(0))
+        remaining = sum(loc.mushrooms for loc in engine.locations)
+        ok = engine.game_won == result.solvable and remaining == result.remaining
+        print(f"  {path}: {'✅' if ok else '❌'} {remaining} left, solver says {result.remaining}")
+        assert ok
+
+    # A tiny depth-preferring table cannot keep the root of every search
+    for path in ["configs/support.json", "configs/cursed.json", "configs/test_custom.json"]:
+        result = solve(path, minimize=True)
+        policy = OptimalPolicy(TranspositionTable(max_bytes=2000, policy="depth"))
+        left = [sum(loc.mushrooms for loc in play_game(GameEngine(path), policy, random.Random(seed)).locations)
+                for seed in range(5)]
+        ok = left == [result.remaining] * 5
+        print(f"  {path}: {'✅' if ok else '❌'} {left} left with a 2000-byte table, solver says {result.remaining}")
+        assert ok
+
+
+def test_monte_carlo_matches_serial():
+    """Pooled, chunked runs should aggregate to exactly the single-process result"""
+    print(f"\n{'='*60}")
+    print("Testing monte_carlo...")
+
+    expected = simulate(CONFIGS, 300, "random", seed=11)
+    pooled = monte_carlo(CONFIGS, "random", 300, workers=2, seed=11, chunk_size=64)
+    chunks = list(iter_monte_carlo(CONFIGS, "random", 300, workers=1, seed=11, chunk_size=100))
+
+    fields = lambda stats: (stats.games, stats.wins, stats.turns, stats.remaining_histogram,
+                            stats.critter_counts, stats.critter_collected)
+    ok = fields(pooled) == fields(expected) and len(chunks) == 3 and sum(c.games for c in chunks) == 300
+    ok = ok and sum(pooled.remaining_histogram.values()) == 300
+    print(f"  {'✅' if ok else '❌'} {pooled.games} games over 2 workers, win rate {pooled.win_rate:.2%}")
+    assert ok
+
+
+def test_running_mean_merges():
+    """Merged Welford accumulators should match one pass over all the values"""
+    print(f"\n{'='*60}")
+    print("Testing RunningMean...")
+
+    values = [random.Random(3).randint(0, 30) for _ in range(50)]
+    whole = RunningMean()
+    for value in values:
+        whole.add(value)
+    left, right = RunningMean(), RunningMean()
+    for value in values[:20]:
+        left.add(value)
+    for value in values[20:]:
+        right.add(value)
+    left.merge(right)
+
+    mean = sum(values) / len(values)
+    variance = sum((value - mean) ** 2 for value in values) / (len(values) - 1)
+    ok = left.count == 50 and abs(left.mean - mean) < 1e-9 and abs(left.variance - variance) < 1e-9
+    ok = ok and abs(whole.variance - variance) < 1e-9
+    print(f"  {'✅' if ok else '❌'} mean {left.mean:.3f}, variance {left.variance:.3f}")
+    assert ok
+
+
+def test_sequential_stops_settled_configs_early():
+    """Configs whose outcome never varies should stop as soon as they have played min_games"""
+    print(f"\n{'='*60}")
+    print("Testing sequential_monte_carlo...")
+
+    configs = ["configs/high_damage.json", "configs/support.json"]  # Unsolvable, solvable
+    estimates = sequential_monte_carlo(configs, "optimal", width=0.2, chunk_size=50, min_games=100,
+                                       max_games=400, workers=1, seed=5)
+    pooled = sequential_monte_carlo(configs, "optimal", width=0.2, chunk_size=50, min_games=100,
+                                    max_games=400, workers=2, seed=5)
+    for path, estimate in zip(configs, estimates):
+        print(f"  {path}: {estimate}")
+    never_won, always_won = estimates
+    ok = never_won.games == 100 and never_won.converged and never_won.win_rate == 0
+    ok = ok and always_won.win_rate == 1 and always_won.games == 100 and always_won.width <= 0.2
+    ok = ok and [e.games for e in pooled] == [e.games for e in estimates]
+    print(f"  {'✅' if ok else '❌'} Stopped after {[e.games for e in estimates]} games, same with 2 workers")
+    assert ok
+
+
+def test_unknown_policy_rejected():
+    print(f"\n{'='*60}")
+    print("Testing policy lookup...")
+
+    try:
+        get_policy("psychic")
+        ok = False
+    except ValueError:
+        ok = get_policy(first_move) is first_move
+    print(f"  {'✅' if ok else '❌'} Unknown policy names raise ValueError")
+    assert ok
+
+
+def test_integer_move_types():
+    """Moves given as NumPy integers should play like ints; non-integers are invalid"""
+    print(f"\n{'='*60}")
+    print("Testing move index types...")
+
+    import numpy as np
+    ok = True
+    for engine in (GameEngine("configs/balanced.json"), GameEngine("configs/balanced.json").specialize()):
+        reference = GameEngine("configs/balanced.json")
+        while not reference.game_over and reference.get_valid_moves():
+            move = reference.get_valid_moves()[-1]
+            reference.process_turn(*move)
+            engine.process_turn(np.int64(move[0]), np.int8(move[1]))
+        ok = ok and engine.to_state() == reference.to_state()
+        for bad in ((0.0, 1), (0, "1"), (None, 0)):
+            try:
+                GameEngine("configs/balanced.json").process_turn(*bad)
+                ok = False
+            except ValueError:
+                pass
+    print(f"  {'✅' if ok else '❌'} NumPy integers accepted, floats, strings and None rejected")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_first_move_matches_simple_game()
+    test_seeded_runs_repeat()
+    test_stats_account_for_every_critter()
+    test_optimal_policy_wins_solvable_puzzles()
+    test_monte_carlo_matches_serial()
+    test_running_mean_merges()
+    test_sequential_stops_settled_configs_early()
+    test_unknown_policy_rejected()
+    test_integer_move_types()
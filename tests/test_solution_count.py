@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Test enumerating and counting every winning line
+"""
+
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import GameConfig
+from game_engine import GameEngine
+from models import CritterType, LocationType
+from solver import count_solutions, iter_solutions
+
+
+def naive_count(engine):
+    """Play out every move sequence with no memo or pruning"""
+    if engine.game_over:
+        return 1 if engine.game_won else 0
+    total = 0
+    for move in engine.get_valid_moves():
+        engine.push_move(*move)
+        total += naive_count(engine)
+        engine.pop_move()
+    return total
+
+
+def test_count_matches_naive_enumeration():
+    """Memoized counts should equal a plain walk of the game tree"""
+    print("Testing count_solutions against naive enumeration...")
+
+    rng = random.Random(3)
+    critter_types = [t.value for t in CritterType if t != CritterType.GOOSE]
+    for _ in range(6):
+        config = GameConfig(
+            critters=[rng.choice(critter_types) for _ in range(4)],
+            locations=[{"type": rng.choice(list(LocationType)).value, "mushrooms": rng.randint(1, 6)}
+                       for _ in range(3)]
+        )
+        expected = naive_count(GameEngine(config))
+        counted = count_solutions(config)
+        listed = sum(1 for _ in iter_solutions(config))
+        print(f"  {'✅' if counted == listed == expected else '❌'} {counted} counted, "
+              f"{listed} listed, {expected} expected")
+        assert counted == listed == expected
+
+
+def test_listed_lines_win_and_are_distinct():
+    """Every yielded line should replay to a win and appear once"""
+    print(f"\n{'='*60}")
+    print("Testing iter_solutions on support config...")
+
+    lines = [tuple(line) for line in iter_solutions("configs/support.json")]
+    for line in lines[:50]:
+        engine = GameEngine("configs/support.json")
+        for move in line:
+            engine.process_turn(*move)
+        assert engine.game_won
+
+    count = count_solutions("configs/support.json")
+    ok = len(set(lines)) == len(lines) == count
+    print(f"  {'✅' if ok else '❌'} {len(lines)} distinct winning lines, {count} counted")
+    assert ok
+
+
+def test_engine_left_untouched():
+    """Counting from a live engine should not disturb it"""
+    print(f"\n{'='*60}")
+    print("Testing counting from a mid-game position...")
+
+    engine = GameEngine("configs/support.json")
+    engine.process_turn(0, 0)
+    state = engine.to_state()
+    count = count_solutions(engine)
+    first = next(iter_solutions(engine), None)
+
+    ok = engine.to_state() == state and (count == 0) == (first is None)
+    print(f"  {'✅' if ok else '❌'} {count} winning lines from day {engine.day}")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_count_matches_naive_enumeration()
+    test_listed_lines_win_and_are_distinct()
+    test_engine_left_untouched()
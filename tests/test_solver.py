@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test the exhaustive puzzle solver
+"""
+
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import GameConfig
+from game_engine import GameEngine
+from generator import PuzzleGenerator
+from solver import solve
+from transposition import TranspositionTable
+
+
+def test_solvable_config_line_replays():
+    """A winning line returned by the solver should win when replayed"""
+    print("Testing solver on easy config...")
+
+    result = solve("configs/easy.json")
+    print(f"  {result}")
+    print(f"  Line: {result.moves}")
+
+    engine = GameEngine("configs/easy.json")
+    for critter_idx, location_idx in result.moves:
+        engine.process_turn(critter_idx, location_idx)
+
+    print(f"  Replayed line - won: {engine.game_won}")
+    print(f"  {'✅' if result.solvable and engine.game_won else '❌'} Winning line replays to a win")
+    assert result.solvable and engine.game_won
+
+
+def test_unsolvable_config():
+    """A board that cannot be cleared should be reported as unsolvable"""
+    print(f"\n{'='*60}")
+    print("Testing solver on an impossible config...")
+
+    config = GameConfig(
+        critters=["frog", "penguin"],
+        locations=[
+            {"type": "beach", "mushrooms": 30},
+            {"type": "canyon", "mushrooms": 30},
+            {"type": "jungle", "mushrooms": 30}
+        ]
+    )
+    result = solve(config)
+    print(f"  {result}")
+
+    print(f"  {'✅' if not result.solvable and result.remaining > 0 else '❌'} Reported as unsolvable")
+    assert not result.solvable and result.remaining > 0
+
+
+def test_solve_from_position():
+    """Solving from a live engine should not disturb it"""
+    print(f"\n{'='*60}")
+    print("Testing solver from a mid-game position...")
+
+    engine = GameEngine("configs/support.json")
+    engine.process_turn(0, 0)
+    day_before = engine.day
+    mushrooms_before = [loc.mushrooms for loc in engine.locations]
+
+    result = solve(engine)
+    print(f"  {result}")
+
+    unchanged = engine.day == day_before and [loc.mushrooms for loc in engine.locations] == mushrooms_before
+    print(f"  {'✅' if unchanged else '❌'} Original engine left untouched")
+    assert unchanged
+
+
+def test_lines_replay_with_small_tables():
+    """Winning lines should still win when the table is too small to keep them"""
+    print(f"\n{'='*60}")
+    print("Testing solver lines with tiny transposition tables...")
+
+    generator = PuzzleGenerator(seed=1)
+    configs = [generator.generate() for _ in range(10)]
+    solved = failed = 0
+    for policy in ("lru", "depth"):
+        for max_bytes in (200, 1000, 4000):
+            for config in configs:
+                result = solve(config, TranspositionTable(max_bytes=max_bytes, policy=policy))
+                if not result.solvable:
+                    continue
+                engine = GameEngine(config)
+                for move in result.moves:
+                    engine.process_turn(*move)
+                solved += 1
+                failed += not engine.game_won
+
+    ok = solved > 0 and failed == 0
+    print(f"  {'✅' if ok else '❌'} {solved - failed}/{solved} winning lines replay to a win")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_solvable_config_line_replays()
+    test_unsolvable_config()
+    test_solve_from_position()
+    test_lines_replay_with_small_tables()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Differential test of config-specialized process_turn against the generic one
+"""
+
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import GameConfig
+from game_engine import GameEngine
+from models import CritterType, LocationType
+from simulate import simulate
+from specialize import generate_source, specialization_key
+
+
+def random_configs(count, seed):
+    """Lineups of 3-10 critters over every type on random boards"""
+    rng = random.Random(seed)
+    critter_names = [ct.value for ct in CritterType] + ["gopher", "goose"]
+    location_names = [lt.value for lt in LocationType]
+    return [GameConfig(critters=[rng.choice(critter_names) for _ in range(rng.randint(3, 10))],
+                       locations=[{"type": rng.choice(location_names), "mushrooms": rng.randint(1, 40)}
+                                  for _ in range(3)])
+            for _ in range(count)]
+
+
+def snapshot(engine):
+    return (engine.to_state(), engine.position_hash, engine._queue_hash, engine.game_over, engine.game_won,
+            [(c.mushrooms_collected, c.current_location_id) for c in engine.all_critters_ever])
+
+
+def test_matches_generic_engine():
+    """Every position, hash and collection total should match after every turn"""
+    print("Testing specialized process_turn against the generic one...")
+
+    rng = random.Random(3)
+    games = mismatches = turns = 0
+    for config in random_configs(150, seed=4):
+        for capacity in (3, 5):
+            generic = GameEngine(config)
+            if capacity != 3:
+                generic.locations[rng.randrange(3)].max_critters = capacity
+                generic.position_hash = generic.compute_position_hash()
+            special = generic.clone().specialize()
+            games += 1
+            while not generic.game_over and generic.get_valid_moves():
+                move = rng.choice(generic.get_valid_moves())
+                generic.process_turn(*move)
+                special.process_turn(*move)
+                turns += 1
+                mismatches += snapshot(generic) != snapshot(special)
+
+    ok = mismatches == 0 and turns > 1000
+    print(f"  {'✅' if ok else '❌'} {games} games, {turns} turns, {mismatches} mismatches")
+    assert ok
+
+
+def test_push_and_pop():
+    """Undo records from the specialized turn should restore every position exactly"""
+    print(f"\n{'='*60}")
+    print("Testing push_move/pop_move on specialized engines...")
+
+    rng = random.Random(5)
+    ok = True
+    for name in ["balanced", "cursed", "easy", "high_damage", "support"]:
+        engine = GameEngine(f"configs/{name}.json").specialize()
+        engine.verify_hash = True
+        for _ in range(30):
+            before = []
+            while not engine.game_over and engine.get_valid_moves():
+                before.append(snapshot(engine))
+                engine.push_move(*rng.choice(engine.get_valid_moves()))
+            while before:
+                engine.pop_move()
+                ok = ok and snapshot(engine) == before.pop()
+    print(f"  {'✅' if ok else '❌'} Every pushed move is taken back exactly")
+    assert ok
+
+
+def test_dead_phases_removed():
+    """Phases with no hook for the lineup's types should not appear in the generated code"""
+    print(f"\n{'='*60}")
+    print("Testing dead rule branches...")
+
+    easy = generate_source(specialization_key(GameEngine(GameConfig(critters=["frog", "penguin", "frog"]))))
+    gophers = generate_source(specialization_key(GameEngine(GameConfig(critters=["gopher", "rhino"]))))
+    ok = ("_apply_end_of_day_effects" not in easy and "_apply_rhino_sheep_effects" not in easy and
+          "critter_checks" not in easy and
+          "_apply_end_of_day_effects" in gophers and "_apply_rhino_sheep_effects" in gophers)
+    print(f"  {'✅' if ok else '❌'} Night, Rhino/Sheep and Crocodile steps only where the lineup needs them")
+    assert ok
+
+    engine = GameEngine("configs/easy.json").specialize()
+    same = type(engine) is type(GameEngine("configs/easy.json").specialize()) and type(engine.clone()) is type(engine)
+    print(f"  {'✅' if same else '❌'} Generated classes are shared and kept by clone()")
+    assert same
+
+
+def test_simulate_specialized():
+    print(f"\n{'='*60}")
+    print("Testing simulate with specialized engines...")
+
+    paths = ["configs/balanced.json", "configs/easy.json", "configs/high_damage.json", "configs/support.json"]
+    generic = simulate(paths, 200, "random", seed=9)
+    special = simulate(paths, 200, "random", seed=9, specialize=True)
+    fields = lambda stats: (stats.games, stats.wins, stats.turns, stats.remaining_histogram,
+                            stats.critter_counts, stats.critter_collected)
+    ok = fields(generic) == fields(special)
+    print(f"  {'✅' if ok else '❌'} Same results with and without specialization")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_matches_generic_engine()
+    test_push_and_pop()
+    test_dead_phases_removed()
+    test_simulate_specialized()
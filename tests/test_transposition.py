@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Test the bounded transposition table and its use by the solver
+"""
+
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from solver import solve
+from transposition import TranspositionTable
+
+
+def test_lru_eviction():
+    """The least recently used entry should go first once the table is full"""
+    print("Testing LRU replacement...")
+
+    table = TranspositionTable(max_bytes=3 * TranspositionTable.ENTRY_BYTES, policy="lru")
+    for key in range(3):
+        table.store(key, key, (0, 0), 1)
+    table.probe(0)  # Touch the oldest entry so it survives
+    table.store(3, 3, (0, 0), 1)
+
+    print(f"  {table}")
+    ok = table.probe(0) is not None and table.probe(1) is None and table.evictions == 1
+    print(f"  {'✅' if ok else '❌'} Entry 1 evicted, entry 0 kept")
+    assert ok
+
+
+def test_depth_preferred_replacement():
+    """A shallower result should not overwrite a deeper one in the same slot"""
+    print(f"\n{'='*60}")
+    print("Testing depth-preferred replacement...")
+
+    table = TranspositionTable(max_bytes=4 * TranspositionTable.ENTRY_BYTES, policy="depth")
+    table.store(1, 5, (0, 1), 6)
+    table.store(5, 9, (1, 2), 2)  # Same slot, shallower: rejected
+    kept = table.probe(1) is not None and table.probe(5) is None
+    table.store(9, 0, (0, 0), 6)  # Same slot, as deep: replaces
+    replaced = table.probe(9) is not None and table.probe(1) is None
+
+    print(f"  {table}")
+    print(f"  {'✅' if kept else '❌'} Deeper entry kept")
+    print(f"  {'✅' if replaced else '❌'} Equal-depth entry replaced it")
+    assert kept and replaced and table.evictions == 1
+
+
+def test_solver_results_survive_small_tables():
+    """Evicting entries should only cost time, never change the answer"""
+    print(f"\n{'='*60}")
+    print("Testing solver with tiny tables...")
+
+    for config_name in ["support", "test_custom"]:
+        reference = solve(f"configs/{config_name}.json")
+        for policy in TranspositionTable.POLICIES:
+            table = TranspositionTable(max_bytes=50 * TranspositionTable.ENTRY_BYTES, policy=policy)
+            result = solve(f"configs/{config_name}.json", table)
+            same = (result.solvable, result.remaining) == (reference.solvable, reference.remaining)
+            print(f"  {config_name}/{policy}: {'✅' if same else '❌'} {result} - {table}")
+            assert same
+
+
+def test_shared_table_reuses_results():
+    """A second search of the same puzzle should be answered from the shared table"""
+    print(f"\n{'='*60}")
+    print("Testing a table shared between searches...")
+
+    table = TranspositionTable()
+    first = solve("configs/support.json", table)
+    second = solve("configs/support.json", table)
+
+    print(f"  First search: {first.nodes} nodes, second search: {second.nodes} nodes")
+    print(f"  {table}")
+    ok = second.nodes == 0 and second.solvable == first.solvable and second.moves == first.moves
+    print(f"  {'✅' if ok else '❌'} Second search reused every result")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_lru_eviction()
+    test_depth_preferred_replacement()
+    test_solver_results_survive_small_tables()
+    test_shared_table_reuses_results()
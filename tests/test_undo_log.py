@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test that pop_move() exactly restores the position before push_move()
+"""
+
+
+import sys
+import os
+import random
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game_engine import GameEngine
+
+
+def snapshot(engine):
+    """Capture every field process_turn can touch, including object identity"""
+    def critter_state(critter):
+        return (id(critter), critter.type, critter.current_mushrooms_per_day, critter.current_lifespan,
+                critter.current_location_id, critter.mushrooms_collected)
+
+    return (
+        engine.day,
+        engine.game_over,
+        engine.game_won,
+        [(loc.mushrooms, [critter_state(c) for c in loc.critters]) for loc in engine.locations],
+        [critter_state(c) for c in engine.critter_queue],
+        [critter_state(c) for c in engine.all_critters_ever],
+    )
+
+
+def test_push_pop_restores_every_config():
+    """Random lines through every example config should unwind exactly"""
+    print("Testing push_move/pop_move on random lines...")
+
+    rng = random.Random(7)
+    configs = ["balanced", "cursed", "easy", "high_damage", "support"]
+
+    for config_name in configs:
+        engine = GameEngine(f"configs/{config_name}.json")
+        mismatches = 0
+
+        for _ in range(50):
+            snapshots = []
+            while not engine.game_over and engine.get_valid_moves():
+                snapshots.append(snapshot(engine))
+                engine.push_move(*rng.choice(engine.get_valid_moves()))
+            while snapshots:
+                engine.pop_move()
+                if snapshot(engine) != snapshots.pop():
+                    mismatches += 1
+
+        print(f"  {config_name}: {'✅' if mismatches == 0 else '❌'} {mismatches} mismatches over 50 lines")
+        assert mismatches == 0
+
+
+def test_invalid_push_leaves_position_alone():
+    """A rejected move should not leave anything behind on the undo stack"""
+    print(f"\n{'='*60}")
+    print("Testing invalid push_move...")
+
+    engine = GameEngine("configs/balanced.json")
+    before = snapshot(engine)
+    try:
+        engine.push_move(5, 0)
+    except ValueError as e:
+        print(f"  Rejected: {e}")
+
+    try:
+        engine.pop_move()
+        nothing_pushed = False
+    except IndexError:
+        nothing_pushed = True
+
+    ok = nothing_pushed and snapshot(engine) == before
+    print(f"  {'✅' if ok else '❌'} Position and undo stack unchanged")
+    assert ok
+
+
+if __name__ == "__main__":
+    test_push_pop_restores_every_config()
+    test_invalid_push_leaves_position_alone()
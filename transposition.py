@@ -0,0 +1,210 @@
+"""
+Transposition table shared by searches over GameEngine positions
+
+Entries are keyed by GameEngine.position_hash, so any solver or bot that reaches the
+same position by a different move order can reuse an earlier result.
+"""
+
+from collections import OrderedDict
+from typing import NamedTuple, Optional, Tuple
+
+
+class TableEntry(NamedTuple):
+    """Search result for one position"""
+    remaining: int  # Fewest mushrooms left at the end of the game from this position
+    best_move: Optional[Tuple[int, int]]  # Move that achieves it (None at a dead end)
+    depth: int  # Days left to play when the position was searched
+    exact: bool = True  # False when the search was cut off and remaining is only a lower bound
+
+    @property
+    def won(self) -> bool:
+        return self.exact and self.remaining == 0
+
+
+class TranspositionTable:
+    """
+    Bounded position-hash -> TableEntry store
+
+    Policies:
+        "lru": evict the least recently used entry once the table is full
+        "depth": direct-mapped slots; a colliding entry only replaces the stored one if
+                 it was searched at least as deep
+    """
+
+    # Rough cost of one entry (key, entry tuple and container overhead)
+    ENTRY_BYTES = 200
+    POLICIES = ("lru", "depth")
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, policy: str = "lru"):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown replacement policy '{policy}', expected one of {self.POLICIES}")
+        self.policy = policy
+        self.capacity = max(1, max_bytes // self.ENTRY_BYTES)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._entries = OrderedDict() if policy == "lru" else [None] * self.capacity
+        self._size = 0
+
+    def __len__(self) -> int:
+        return len(self._entries) if self.policy == "lru" else self._size
+
+    def probe(self, key: int) -> Optional[TableEntry]:
+        """Look up a position hash, counting the hit or miss"""
+        if self.policy == "lru":
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+        else:
+            slot = self._entries[key % self.capacity]
+            entry = slot[1] if slot is not None and slot[0] == key else None
+
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def store(self, key: int, remaining: int, best_move: Optional[Tuple[int, int]], depth: int,
+              exact: bool = True):
+        """Record the result of searching a position"""
+        entry = TableEntry(remaining, best_move, depth, exact)
+        self.stores += 1
+
+        if self.policy == "lru":
+            entries = self._entries
+            if key in entries:
+                entries.move_to_end(key)
+            elif len(entries) >= self.capacity:
+                entries.popitem(last=False)
+                self.evictions += 1
+            entries[key] = entry
+            return
+
+        index = key % self.capacity
+        slot = self._entries[index]
+        if slot is None:
+            self._size += 1
+        elif slot[0] != key:
+            if slot[1].depth > depth:
+                return  # Keep the deeper (more expensive) result
+            self.evictions += 1
+        self._entries[index] = (key, entry)
+
+    def clear(self):
+        """Drop every entry and reset the counters"""
+        self.__init__(self.capacity * self.ENTRY_BYTES, self.policy)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self),
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+        }
+
+    def __str__(self):
+        stats = self.stats()
+        return (f"{stats['entries']}/{stats['capacity']} entries, {stats['hits']} hits, "
+                f"{stats['misses']} misses ({stats['hit_rate']:.0%} hit rate), {stats['evictions']} evictions")
+
+
+class SharedTranspositionTable:
+    """
+    Direct-mapped, depth-preferred table in multiprocessing.shared_memory
+
+    Lets worker processes share results. Each slot is two 64-bit words,
+    (key ^ data, data), so a slot torn by two processes writing at once fails the key
+    check and reads as a miss instead of returning a corrupt entry. Counters are kept
+    per process.
+    """
+
+    SLOT_BYTES = 16
+    _USED, _EXACT, _HAS_MOVE = 1, 2, 4
+
+    def __init__(self, memory, capacity: int, owner: bool):
+        self._memory = memory
+        self._words = memory.buf.cast('Q')
+        self.capacity = capacity
+        self.name = memory.name
+        self.owner = owner
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+    @classmethod
+    def create(cls, max_bytes: int = 64 * 1024 * 1024) -> 'SharedTranspositionTable':
+        """Allocate a new zeroed table; the creator should unlink() it when done"""
+        from multiprocessing import shared_memory
+        capacity = max(1, max_bytes // cls.SLOT_BYTES)
+        memory = shared_memory.SharedMemory(create=True, size=capacity * cls.SLOT_BYTES)
+        memory.buf[:] = bytes(capacity * cls.SLOT_BYTES)
+        return cls(memory, capacity, owner=True)
+
+    @classmethod
+    def attach(cls, name: str, capacity: int) -> 'SharedTranspositionTable':
+        """Open a table created by another process"""
+        from multiprocessing import shared_memory
+        return cls(shared_memory.SharedMemory(name=name), capacity, owner=False)
+
+    def _read(self, index: int):
+        """(key, data) stored in a slot, or None if empty or torn"""
+        check, data = self._words[2 * index], self._words[2 * index + 1]
+        if not data & self._USED:
+            return None
+        return check ^ data, data
+
+    def probe(self, key: int) -> Optional[TableEntry]:
+        slot = self._read(key % self.capacity)
+        if slot is None or slot[0] != key:
+            self.misses += 1
+            return None
+        self.hits += 1
+        data = slot[1]
+        flags = data & 0xFF
+        best_move = ((data >> 8) & 0xFF, (data >> 16) & 0xFF) if flags & self._HAS_MOVE else None
+        return TableEntry(data >> 32, best_move, (data >> 24) & 0xFF, bool(flags & self._EXACT))
+
+    def store(self, key: int, remaining: int, best_move: Optional[Tuple[int, int]], depth: int,
+              exact: bool = True):
+        self.stores += 1
+        index = key % self.capacity
+        slot = self._read(index)
+        if slot is not None and slot[0] != key:
+            if ((slot[1] >> 24) & 0xFF) > depth:
+                return  # Keep the deeper (more expensive) result
+            self.evictions += 1
+
+        flags = self._USED | (self._EXACT if exact else 0)
+        data = (min(remaining, 0xFFFFFFFF) << 32) | (depth << 24)
+        if best_move is not None:
+            flags |= self._HAS_MOVE
+            data |= (best_move[1] << 16) | (best_move[0] << 8)
+        data |= flags
+        self._words[2 * index] = key ^ data
+        self._words[2 * index + 1] = data
+
+    def close(self):
+        self._words.release()
+        self._memory.close()
+
+    def unlink(self):
+        """Free the shared memory (creator only, after every process has closed it)"""
+        self._memory.unlink()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            'capacity': self.capacity,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'stores': self.stores,
+            'evictions': self.evictions,
+        }